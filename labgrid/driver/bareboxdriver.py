@@ -6,9 +6,9 @@ from pexpect import TIMEOUT
 from ..factory import target_factory
 from ..protocol import CommandProtocol, ConsoleProtocol, LinuxBootProtocol
 from ..step import step
-from ..util import gen_marker, Timeout, re_vt100
+from ..util import gen_marker, MarkerMatcher, Timeout
 from .common import Driver
-from .commandmixin import CommandMixin
+from .commandmixin import CommandMixin, RunIterator
 
 
 @target_factory.reg_driver
@@ -65,16 +65,13 @@ class BareboxDriver(CommandMixin, Driver, CommandProtocol, LinuxBootProtocol):
     def run(self, cmd: str, *, timeout: int = 30):
         return self._run(cmd, timeout=timeout)
 
-    def _run(self, cmd: str, *, timeout: int = 30, adjust_log_level: bool = True, codec: str = "utf-8", decodeerrors: str = "strict"):  # pylint: disable=unused-argument,line-too-long
+    def _run_iter(self, cmd: str, *, timeout: int = 30, adjust_log_level: bool = True, codec: str = "utf-8", decodeerrors: str = "strict"):  # pylint: disable=unused-argument,line-too-long
         """
-        Runs the specified command on the shell and returns the output.
+        Runs the specified command on the shell and yields the output lines as they arrive.
 
         Args:
             cmd (str): command to run on the shell
             timeout (int): optional, timeout in seconds
-
-        Returns:
-            Tuple[List[str],List[str], int]: if successful, None otherwise
         """
         # FIXME: use codec, decodeerrors
         marker = gen_marker()
@@ -88,17 +85,39 @@ class BareboxDriver(CommandMixin, Driver, CommandProtocol, LinuxBootProtocol):
         if self.saved_log_level and adjust_log_level:
             cmp_command += ' global.loglevel=0;'
 
+        self.console.sendline(cmp_command)
+        matcher = MarkerMatcher(marker, rf'\s+(\d+)\s+.*{self.prompt}', marker_line=True)
+        try:
+            yield from self.console.expect_lines(matcher, timeout=timeout)
+        except GeneratorExit:
+            # the output is no longer consumed, stop the command and restore the log level
+            self.console.sendcontrol("c")
+            self._check_prompt()
+            if self.saved_log_level and adjust_log_level:
+                self._run("global.loglevel=0", adjust_log_level=False)
+            raise
+        # Get exit code
+        exitcode = int(matcher.match.group(1))
+        return [], exitcode
+
+    def _run(self, cmd: str, *, timeout: int = 30, adjust_log_level: bool = True, codec: str = "utf-8", decodeerrors: str = "strict"):  # pylint: disable=unused-argument,line-too-long
+        """
+        Runs the specified command on the shell and returns the output.
+
+        Args:
+            cmd (str): command to run on the shell
+            timeout (int): optional, timeout in seconds
+
+        Returns:
+            Tuple[List[str],List[str], int]: if successful, None otherwise
+        """
         if self._status == 1:
-            self.console.sendline(cmp_command)
-            _, _, match, _ = self.console.expect(
-                rf'{marker}(.*){marker}\s+(\d+)\s+.*{self.prompt}',
-                timeout=timeout)
-            # Remove VT100 Codes and split by newline
-            data = re_vt100.sub('', match.group(1).decode('utf-8')).split('\r\n')[1:-1]
+            output = RunIterator(self._run_iter(
+                cmd, timeout=timeout, adjust_log_level=adjust_log_level, codec=codec, decodeerrors=decodeerrors
+            ))
+            data = list(output)
             self.logger.debug("Received Data: %s", data)
-            # Get exit code
-            exitcode = int(match.group(2))
-            return (data, [], exitcode)
+            return (data, output.stderr, output.exitcode)
 
         return None
 
@@ -1,11 +1,46 @@
 from time import sleep
 
+import attr
+
 from ..util import Timeout
 from ..step import step
 from .common import Driver
 from .exception import ExecutionError
 
 
+@attr.s(eq=False)
+class RunIterator:
+    """
+    Iterator over the stdout lines of a command started with run_iter().
+
+    The stderr lines (if the driver provides them separately) and the exit code are available
+    once all lines have been consumed. Closing the iterator early stops the command.
+    """
+    _gen = attr.ib()
+    stderr = attr.ib(default=None)
+    exitcode = attr.ib(default=None)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._gen)
+        except StopIteration as e:
+            if e.value is not None:
+                self.stderr, self.exitcode = e.value
+            raise
+
+    def close(self):
+        self._gen.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
 class CommandMixin:
     """
     CommandMixin implementing common functions for drivers which support the CommandProtocol
@@ -94,3 +129,30 @@ class CommandMixin:
             List[str]: stdout of the executed command
         """
         return self._run_check(cmd, timeout=timeout, codec=codec, decodeerrors=decodeerrors)
+
+    def _run_iter(self, cmd: str, *, timeout=30, codec: str = "utf-8", decodeerrors: str = "strict"):
+        """
+        Internal generator which runs the specified command and yields its stdout lines, returning
+        the stderr lines and the exit code. Drivers which can stream the output override this, by
+        default the output is yielded once the command has finished.
+        """
+        stdout, stderr, exitcode = self._run(cmd, timeout=timeout, codec=codec, decodeerrors=decodeerrors)
+        yield from stdout
+        return stderr, exitcode
+
+    @Driver.check_active
+    @step(args=["cmd"])
+    def run_iter(self, cmd: str, *, timeout=30, codec="utf-8", decodeerrors="strict"):
+        """
+        External run_iter function, only available if the driver is active.
+        Runs the supplied command and returns an iterator over its stdout lines, which are
+        produced as the output arrives. The exit code is available in the exitcode attribute of
+        the iterator after all lines have been consumed.
+
+        Args:
+            cmd (str): command to run on the shell
+
+        Returns:
+            RunIterator: iterator over the stdout lines of the executed command
+        """
+        return RunIterator(self._run_iter(cmd, timeout=timeout, codec=codec, decodeerrors=decodeerrors))
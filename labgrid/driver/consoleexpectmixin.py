@@ -1,3 +1,5 @@
+import os
+import select
 import time
 import pexpect
 
@@ -12,11 +14,77 @@ class ConsoleExpectMixin:
     the internal _read and _write methods.
 
     The class using the ConsoleExpectMixin must provide a logger, txdelay and linesep attribute.
+
+    Drivers which can return a file descriptor from _fileno() use a faster path in expect(): data
+    is read directly from the descriptor and the console read steps are emitted for aggregated
+    chunks instead of every single read.
     """
+    fast_read_size = 4096
+    fast_log_size = 4096
+    fast_log_interval = 0.1
 
     def __attrs_post_init__(self):
         super().__attrs_post_init__()
         self._expect = PtxExpect(self, self.linesep.encode("ASCII"))
+        self._rx_pending = bytearray()
+        self._rx_pending_since = None
+
+    def _fileno(self):
+        """
+        Returns a file descriptor which can be read directly for the console output, or None if
+        the driver does not support the fast read path.
+        """
+        return None
+
+    def _read_fast(self, fd, size=1, timeout=0.0):
+        """Reads at least 'size' and up to fast_read_size bytes directly from fd."""
+        t = Timeout(float(timeout))
+        while True:
+            wait = t.remaining
+            if self._rx_pending:
+                # don't hold back collected data if the console goes quiet
+                wait = min(wait, max(0.0, self._rx_pending_since + self.fast_log_interval - time.monotonic()))
+            ready, _, _ = select.select([fd], [], [], wait)
+            if not ready:
+                self._flush_rx()
+                if not t.expired:
+                    continue
+                raise pexpect.TIMEOUT(f"Timeout of {timeout:.2f} seconds exceeded")
+            try:
+                res = os.read(fd, max(size, self.fast_read_size))
+            except BlockingIOError:
+                continue
+            if not res:
+                self._flush_rx()
+                raise pexpect.TIMEOUT("Connection closed by peer")
+            break
+
+        if not self._rx_pending:
+            self._rx_pending_since = time.monotonic()
+        self._rx_pending += res
+        if (len(self._rx_pending) >= self.fast_log_size or
+                time.monotonic() - self._rx_pending_since >= self.fast_log_interval):
+            self._flush_rx()
+        return res
+
+    def _flush_rx(self):
+        """Emits the console read step for the data collected by _read_fast()."""
+        if self._rx_pending:
+            data = bytes(self._rx_pending)
+            self._rx_pending.clear()
+            self._log_read(data)
+
+    @step(title='read', result=True, tag='console')
+    def _log_read(self, data):
+        self.logger.debug("Read %i bytes: %s", len(data), data)
+        return data
+
+    def _read_expect(self, size=1, timeout=0.0):
+        """Read function used by the pexpect wrapper."""
+        fd = self._fileno()
+        if fd is None:
+            return self.read(size=size, timeout=timeout)
+        return self._read_fast(fd, size=size, timeout=timeout)
 
     @Driver.check_active
     @step(result=True, tag='console')
@@ -58,9 +126,35 @@ class ConsoleExpectMixin:
     @Driver.check_active
     @step(args=['pattern'], result=True)
     def expect(self, pattern, timeout=-1):
-        index = self._expect.expect(pattern, timeout=timeout)
+        try:
+            index = self._expect.expect(pattern, timeout=timeout)
+        finally:
+            self._flush_rx()
         return index, self._expect.before, self._expect.match, self._expect.after
 
+    @Driver.check_active
+    def expect_lines(self, matcher, timeout=-1):
+        """
+        Feeds the console output into a MarkerMatcher and yields the output lines as they
+        arrive, until the matcher is done. Data following the match is kept for the next expect().
+        """
+        if timeout == -1:
+            timeout = self._expect.timeout
+        t = Timeout(float(timeout))
+        data = self._expect.buffer
+        self._expect.buffer = b''
+        try:
+            while True:
+                yield from matcher.feed(data)
+                if matcher.done:
+                    break
+                if t.expired:
+                    raise pexpect.TIMEOUT(f"Timeout of {timeout:.2f} seconds exceeded")
+                data = self._read_expect(size=1, timeout=t.remaining)
+        finally:
+            self._flush_rx()
+            self._expect.buffer = matcher.remainder
+
     @Driver.check_active
     @step(args=['quiet_time'])
     def settle(self, quiet_time, timeout=120.0) -> bool:
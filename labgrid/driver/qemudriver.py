@@ -363,6 +363,11 @@ class QEMUDriver(ConsoleExpectMixin, Driver, PowerProtocol, ConsoleProtocol):
             raise TIMEOUT(f"Timeout of {timeout:.2f} seconds exceeded")
         return res
 
+    def _fileno(self):
+        if self._clientsocket is None:
+            return None
+        return self._clientsocket.fileno()
+
     def _write(self, data):
         return self._clientsocket.send(data)
 
@@ -88,6 +88,23 @@ class SerialDriver(ConsoleExpectMixin, Driver, ConsoleProtocol):
             raise TIMEOUT(f"Timeout of {timeout:.2f} seconds exceeded or connection closed by peer")
         return res
 
+    def _fileno(self):
+        """
+        Returns the file descriptor of a local serial port or raw network socket for the fast
+        expect path. RFC2217 ports are read by pyserial in a separate thread, so they use the
+        generic read path.
+        """
+        if not self.status:
+            return None
+        if isinstance(self.port, SerialPort):
+            return self.serial.fileno()
+        if self.port.protocol == "raw":
+            # pyserial does not expose the socket, use the generic read path if that changes
+            sock = getattr(self.serial, "_socket", None)
+            if sock is not None:
+                return sock.fileno()
+        return None
+
     def _write(self, data: bytes):
         """
         Writes 'data' to the serialport
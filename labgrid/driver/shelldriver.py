@@ -1,6 +1,8 @@
 # pylint: disable=unused-argument
 """The ShellDriver provides the CommandProtocol, ConsoleProtocol and
  InfoProtocol on top of a SerialPort."""
+import base64
+import gzip
 import io
 import re
 import shlex
@@ -14,12 +16,38 @@ import xmodem
 from ..factory import target_factory
 from ..protocol import CommandProtocol, ConsoleProtocol, FileTransferProtocol
 from ..step import step
-from ..util import gen_marker, Timeout, re_vt100
-from .commandmixin import CommandMixin
+from ..util import gen_marker, MarkerMatcher, Timeout
+from .commandmixin import CommandMixin, RunIterator
 from .common import Driver
 from .exception import ExecutionError
 
 
+def _cksum_table():
+    table = []
+    for i in range(256):
+        crc = i << 24
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x04c11db7 if crc & 0x80000000 else crc << 1) & 0xffffffff
+        table.append(crc)
+    return table
+
+
+_CKSUM_TABLE = _cksum_table()
+
+
+def _cksum(data):
+    """Returns the CRC of data as printed by the POSIX cksum utility"""
+    crc = 0
+    table = _CKSUM_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xffffffff) ^ table[(crc >> 24) ^ byte]
+    length = len(data)
+    while length:
+        crc = ((crc << 8) & 0xffffffff) ^ table[(crc >> 24) ^ (length & 0xff)]
+        length >>= 8
+    return ~crc & 0xffffffff
+
+
 @target_factory.reg_driver
 @attr.s(eq=False)
 class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
@@ -62,6 +90,7 @@ class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
 
         self._xmodem_cached_rx_cmd = ""
         self._xmodem_cached_sx_cmd = ""
+        self._transfer_cached_tools = None
 
     def on_activate(self):
         if self._status == 0:
@@ -78,9 +107,9 @@ class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
     def on_deactivate(self):
         self._status = 0
 
-    def _run(self, cmd, *, timeout=30.0, codec="utf-8", decodeerrors="strict"):
+    def _run_iter(self, cmd, *, timeout=30.0, codec="utf-8", decodeerrors="strict"):
         """
-        Runs the specified cmd on the shell and returns the output.
+        Runs the specified cmd on the shell and yields the output lines as they arrive.
 
         Arguments:
         cmd - cmd to run on the shell
@@ -91,18 +120,30 @@ class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
         # hide marker from expect
         cmp_command = f'''MARKER='{marker[:4]}''{marker[4:]}' run {shlex.quote(cmd)}'''
         self.console.sendline(cmp_command)
-        _, _, match, _ = self.console.expect(
-            rf'{marker}(.*){marker}\s+(\d+)\s+{self.prompt}',
-            timeout=timeout
-        )
-        # Remove VT100 Codes, split by newline and remove surrounding newline
-        data = re_vt100.sub('', match.group(1).decode(codec, decodeerrors)).split('\r\n')
-        if data and not data[-1]:
-            del data[-1]
-        self.logger.debug("Received Data: %s", data)
+        # only the newly received output is scanned for the markers
+        matcher = MarkerMatcher(marker, rf'\s+(\d+)\s+{self.prompt}', codec=codec, decodeerrors=decodeerrors)
+        try:
+            yield from self.console.expect_lines(matcher, timeout=timeout)
+        except GeneratorExit:
+            # the output is no longer consumed, stop the command
+            self.console.sendcontrol("c")
+            self._check_prompt()
+            raise
         # Get exit code
-        exitcode = int(match.group(2))
-        return (data, [], exitcode)
+        exitcode = int(matcher.match.group(1))
+        return [], exitcode
+
+    def _run(self, cmd, *, timeout=30.0, codec="utf-8", decodeerrors="strict"):
+        """
+        Runs the specified cmd on the shell and returns the output.
+
+        Arguments:
+        cmd - cmd to run on the shell
+        """
+        output = RunIterator(self._run_iter(cmd, timeout=timeout, codec=codec, decodeerrors=decodeerrors))
+        data = list(output)
+        self.logger.debug("Received Data: %s", data)
+        return (data, output.stderr, output.exitcode)
 
     @Driver.check_active
     @step(args=['cmd'], result=True)
@@ -348,31 +389,76 @@ class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
             if self._run('which lsz')[2] == 0:
                 # redirect stderr to prevent lsz from printing "Give XMODEM receive
                 # cmd now", which will confuse the XMODEM instance
-                self._xmodem_cached_sx_cmd = "lsz -b -X -m 1200 -M 10 '{filename}' 2>/dev/null"
+                self._xmodem_cached_sx_cmd = "lsz -b -X -k -m 1200 -M 10 '{filename}' 2>/dev/null"
             elif self._run('which sz')[2] == 0:
                 # renamed binaries packaged by some distros
-                self._xmodem_cached_sx_cmd = "sz -b -X -m 1200 -M 10 '{filename}' 2>/dev/null"
+                self._xmodem_cached_sx_cmd = "sz -b -X -k -m 1200 -M 10 '{filename}' 2>/dev/null"
             else:
                 raise ExecutionError('No XMODEM sender (lsz, sz) available on target')
 
         # use the cached string template to make the full command with parameters
         return self._xmodem_cached_sx_cmd.format(filename=filename)
 
+    def _get_transfer_tools(self):
+        """ Detect which tools for the base64 transfer and verification are available on the target,
+        and cache the result. """
+        if self._transfer_cached_tools is None:
+            out, _, _ = self._run(
+                'for tool in base64 gzip cksum; do command -v $tool >/dev/null && echo $tool; done; true'
+            )
+            self._transfer_cached_tools = set(out)
+        return self._transfer_cached_tools
+
+    def _verify_transfer(self, buf: bytes, remotefile: str):
+        """ Compare the CRC of buf with the one of the remote file, if cksum is available. """
+        if 'cksum' not in self._get_transfer_tools():
+            return
+        out, _, ret = self._run(f"cksum '{remotefile}'")
+        if ret != 0 or not out:
+            raise ExecutionError(f"Could not checksum '{remotefile}' on target")
+        crc, size = (int(x) for x in out[0].split()[:2])
+        if crc != _cksum(buf) or size != len(buf):
+            raise ExecutionError(f"Checksum mismatch for '{remotefile}' after transfer")
+
+    def _put_bytes_base64(self, buf: bytes, tmpfile: str):
+        """ Write buf to tmpfile on the target in base64 encoded chunks, optionally compressed.
+
+        Each chunk is decoded by a separate command, so its exit code acknowledges the chunk before
+        the next one is sent. Returns the command which writes the original data to stdout.
+        """
+        data = buf
+        decode_cmd = f"cat '{tmpfile}'"
+        if 'gzip' in self._get_transfer_tools():
+            compressed = gzip.compress(buf, mtime=0)
+            if len(compressed) < len(buf):
+                data = compressed
+                decode_cmd = f"gzip -dc '{tmpfile}'"
+
+        # the command line must fit into the terminal's line buffer (4095 bytes in canonical mode)
+        chunk_size = 2048
+        self._run_check(f": > '{tmpfile}'")
+        for offset in range(0, len(data), chunk_size):
+            chunk = base64.b64encode(data[offset:offset + chunk_size]).decode('ascii')
+            self._run_check(f"printf %s {chunk} | base64 -d >> '{tmpfile}'")
+
+        return decode_cmd
+
     @step(title='put_bytes', args=['remotefile'])
     def _put_bytes(self, buf: bytes, remotefile: str):
         # OK, a little explanation on what we're doing here:
         # XMODEM is a fairly simple, but also a fairly historic protocol. For example, all packets
-        # carry exactly 128 bytes of payload, and if the file being sent is not a multiple of 128
-        # bytes, the last packet will be padded by CPM's EOF, which is 0x1a. There is no file size
-        # or anything in the protocol itself, so we'll have to take care of that and truncate the
-        # file ourselves.
+        # carry exactly 128 (or 1024 for XMODEM-1K) bytes of payload, and if the file being sent is
+        # not a multiple of that, the last packet will be padded by CPM's EOF, which is 0x1a. There
+        # is no file size or anything in the protocol itself, so we'll have to take care of that
+        # and truncate the file ourselves.
+        # If no XMODEM receiver is available, the data is sent as base64 encoded chunks instead.
 
         def _target_cleanup(tmpfile):
             self._run(f"rm -f '{tmpfile}'")
 
         stream = io.BytesIO(buf)
 
-        # We first write to a temp file, which we'll `dd` onto the destination file later
+        # We first write to a temp file, which we'll copy onto the destination file later
         try:
             tmpfile = self._run_check('mktemp')
             tmpfile = tmpfile[0]
@@ -385,28 +471,35 @@ class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
             raise ExecutionError('Could not make temporary file on target')
 
         try:
-            rx_cmd = self._get_xmodem_rx_cmd(tmpfile)
-            self.logger.debug('XMODEM receive command on target: %s', rx_cmd)
-        except ExecutionError:
-            _target_cleanup(tmpfile)
-            raise
+            try:
+                rx_cmd = self._get_xmodem_rx_cmd(tmpfile)
+                self.logger.debug('XMODEM receive command on target: %s', rx_cmd)
+            except ExecutionError:
+                if 'base64' not in self._get_transfer_tools():
+                    raise ExecutionError('No XMODEM receiver (lrz, rz, rx) or base64 available on target')
+                self.logger.debug('No XMODEM receiver on target, using base64')
+                copy_cmd = self._put_bytes_base64(buf, tmpfile)
+            else:
+                self._start_xmodem_transfer(rx_cmd)
 
-        self._start_xmodem_transfer(rx_cmd)
+                modem = xmodem.XMODEM(self._xmodem_getc, self._xmodem_putc, mode='xmodem1k')
+                ret = modem.send(stream)
+                self.logger.debug('xmodem.send() returned %r', ret)
 
-        modem = xmodem.XMODEM(self._xmodem_getc, self._xmodem_putc)
-        ret = modem.send(stream)
-        self.logger.debug('xmodem.send() returned %r', ret)
+                self.console.expect(self.prompt, timeout=30)
 
-        self.console.expect(self.prompt, timeout=30)
+                # truncate the file to get rid of CPMEOF padding
+                copy_cmd = f"head -c {len(buf)} '{tmpfile}'"
 
-        # truncate the file to get rid of CPMEOF padding
-        dd_cmd = f"dd if='{tmpfile}' of='{remotefile}' bs=1 count={len(buf)}"
-        self.logger.debug('dd command: %s', dd_cmd)
-        out, _, ret = self._run(dd_cmd)
+            copy_cmd = f"{copy_cmd} > '{remotefile}'"
+            self.logger.debug('copy command: %s', copy_cmd)
+            out, _, ret = self._run(copy_cmd)
+            if ret != 0:
+                raise ExecutionError(f'Could not write destination file: {copy_cmd} returned {ret}: {out}')
+        finally:
+            _target_cleanup(tmpfile)
 
-        _target_cleanup(tmpfile)
-        if ret != 0:
-            raise ExecutionError(f'Could not truncate destination file: dd returned {ret}: {out}')
+        self._verify_transfer(buf, remotefile)
 
     @Driver.check_active
     def put_bytes(self, buf: bytes, remotefile: str):
@@ -443,11 +536,41 @@ class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
         """
         self._put(localfile, remotefile)
 
+    def _get_bytes_base64(self, remotefile: str):
+        """ Read remotefile from the target as base64 encoded (and optionally compressed) output. """
+        out, _, ret = self._run(f"wc -c < '{remotefile}'")
+        if ret != 0 or not out:
+            raise ExecutionError(f"Could not read '{remotefile}' on target")
+        # allow for slow consoles, the encoded data is larger than the file
+        timeout = 30 + int(out[-1]) / 500
+
+        compressed = 'gzip' in self._get_transfer_tools()
+        if compressed:
+            cmd = f"gzip -c '{remotefile}' | base64"
+        else:
+            cmd = f"base64 '{remotefile}'"
+        out, _, ret = self._run(cmd, timeout=timeout)
+        if ret != 0:
+            raise ExecutionError(f"Could not read '{remotefile}' on target")
+
+        buf = base64.b64decode(''.join(out))
+        if compressed:
+            buf = gzip.decompress(buf)
+        return buf
+
     @step(title='get_bytes', args=['remotefile'])
     def _get_bytes(self, remotefile: str):
         buf = io.BytesIO()
 
-        cmd = self._get_xmodem_sx_cmd(remotefile)
+        try:
+            cmd = self._get_xmodem_sx_cmd(remotefile)
+        except ExecutionError:
+            if 'base64' not in self._get_transfer_tools():
+                raise ExecutionError('No XMODEM sender (lsz, sz) or base64 available on target')
+            self.logger.debug('No XMODEM sender on target, using base64')
+            data = self._get_bytes_base64(remotefile)
+            self._verify_transfer(data, remotefile)
+            return data
         self.logger.info('XMODEM send command on target: %s', cmd)
 
         # get file size to remove XMODEM's CPMEOF padding at the end of the last packet
@@ -476,7 +599,9 @@ class ShellDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
 
         # return everything as bytes
         buf.seek(0)
-        return buf.read()
+        data = buf.read()
+        self._verify_transfer(data, remotefile)
+        return data
 
     @Driver.check_active
     def get_bytes(self, remotefile: str):
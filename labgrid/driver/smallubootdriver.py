@@ -5,6 +5,7 @@ from ..util import gen_marker
 from ..step import step
 from .common import Driver
 
+from .commandmixin import CommandMixin
 from .ubootdriver import UBootDriver
 from ..util import re_vt100
 
@@ -109,6 +110,10 @@ class SmallUBootDriver(UBootDriver):
                 return (data, [], 1)
         return (data, [], 0)
 
+    def _run_iter(self, cmd: str, *, timeout: int = 30, codec: str = "utf-8", decodeerrors: str = "strict"):  # pylint: disable=line-too-long
+        # the output can only be parsed once the command has finished
+        return CommandMixin._run_iter(self, cmd, timeout=timeout, codec=codec, decodeerrors=decodeerrors)
+
     @Driver.check_active
     @step(args=['name'], result=True)
     def boot(self, name):
@@ -2,6 +2,7 @@
 import contextlib
 import os
 import re
+import selectors
 import stat
 import shlex
 import shutil
@@ -14,7 +15,7 @@ import attr
 
 from ..factory import target_factory
 from ..protocol import CommandProtocol, FileTransferProtocol
-from .commandmixin import CommandMixin
+from .commandmixin import CommandMixin, RunIterator
 from .common import Driver
 from ..step import step
 from .exception import ExecutionError
@@ -200,15 +201,11 @@ class SSHDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
     def run(self, cmd, codec="utf-8", decodeerrors="strict", timeout=None):
         return self._run(cmd, codec=codec, decodeerrors=decodeerrors, timeout=timeout)
 
-    def _run(self, cmd, codec="utf-8", decodeerrors="strict", timeout=None):
-        """Execute `cmd` on the target.
+    def _run_iter(self, cmd, codec="utf-8", decodeerrors="strict", timeout=None):
+        """Execute `cmd` on the target and yield the stdout lines as they arrive.
 
-        This method runs the specified `cmd` as a command on its target.
-        It uses the ssh shell command to run the command and parses the exitcode.
+        The stderr lines and the exitcode are returned once the command has finished.
         cmd - command to be run on the target
-
-        returns:
-        (stdout, stderr, returncode)
         """
         if not self._check_keepalive():
             raise ExecutionError("Keepalive no longer running")
@@ -231,16 +228,60 @@ class SSHDriver(CommandMixin, Driver, CommandProtocol, FileTransferProtocol):
                 f"error executing command: {complete_cmd}"
             )
 
-        stdout, stderr = sub.communicate(timeout=timeout)
-        stdout = stdout.decode(codec, decodeerrors).split('\n')
-        if stdout[-1] == '':
-            stdout.pop()
-        if stderr is None:
+        deadline = Timeout(float(timeout)) if timeout is not None else None
+        stdout = bytearray()
+        stderr = bytearray()
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(sub.stdout, selectors.EVENT_READ, stdout)
+                if sub.stderr is not None:
+                    selector.register(sub.stderr, selectors.EVENT_READ, stderr)
+                while selector.get_map():
+                    if deadline is not None and deadline.expired:
+                        raise subprocess.TimeoutExpired(complete_cmd, timeout)
+                    for key, _ in selector.select(deadline.remaining if deadline is not None else None):
+                        data = os.read(key.fd, 65536)
+                        if not data:
+                            selector.unregister(key.fileobj)
+                            continue
+                        key.data.extend(data)
+                        if key.data is not stdout:
+                            continue
+                        *lines, rest = stdout.split(b"\n")
+                        for line in lines:
+                            yield line.decode(codec, decodeerrors)
+                        stdout[:] = rest
+            if stdout:
+                yield stdout.decode(codec, decodeerrors)
+            sub.wait()
+        finally:
+            if sub.returncode is None:
+                sub.kill()
+                sub.wait()
+            sub.stdout.close()
+            if sub.stderr is not None:
+                sub.stderr.close()
+
+        if sub.stderr is None:
             stderr = []
         else:
             stderr = stderr.decode(codec, decodeerrors).split('\n')
             stderr.pop()
-        return (stdout, stderr, sub.returncode)
+        return stderr, sub.returncode
+
+    def _run(self, cmd, codec="utf-8", decodeerrors="strict", timeout=None):
+        """Execute `cmd` on the target.
+
+        This method runs the specified `cmd` as a command on its target.
+        It uses the ssh shell command to run the command and parses the exitcode.
+        cmd - command to be run on the target
+
+        returns:
+        (stdout, stderr, returncode)
+        """
+        output = RunIterator(self._run_iter(cmd, codec=codec, decodeerrors=decodeerrors, timeout=timeout))
+        stdout = list(output)
+        return (stdout, output.stderr, output.exitcode)
 
     def interact(self, cmd=None):
         assert cmd is None or isinstance(cmd, list)
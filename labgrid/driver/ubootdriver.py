@@ -5,10 +5,10 @@ from pexpect import TIMEOUT
 
 from ..factory import target_factory
 from ..protocol import CommandProtocol, ConsoleProtocol, LinuxBootProtocol
-from ..util import gen_marker, re_vt100, Timeout
+from ..util import gen_marker, MarkerMatcher, Timeout
 from ..step import step
 from .common import Driver
-from .commandmixin import CommandMixin
+from .commandmixin import CommandMixin, RunIterator
 
 re_uboot_timestamp = re.compile(r"^\[\s+\d+\.\d+\]\s*")
 
@@ -71,30 +71,38 @@ class UBootDriver(CommandMixin, Driver, CommandProtocol, LinuxBootProtocol):
         """
         self._status = 0
 
-    def _run(self, cmd: str, *, timeout: int = 30, codec: str = "utf-8", decodeerrors: str = "strict"):  # pylint: disable=unused-argument,line-too-long
+    def _run_iter(self, cmd: str, *, timeout: int = 30, codec: str = "utf-8", decodeerrors: str = "strict"):  # pylint: disable=unused-argument,line-too-long
         # TODO: use codec, decodeerrors
         # TODO: Shell Escaping for the U-Boot Shell
         marker = gen_marker()
         cmp_command = f"""echo '{marker[:4]}''{marker[4:]}'; {cmd}; echo "$?"; echo '{marker[:4]}''{marker[4:]}';"""  # pylint: disable=line-too-long
-        if self._status == 1:
-            self.console.sendline(cmp_command)
-            _, before, _, _ = self.console.expect(self.prompt, timeout=timeout)
-            # Remove VT100 Codes and split by newline
-            data = re_vt100.sub(
-                '', before.decode('utf-8'), count=1000000
-            ).replace("\r", "").split("\n")
-
-            # Strip possible U-Boot timestamps from the line
-            if self.strip_timestamp:
-                data = [re_uboot_timestamp.sub('', line) for line in data]
+        self.console.sendline(cmp_command)
+        # the exit code is printed as the last line before the second marker, so each line is
+        # only yielded once the next one has arrived
+        matcher = MarkerMatcher(marker, rf'.*?{self.prompt}', marker_line=True)
+        previous = None
+        try:
+            for line in self.console.expect_lines(matcher, timeout=timeout):
+                line = line.replace("\r", "")
+                # Strip possible U-Boot timestamps from the line
+                if self.strip_timestamp:
+                    line = re_uboot_timestamp.sub('', line)
+                if previous is not None:
+                    yield previous
+                previous = line
+        except GeneratorExit:
+            # the output is no longer consumed, stop the command
+            self.console.sendcontrol("c")
+            self._check_prompt()
+            raise
+        return [], int(previous)
 
+    def _run(self, cmd: str, *, timeout: int = 30, codec: str = "utf-8", decodeerrors: str = "strict"):  # pylint: disable=unused-argument,line-too-long
+        if self._status == 1:
+            output = RunIterator(self._run_iter(cmd, timeout=timeout, codec=codec, decodeerrors=decodeerrors))
+            data = list(output)
             self.logger.debug("Received Data: %s", data)
-            # Remove first element, the invoked cmd
-            data = data[data.index(marker) + 1:]
-            data = data[:data.index(marker)]
-            exitcode = int(data[-1])
-            del data[-1]
-            return (data, [], exitcode)
+            return (data, output.stderr, output.exitcode)
 
         return None
 
@@ -9,7 +9,7 @@ import attr
 from ..factory import target_factory
 from ..resource.remote import RemoteUSBResource
 from ..step import step
-from ..util.managedfile import ManagedFile
+from ..util.managedfile import ManagedFile, sync_to_resources
 from .common import Driver
 from ..driver.exception import ExecutionError
 
@@ -100,12 +100,9 @@ class USBStorageDriver(Driver):
             target_rel = target.relative_to(target.root) if target.root is not None else target
             target_path = str(pathlib.PurePath(mount_path) / target_rel)
 
-            copied_sources = []
-
-            for f in sources:
-                mf = ManagedFile(f, self.storage)
-                mf.sync_to_resource()
-                copied_sources.append(mf.get_remote_path())
+            mfs = [ManagedFile(f, self.storage) for f in sources]
+            sync_to_resources(mfs)
+            copied_sources = [mf.get_remote_path() for mf in mfs]
 
             if target_is_directory:
                 args = ["cp", "-t", target_path] + copied_sources
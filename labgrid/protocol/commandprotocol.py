@@ -18,6 +18,12 @@ class CommandProtocol(abc.ABC):
         """
         raise NotImplementedError
 
+    def run_iter(self, command: str):
+        """
+        Run a command, return an iterator over the output lines
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def get_status(self):
         """
@@ -27,6 +27,9 @@ class ConsoleProtocol(abc.ABC):
     def expect(self, pattern: str):
         raise NotImplementedError
 
+    def expect_lines(self, matcher, timeout: float = -1):
+        raise NotImplementedError
+
     class Client(abc.ABC):
         @abc.abstractmethod
         def get_console_matches(self):
@@ -9,6 +9,7 @@ import enum
 import os
 import pathlib
 import subprocess
+import time
 import traceback
 import logging
 import signal
@@ -22,7 +23,7 @@ from textwrap import indent
 from socket import gethostname
 from getpass import getuser
 from collections import defaultdict, OrderedDict
-from datetime import datetime
+from datetime import datetime, timedelta
 from pprint import pformat
 from typing import Any, Dict
 
@@ -46,7 +47,7 @@ from .. import Environment, Target, target_factory
 from ..exceptions import NoDriverFoundError, NoResourceFoundError, InvalidConfigError
 from .generated import labgrid_coordinator_pb2, labgrid_coordinator_pb2_grpc
 from ..resource.remote import RemotePlaceManager, RemotePlace
-from ..util import diff_dict, flat_dict, dump, atomic_replace, labgrid_version, Timeout
+from ..util import diff_dict, flat_dict, dump, load, atomic_replace, labgrid_version, Timeout
 from ..util.proxy import proxymanager
 from ..util.helper import processwrapper
 from ..driver import Mode, ExecutionError
@@ -98,6 +99,7 @@ class ClientSession:
     prog = attr.ib(default=None, validator=attr.validators.optional(attr.validators.instance_of(str)))
     args = attr.ib(default=None, validator=attr.validators.optional(attr.validators.instance_of(argparse.Namespace)))
     monitor = attr.ib(default=False, validator=attr.validators.instance_of(bool))
+    place_filter = attr.ib(default=None, validator=attr.validators.optional(attr.validators.instance_of(list)))
 
     def gethostname(self):
         return os.environ.get("LG_HOSTNAME", gethostname())
@@ -141,16 +143,49 @@ class ClientSession:
         msg = labgrid_coordinator_pb2.ClientInMessage()
         msg.startup.version = labgrid_version()
         msg.startup.name = f"{self.gethostname()}/{self.getuser()}"
+        msg.startup.resource_deltas = True
         self.out_queue.put_nowait(msg)
+        if self.place_filter is None:
+            self._subscribe_all()
+        else:
+            msg = labgrid_coordinator_pb2.ClientInMessage()
+            msg.subscribe.filter.places.extend(self.place_filter)
+            self.out_queue.put_nowait(msg)
+        # the coordinator needs to process the startup message before other
+        # calls from this session (such as AcquirePlace) are accepted
+        await self.sync_with_coordinator()
+        if self.stopping.is_set():
+            raise ServerError("Could not connect to coordinator")
+        if self.place_filter is not None and not self.places:
+            # subscribe to everything if no place matches (for proper error
+            # messages) or if the coordinator does not support filters
+            logging.debug("no places matching %s, subscribing to all places", self.place_filter)
+            self._subscribe_all()
+            await self.sync_with_coordinator()
+            if self.stopping.is_set():
+                raise ServerError("Could not connect to coordinator")
+
+    def _subscribe_all(self):
+        self.place_filter = None
         msg = labgrid_coordinator_pb2.ClientInMessage()
         msg.subscribe.all_places = True
         self.out_queue.put_nowait(msg)
         msg = labgrid_coordinator_pb2.ClientInMessage()
         msg.subscribe.all_resources = True
         self.out_queue.put_nowait(msg)
+
+    async def subscribe_places(self, patterns):
+        """Receive updates for additional places, if the session only subscribed to some places."""
+        if self.place_filter is None:
+            return
+        patterns = [pattern for pattern in patterns if pattern not in self.place_filter]
+        if not patterns:
+            return
+        self.place_filter.extend(patterns)
+        msg = labgrid_coordinator_pb2.ClientInMessage()
+        msg.subscribe.filter.places.extend(patterns)
+        self.out_queue.put_nowait(msg)
         await self.sync_with_coordinator()
-        if self.stopping.is_set():
-            raise ServerError("Could not connect to coordinator")
 
     async def stop(self):
         """Stops stream for resource and place updates started with ClientSession.start()."""
@@ -205,13 +240,10 @@ class ClientSession:
                 for update in out_msg.updates:
                     update_kind = update.WhichOneof("kind")
                     if update_kind == "resource":
-                        resource: labgrid_coordinator_pb2.Resource = update.resource
-                        await self.on_resource_changed(
-                            resource.path.exporter_name,
-                            resource.path.group_name,
-                            resource.path.resource_name,
-                            ResourceEntry.data_from_pb2(resource),
-                        )
+                        await self._on_resource_pb2(update.resource)
+                    elif update_kind == "resource_delta":
+                        delta: labgrid_coordinator_pb2.ResourceDelta = update.resource_delta
+                        await self.on_resource_delta(delta)
                     elif update_kind == "del_resource":
                         resource_path: labgrid_coordinator_pb2.Resource.Path = update.del_resource
                         await self.on_resource_changed(
@@ -263,6 +295,28 @@ class ClientSession:
             else:
                 print(f"Resource {exporter}/{group_name}/???/{resource_name} deleted")
 
+    async def _on_resource_pb2(self, resource: labgrid_coordinator_pb2.Resource):
+        path = resource.path
+        await self.on_resource_changed(
+            path.exporter_name, path.group_name, path.resource_name, ResourceEntry.data_from_pb2(resource)
+        )
+        self.resources[path.exporter_name][path.group_name][path.resource_name].version = resource.version
+
+    async def on_resource_delta(self, delta: labgrid_coordinator_pb2.ResourceDelta):
+        path = delta.path
+        entry = self.resources.get(path.exporter_name, {}).get(path.group_name, {}).get(path.resource_name)
+        base_version = delta.base_version if delta.HasField("base_version") else delta.version - 1
+        if entry is None or "cls" not in entry.data or entry.version != base_version:
+            # we missed an update, so request the full resource
+            logging.debug("requesting full update for %s after delta mismatch", path)
+            msg = labgrid_coordinator_pb2.ClientInMessage()
+            msg.resync_resource.CopyFrom(path)
+            self.out_queue.put_nowait(msg)
+            return
+        resource = ResourceEntry.data_from_delta_pb2(entry.data, delta)
+        await self.on_resource_changed(path.exporter_name, path.group_name, path.resource_name, resource)
+        entry.version = delta.version
+
     async def on_place_changed(self, place_pb2: labgrid_coordinator_pb2.Place):
         name = place_pb2.name
 
@@ -421,14 +475,19 @@ class ClientSession:
                 result[-1].append(", ".join(sorted(exporters)))
         result.sort()
 
-        widths = [max(map(len, c)) for c in zip(*result)]
+        self._print_table(result)
+
+    @staticmethod
+    def _print_table(rows):
+        """Print the rows with left-aligned columns"""
+        widths = [max(map(len, c)) for c in zip(*rows)]
         layout = []
         for i, w in enumerate(widths):
             layout.append("{%i:<%is}" % (i, w))
         layout = "  ".join(layout)
 
-        for entry in result:
-            print(layout.format(*entry))
+        for row in rows:
+            print(layout.format(*row).rstrip())
 
     def _match_places(self, pattern):
         """search for substring matches of pattern in place names and aliases
@@ -696,6 +755,112 @@ class ClientSession:
         except grpc.aio.AioRpcError as e:
             raise ServerError(e.details())
 
+    async def export_places(self):
+        """Write the configuration of all places as YAML"""
+        places = {}
+        for name, place in sorted(self.places.items()):
+            places[name] = {
+                "aliases": sorted(place.aliases),
+                "comment": place.comment,
+                "tags": dict(sorted(place.tags.items())),
+                "matches": [attr.asdict(match) for match in place.matches],
+            }
+        data = dump(places)
+        if self.args.filename == "-":
+            sys.stdout.write(data)
+        else:
+            atomic_replace(self.args.filename, data.encode())
+
+    @staticmethod
+    def _get_place_operations(place, config):
+        """Return the operations needed to change the place to the config.
+
+        Keys missing from the config are left unchanged.
+        """
+        operations = []
+        name = place.name
+        if "aliases" in config:
+            aliases = set(config["aliases"] or [])
+            for alias in sorted(place.aliases - aliases):
+                request = labgrid_coordinator_pb2.DeletePlaceAliasRequest(placename=name, alias=alias)
+                operations.append(labgrid_coordinator_pb2.PlaceOperation(delete_alias=request))
+            for alias in sorted(aliases - place.aliases):
+                request = labgrid_coordinator_pb2.AddPlaceAliasRequest(placename=name, alias=alias)
+                operations.append(labgrid_coordinator_pb2.PlaceOperation(add_alias=request))
+        if "comment" in config and (config["comment"] or "") != place.comment:
+            request = labgrid_coordinator_pb2.SetPlaceCommentRequest(placename=name, comment=config["comment"] or "")
+            operations.append(labgrid_coordinator_pb2.PlaceOperation(set_comment=request))
+        if "tags" in config:
+            tags = {str(k): str(v) for k, v in (config["tags"] or {}).items()}
+            if tags != place.tags:
+                # empty values delete the tag
+                changed = {k: "" for k in place.tags if k not in tags}
+                changed.update(tags)
+                request = labgrid_coordinator_pb2.SetPlaceTagsRequest(placename=name, tags=changed)
+                operations.append(labgrid_coordinator_pb2.PlaceOperation(set_tags=request))
+        if "matches" in config:
+            matches = []
+            for match in config["matches"] or []:
+                if isinstance(match, str):
+                    pattern, _, rename = match.partition(" -> ")
+                    match = attr.asdict(ResourceMatch.fromstr(pattern))
+                    match["rename"] = rename or None
+                try:
+                    matches.append(ResourceMatch(**match))
+                except TypeError as e:
+                    raise UserError(f"invalid match {match} for place {name}") from e
+            # rename is not compared by ResourceMatch, so compare it explicitly
+            current = [(repr(match), match.rename) for match in place.matches]
+            wanted = [(repr(match), match.rename) for match in matches]
+            if current != wanted:
+                for pattern, _ in current:
+                    request = labgrid_coordinator_pb2.DeletePlaceMatchRequest(placename=name, pattern=pattern)
+                    operations.append(labgrid_coordinator_pb2.PlaceOperation(delete_match=request))
+                for pattern, rename in wanted:
+                    request = labgrid_coordinator_pb2.AddPlaceMatchRequest(
+                        placename=name, pattern=pattern, rename=rename
+                    )
+                    operations.append(labgrid_coordinator_pb2.PlaceOperation(add_match=request))
+        return operations
+
+    async def import_places(self):
+        """Create or update places from a YAML file in a single transaction"""
+        try:
+            with open(self.args.filename) as f:
+                places = load(f) or {}
+        except OSError as e:
+            raise UserError(f"failed to read {self.args.filename}: {e}") from e
+        if not isinstance(places, dict):
+            raise UserError(f"{self.args.filename} needs to contain a mapping of place names to configs")
+
+        operations = []
+        for name, config in places.items():
+            config = config or {}
+            if not isinstance(config, dict):
+                raise UserError(f"config for place {name} needs to be a mapping")
+            place = self.places.get(name)
+            if place is None:
+                request = labgrid_coordinator_pb2.AddPlaceRequest(name=name)
+                operations.append(labgrid_coordinator_pb2.PlaceOperation(add_place=request))
+                place = Place(name)
+            operations.extend(self._get_place_operations(place, config))
+        if self.args.delete:
+            for name in sorted(self.places.keys() - places.keys()):
+                request = labgrid_coordinator_pb2.DeletePlaceRequest(name=name)
+                operations.append(labgrid_coordinator_pb2.PlaceOperation(delete_place=request))
+
+        if not operations:
+            print("places are up to date")
+            return
+
+        request = labgrid_coordinator_pb2.UpdatePlacesRequest(operations=operations)
+        try:
+            response = await self.stub.UpdatePlaces(request)
+            await self.sync_with_coordinator()
+        except grpc.aio.AioRpcError as e:
+            raise ServerError(e.details()) from e
+        print(f"changed {len(response.changed_places)} place(s) with {len(operations)} operation(s)")
+
     def check_matches(self, place):
         resources = []
         for exporter, groups in self.resources.items():
@@ -1625,6 +1790,73 @@ class ClientSession:
             print(f"Reservation '{res.token}':")
             res.show(level=1)
 
+    async def print_history(self):
+        def parse_time(value):
+            try:
+                return datetime.fromisoformat(value).timestamp()
+            except ValueError as e:
+                raise UserError(f"'{value}' is not a valid ISO 8601 date/time") from e
+
+        tags = {}
+        for pair in self.args.tags:
+            k, sep, v = pair.partition("=")
+            if not sep:
+                raise UserError(f"'{pair}' is not a valid tag (must contain a '=')")
+            tags[k] = v
+
+        until = parse_time(self.args.until) if self.args.until else time.time()
+        if self.args.since:
+            since = parse_time(self.args.since)
+        elif self.args.utilization:
+            since = until - 7 * 24 * 60 * 60
+        else:
+            since = None
+
+        request = labgrid_coordinator_pb2.GetHistoryRequest(
+            place=self.args.place, user=self.args.user, tags=tags, until=until, limit=self.args.limit
+        )
+        if since is not None:
+            request.since = since
+        request.utilization = self.args.utilization
+
+        try:
+            response: labgrid_coordinator_pb2.GetHistoryResponse = await self.stub.GetHistory(request)
+        except grpc.aio.AioRpcError as e:
+            raise ServerError(e.details()) from e
+
+        if self.args.utilization:
+            start = f"{datetime.fromtimestamp(since):%Y-%m-%d %H:%M:%S}"
+            end = f"{datetime.fromtimestamp(until):%Y-%m-%d %H:%M:%S}"
+            print(f"Utilization from {start} to {end}:")
+            rows = [["Place", "Acquisitions", "Acquired", "Utilization"]]
+            for entry in response.utilization:
+                rows.append(
+                    [
+                        entry.place,
+                        str(entry.acquisitions),
+                        str(timedelta(seconds=round(entry.acquired_seconds))),
+                        f"{100 * entry.acquired_seconds / (until - since):.1f}%",
+                    ]
+                )
+            self._print_table(rows)
+            return
+
+        rows = [["Place", "User", "Host", "Acquired", "Released", "Duration"]]
+        for entry in response.entries:
+            host, _, user = entry.user.rpartition("/")
+            released = entry.released if entry.HasField("released") else None
+            rows.append(
+                [
+                    entry.place,
+                    user,
+                    host,
+                    str(datetime.fromtimestamp(round(entry.acquired))),
+                    str(datetime.fromtimestamp(round(released))) if released else "-",
+                    str(timedelta(seconds=round((released or time.time()) - entry.acquired))),
+                ]
+            )
+        self._print_table(rows)
+
     async def export(self, place, target):
         exported = target.export()
         exported["LG__CLIENT_PID"] = str(os.getpid())
@@ -1735,6 +1967,35 @@ def find_role_by_place(config, place):
     return None
 
 
+def get_place_filter(args, env):
+    """Returns the place patterns the command needs updates for, or None if it needs all places."""
+    if not args.place or args.place.startswith("+"):
+        return None
+    if getattr(args, "func", None) in (
+        ClientSession.complete,
+        ClientSession.do_monitor,
+        ClientSession.print_resources,
+        ClientSession.print_places,
+        ClientSession.print_who,
+        ClientSession.add_place,
+        ClientSession.create_reservation,
+        ClientSession.cancel_reservation,
+        ClientSession.wait_reservation,
+        ClientSession.print_reservations,
+        ClientSession.print_history,
+        ClientSession.export_places,
+        ClientSession.import_places,
+        ClientSession.print_version,
+    ):
+        return None
+    places = [args.place]
+    if env:
+        for role_config in env.config.get_targets().values():
+            resources, _ = target_factory.normalize_config(role_config)
+            places.extend(place for place in resources.get("RemotePlace", {}) if place not in places)
+    return places
+
+
 def find_any_role_with_place(config):
     for role, role_config in config.items():
         resources, _ = target_factory.normalize_config(role_config)
@@ -1953,6 +2214,19 @@ def get_parser(auto_doc_mode=False) -> "argparse.ArgumentParser | AutoProgramArg
     subparser.add_argument("name", metavar="NAME")
     subparser.set_defaults(func=ClientSession.add_named_match)
 
+    subparser = subparsers.add_parser("export-places", help="write the configuration of all places as YAML")
+    subparser.add_argument("filename", nargs="?", default="-", help="output file (default: stdout)")
+    subparser.set_defaults(func=ClientSession.export_places)
+
+    subparser = subparsers.add_parser(
+        "import-places",
+        help="create or update places from a YAML file",
+        description="apply all changes in a single transaction; keys missing from a place's config are left unchanged",
+    )
+    subparser.add_argument("filename", help="YAML file as written by export-places")
+    subparser.add_argument("--delete", action="store_true", help="delete places missing from the file")
+    subparser.set_defaults(func=ClientSession.import_places)
+
     subparser = subparsers.add_parser("acquire", aliases=("lock",), help="acquire a place")
     subparser.add_argument(
         "--allow-unmatched", action="store_true", help="allow missing resources for matches when locking the place"
@@ -2220,6 +2494,26 @@ def get_parser(auto_doc_mode=False) -> "argparse.ArgumentParser | AutoProgramArg
     subparser = subparsers.add_parser("reservations", help="list current reservations")
     subparser.set_defaults(func=ClientSession.print_reservations)
 
+    subparser = subparsers.add_parser(
+        "history",
+        help="list past acquisitions of places (of the place given via --place, if any)",
+        description="needs a coordinator with '--snapshot-format sqlite'",
+    )
+    subparser.add_argument("--user", help="only show acquisitions by this user (HOST/USER)")
+    subparser.add_argument(
+        "--tag", dest="tags", metavar="KEY=VALUE", action="append", default=[], help="only show places with this tag"
+    )
+    subparser.add_argument("--since", metavar="DATETIME", help="start of the time range (ISO 8601)")
+    subparser.add_argument("--until", metavar="DATETIME", help="end of the time range (ISO 8601, default: now)")
+    subparser.add_argument("--limit", type=int, default=100, help="maximum number of acquisitions (default 100)")
+    subparser.add_argument(
+        "-u",
+        "--utilization",
+        action="store_true",
+        help="show the utilization per place instead (for the last 7 days by default)",
+    )
+    subparser.set_defaults(func=ClientSession.print_history)
+
     subparser = subparsers.add_parser(
         "export", help="export driver information to a file (needs environment with drivers)"
     )
@@ -2330,6 +2624,7 @@ def main():
         "env": env,
         "role": role,
         "prog": parser.prog,
+        "place_filter": get_place_filter(args, env),
     }
 
     if args.command and args.command != "help":
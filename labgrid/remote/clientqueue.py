@@ -0,0 +1,178 @@
+"""
+This module contains the outbound message queue used by the coordinator for
+each connected client.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+
+import attr
+
+from .generated import labgrid_coordinator_pb2
+
+
+def _update_key(update):
+    """Return the key identifying the place or resource changed by an UpdateResponse."""
+    kind = update.WhichOneof("kind")
+    if kind == "place":
+        return ("place", update.place.name)
+    if kind == "del_place":
+        return ("place", update.del_place)
+    if kind == "resource":
+        path = update.resource.path
+    elif kind == "del_resource":
+        path = update.del_resource
+    elif kind == "resource_delta":
+        path = update.resource_delta.path
+    else:
+        # unknown updates are never coalesced
+        return object()
+    return ("resource", path.exporter_name, path.group_name, path.resource_name)
+
+
+def _merge_map(target, removed, changes, changes_removed):
+    for k, v in changes.items():
+        target[k].CopyFrom(v)
+        if k in removed:
+            removed.remove(k)
+    for k in changes_removed:
+        if k in target:
+            del target[k]
+        if removed is not None and k not in removed:
+            removed.append(k)
+
+
+def merge_updates(old, new):
+    """Return a single UpdateResponse with the same effect as old followed by new.
+
+    The given messages are not modified, as they may be shared between clients.
+    """
+    if new.WhichOneof("kind") != "resource_delta":
+        # full states and deletions replace any previous update
+        return new
+    old_kind = old.WhichOneof("kind")
+    delta = new.resource_delta
+    merged = labgrid_coordinator_pb2.UpdateResponse()
+    merged.CopyFrom(old)
+    if old_kind == "resource":
+        resource = merged.resource
+        if delta.HasField("acquired"):
+            resource.acquired = delta.acquired
+        if delta.HasField("avail"):
+            resource.avail = delta.avail
+        _merge_map(resource.params, [], delta.params, delta.removed_params)
+        _merge_map(resource.extra, [], delta.extra, delta.removed_extra)
+        resource.version = delta.version
+    elif old_kind == "resource_delta":
+        combined = merged.resource_delta
+        if not combined.HasField("base_version"):
+            combined.base_version = combined.version - 1
+        if delta.HasField("acquired"):
+            combined.acquired = delta.acquired
+        if delta.HasField("avail"):
+            combined.avail = delta.avail
+        _merge_map(combined.params, combined.removed_params, delta.params, delta.removed_params)
+        _merge_map(combined.extra, combined.removed_extra, delta.extra, delta.removed_extra)
+        combined.version = delta.version
+    else:
+        # a delta for a deleted resource can't be applied by the client
+        # anyway, so let it request the full resource
+        return new
+    return merged
+
+
+@attr.s(eq=False)
+class ClientQueue:
+    """Outbound queue for the messages sent to a client.
+
+    Pending updates for the same place or resource are coalesced into the
+    latest state, so the queue never contains more updates than there are
+    places and resources, regardless of how slowly the client receives them.
+    Updates are sent in batches of up to batch_size per ClientOutMessage.
+    A sync response is only sent after all updates queued before it.
+    """
+
+    batch_size = attr.ib(default=100, validator=attr.validators.instance_of(int))
+    pending = attr.ib(init=False, default=attr.Factory(OrderedDict))
+    syncs = attr.ib(init=False, default=attr.Factory(list))
+    counter = attr.ib(init=False, default=0)
+    closed = attr.ib(init=False, default=False)
+    max_depth = attr.ib(init=False, default=0)
+    coalesced = attr.ib(init=False, default=0)
+    sent = attr.ib(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        self.ready = asyncio.Event()
+
+    @property
+    def depth(self):
+        """Number of pending updates."""
+        return len(self.pending)
+
+    def put_nowait(self, msg):
+        """Queue the updates and the sync response contained in a ClientOutMessage.
+
+        None closes the queue.
+        """
+        if msg is None:
+            self.closed = True
+            self.ready.set()
+            return
+        for update in msg.updates:
+            key = _update_key(update)
+            entry = self.pending.get(key)
+            if entry is None:
+                self.pending[key] = (self.counter, update)
+                self.counter += 1
+            else:
+                # keep the position of the first update, as the client may
+                # already wait for a sync response queued after it
+                self.pending[key] = (entry[0], merge_updates(entry[1], update))
+                self.coalesced += 1
+        if msg.HasField("sync"):
+            self.syncs.append((self.counter, msg.sync.id))
+        self.max_depth = max(self.max_depth, len(self.pending))
+        if self.pending or self.syncs:
+            self.ready.set()
+
+    def get_nowait(self):
+        """Return the next ClientOutMessage or None if nothing is pending."""
+        out_msg = labgrid_coordinator_pb2.ClientOutMessage()
+        while self.pending and len(out_msg.updates) < self.batch_size:
+            _, (_, update) = self.pending.popitem(last=False)
+            out_msg.updates.append(update)
+        if self.syncs:
+            oldest = next(iter(self.pending.values()))[0] if self.pending else self.counter
+            position, identifier = self.syncs[0]
+            if position <= oldest:
+                self.syncs.pop(0)
+                out_msg.sync.id = identifier
+        if not self.pending and not self.syncs:
+            self.ready.clear()
+        if not out_msg.updates and not out_msg.HasField("sync"):
+            return None
+        self.sent += len(out_msg.updates)
+        return out_msg
+
+    async def get(self):
+        """Wait for the next ClientOutMessage, returns None if the queue was closed."""
+        while True:
+            out_msg = self.get_nowait()
+            if out_msg is not None:
+                return out_msg
+            if self.closed:
+                return None
+            await self.ready.wait()
+
+    async def __aiter__(self):
+        while True:
+            try:
+                out_msg = await self.get()
+            except asyncio.CancelledError:
+                # gRPC doesn't like to receive exceptions from the request_iterator
+                return
+            if out_msg is None:
+                return
+            yield out_msg
+            logging.debug("sent message %s", out_msg)
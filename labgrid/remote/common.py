@@ -61,6 +61,8 @@ def build_dict_from_map(m):
 @attr.s(eq=False)
 class ResourceEntry:
     data = attr.ib()  # cls, params
+    # incremented by the exporter for each update, used for ResourceDelta messages
+    version = attr.ib(default=0, kw_only=True)
 
     def __attrs_post_init__(self):
         assert isinstance(self.data, dict)
@@ -128,8 +130,61 @@ class ResourceEntry:
         if self.acquired is not None:
             msg.acquired = self.acquired
         msg.avail = self.avail
+        msg.version = self.version
         return msg
 
+    def snapshot(self):
+        """Return a copy of the data, which is not modified by later updates"""
+        data = self.asdict()
+        data["params"] = data["params"].copy()
+        data["params"]["extra"] = self.extra.copy()
+        return data
+
+    def as_delta_pb2(self, old):
+        """Return a ResourceDelta message with the changes since the old snapshot
+
+        Returns None if the changes cannot be represented as a delta.
+        """
+        if old["cls"] != self.cls:
+            return None
+        msg = labgrid_coordinator_pb2.ResourceDelta()
+        msg.version = self.version
+        if old["acquired"] != self.acquired:
+            msg.acquired = self.acquired or ""
+        if old["avail"] != self.avail:
+            msg.avail = self.avail
+
+        def diff(old, new, changed, removed):
+            set_map_from_dict(
+                changed, {k: v for k, v in new.items() if k not in old or type(old[k]) is not type(v) or old[k] != v}
+            )
+            removed.extend(k for k in old if k not in new)
+
+        old_params = old["params"].copy()
+        old_extra = old_params.pop("extra", {})
+        diff(old_params, self.args, msg.params, msg.removed_params)
+        diff(old_extra, self.extra, msg.extra, msg.removed_extra)
+        return msg
+
+    @staticmethod
+    def data_from_delta_pb2(data, pb2):
+        """Return a copy of the data with the changes from a ResourceDelta message applied"""
+        assert isinstance(pb2, labgrid_coordinator_pb2.ResourceDelta)
+        data = data.copy()
+        if pb2.HasField("acquired"):
+            data["acquired"] = pb2.acquired or None
+        if pb2.HasField("avail"):
+            data["avail"] = pb2.avail
+        params = data["params"] = data["params"].copy()
+        extra = params["extra"] = params.get("extra", {}).copy()
+        params.update(build_dict_from_map(pb2.params))
+        for k in pb2.removed_params:
+            params.pop(k, None)
+        extra.update(build_dict_from_map(pb2.extra))
+        for k in pb2.removed_extra:
+            extra.pop(k, None)
+        return data
+
     @staticmethod
     def data_from_pb2(pb2):
         assert isinstance(pb2, labgrid_coordinator_pb2.Resource)
@@ -213,7 +268,7 @@ class ResourceMatch:
             group=pb2.group,
             cls=pb2.cls,
             name=pb2.name if pb2.HasField("name") else None,
-            rename=pb2.rename,
+            rename=pb2.rename if pb2.HasField("rename") else None,
         )
 
 
@@ -10,6 +10,9 @@ from contextlib import contextmanager
 import copy
 import random
 import signal
+import socket
+from collections import Counter, OrderedDict
+from itertools import count, groupby
 
 import attr
 import grpc
@@ -25,10 +28,16 @@ from .common import (
     TAG_KEY,
     TAG_VAL,
 )
-from .scheduler import TagSet, schedule
+from .clientqueue import ClientQueue
+from .history import History
+from .journal import Journal
+from .matchindex import MatchIndex
+from .metrics import Registry, TimedLock, serve_metrics
+from .scheduler import TagSet, fair_share, schedule
+from .snapshot import SNAPSHOT_FORMATS, get_snapshot_format
 from .generated import labgrid_coordinator_pb2
 from .generated import labgrid_coordinator_pb2_grpc
-from ..util import atomic_replace, labgrid_version, yaml, Timeout
+from ..util import labgrid_version, Timeout
 
 
 @contextmanager
@@ -75,13 +84,17 @@ class ExporterSession(RemoteSession):
         old: ResourceImport = group.get(resourcename)
         if resource is not None:
             new = ResourceImport(
-                data=ResourceImport.data_from_pb2(resource), path=(self.name, groupname, resource.cls, resourcename)
+                data=ResourceImport.data_from_pb2(resource),
+                path=(self.name, groupname, resource.cls, resourcename),
+                version=resource.version,
             )
             if old:
                 old.data.update(new.data)
+                old.version = new.version
                 new = old
             else:
                 group[resourcename] = new
+                self.coordinator.match_index.add_resource(new.path, new)
         else:
             new = None
             if old.acquired:
@@ -90,6 +103,7 @@ class ExporterSession(RemoteSession):
                 del group[resourcename]
             except KeyError:
                 pass
+            self.coordinator.match_index.remove_resource(old.path)
 
         msg = labgrid_coordinator_pb2.ClientOutMessage()
         update = msg.updates.add()
@@ -98,13 +112,14 @@ class ExporterSession(RemoteSession):
             update.resource.path.exporter_name = self.name
             update.resource.path.group_name = groupname
             update.resource.path.resource_name = resourcename
+            for client in self.coordinator.clients.values():
+                client.send_resource(new.path, msg)
         else:
             update.del_resource.exporter_name = self.name
             update.del_resource.group_name = groupname
             update.del_resource.resource_name = resourcename
-
-        for client in self.coordinator.clients.values():
-            client.queue.put_nowait(msg)
+            for client in self.coordinator.clients.values():
+                client.send_resource_deleted(old.path, msg)
 
         if old and new:
             assert old is new
@@ -116,6 +131,41 @@ class ExporterSession(RemoteSession):
 
         assert not old and not new
 
+    def update_resource(self, groupname, resourcename, delta):
+        """This is called when Exporters send only the changed fields of a resource.
+
+        Returns None if the delta does not apply to the current version, so a
+        full update needs to be requested from the exporter.
+        """
+        logging.info("update_resource %s %s %s", groupname, resourcename, delta)
+        resource: ResourceImport = self.groups.get(groupname, {}).get(resourcename)
+        if resource is None or delta.version != resource.version + 1:
+            return None
+        resource.data.update(ResourceImport.data_from_delta_pb2(resource.data, delta))
+        resource.version = delta.version
+
+        delta_msg = labgrid_coordinator_pb2.ClientOutMessage()
+        update = delta_msg.updates.add()
+        update.resource_delta.CopyFrom(delta)
+        update.resource_delta.path.exporter_name = self.name
+        msg = None
+        for client in self.coordinator.clients.values():
+            if not client.wants_resource(resource.path):
+                continue
+            if client.resource_deltas and client.knows_resource(resource.path):
+                client.queue.put_nowait(delta_msg)
+                continue
+            if msg is None:
+                msg = labgrid_coordinator_pb2.ClientOutMessage()
+                update = msg.updates.add()
+                update.resource.CopyFrom(resource.as_pb2())
+                update.resource.path.exporter_name = self.name
+                update.resource.path.group_name = groupname
+                update.resource.path.resource_name = resourcename
+            client.send_resource(resource.path, msg)
+
+        return resource
+
     def get_resources(self):
         """Method invoked by the client, get the resources from the coordinator"""
         result = {}
@@ -126,9 +176,144 @@ class ExporterSession(RemoteSession):
         return result
 
 
+@attr.s(eq=False)
+class SubscriptionFilter:
+    """Selects the places and resources a client is interested in.
+
+    A place is selected if one of the place patterns is a substring of its
+    name or one of its aliases (like the place lookup in the client) or if it
+    has all tags of one of the tag filters.
+    A resource is selected if it belongs to one of the exporters or if it
+    matches a selected place.
+    """
+
+    places = attr.ib(default=attr.Factory(set))
+    exporters = attr.ib(default=attr.Factory(set))
+    tags = attr.ib(default=attr.Factory(list))
+
+    def update_from_pb2(self, pb2):
+        self.places.update(pb2.places)
+        self.exporters.update(pb2.exporters)
+        if pb2.tags:
+            self.tags.append(dict(pb2.tags))
+
+    def match_place(self, place):
+        for pattern in self.places:
+            if pattern in place.name:
+                return True
+            if any(pattern in alias for alias in place.aliases):
+                return True
+        return any(tags.items() <= place.tags.items() for tags in self.tags)
+
+
 @attr.s(eq=False)
 class ClientSession(RemoteSession):
+    resource_deltas = attr.ib(default=False, kw_only=True)
+    replica = attr.ib(default=False, kw_only=True)
+    subscription = attr.ib(default=None, init=False)
+    known_places = attr.ib(default=attr.Factory(set), init=False)
+    known_resources = attr.ib(default=attr.Factory(set), init=False)
+
+    def wants_place(self, place):
+        return self.subscription is None or self.subscription.match_place(place)
+
+    def wants_resource(self, path):
+        """Return True if the resource with the (exporter, group, cls, name) path should be sent."""
+        if self.subscription is None:
+            return True
+        if path[0] in self.subscription.exporters:
+            return True
+        places = self.coordinator.places
+        for place_name in self.coordinator.match_index.get_places(path):
+            if self.subscription.match_place(places[place_name]):
+                return True
+        return False
+
+    def knows_resource(self, path):
+        """Return True if the full resource has been sent to the client before."""
+        return self.subscription is None or path in self.known_resources
+
+    def send_place(self, place, msg):
+        if self.subscription is None:
+            self.queue.put_nowait(msg)
+        elif self.wants_place(place):
+            self.known_places.add(place.name)
+            self.queue.put_nowait(msg)
+            # the place may match additional resources after changes to its matches or tags
+            self._send_resources(self.coordinator.match_index.get_resources(place.name))
+        elif place.name in self.known_places:
+            self.send_place_deleted(place.name)
+
+    def send_place_deleted(self, name, msg=None):
+        if self.subscription is not None:
+            if name not in self.known_places:
+                return
+            self.known_places.discard(name)
+        if msg is None:
+            msg = labgrid_coordinator_pb2.ClientOutMessage()
+            msg.updates.add().del_place = name
+        self.queue.put_nowait(msg)
+
+    def send_resource(self, path, msg):
+        if self.subscription is None:
+            self.queue.put_nowait(msg)
+        elif self.wants_resource(path):
+            self.known_resources.add(path)
+            self.queue.put_nowait(msg)
+
+    def send_resource_deleted(self, path, msg):
+        if self.subscription is None:
+            self.queue.put_nowait(msg)
+        elif path in self.known_resources:
+            self.known_resources.discard(path)
+            self.queue.put_nowait(msg)
+
+    def _send_resources(self, resources):
+        """Send the given resources unless the client already knows them."""
+        collected = []
+        for resource in resources:
+            resource: ResourceImport
+            if self.subscription is not None:
+                if resource.path in self.known_resources:
+                    continue
+                self.known_resources.add(resource.path)
+            update = labgrid_coordinator_pb2.UpdateResponse()
+            update.resource.CopyFrom(resource.as_pb2())
+            update.resource.path.exporter_name = resource.path[0]
+            update.resource.path.group_name = resource.path[1]
+            update.resource.path.resource_name = resource.path[3]
+            collected.append(update)
+        # send batches
+        while collected:
+            batch, collected = collected[:100], collected[100:]
+            out_msg = labgrid_coordinator_pb2.ClientOutMessage()
+            out_msg.updates.extend(batch)
+            self.queue.put_nowait(out_msg)
+
+    def subscribe_filtered(self, pb2):
+        """Extend the subscription filter and send the newly selected places and resources."""
+        if self.subscription is None:
+            self.subscription = SubscriptionFilter()
+        self.subscription.update_from_pb2(pb2)
+
+        out_msg = labgrid_coordinator_pb2.ClientOutMessage()
+        for place in self.coordinator.places.values():
+            if place.name in self.known_places or not self.wants_place(place):
+                continue
+            self.known_places.add(place.name)
+            out_msg.updates.add().place.CopyFrom(place.as_pb2())
+        self.queue.put_nowait(out_msg)
+
+        selected = []
+        for exporter in self.coordinator.exporters.values():
+            for group in exporter.groups.values():
+                for resource in group.values():
+                    if self.wants_resource(resource.path):
+                        selected.append(resource)
+        self._send_resources(selected)
+
     def subscribe_places(self):
+        self.subscription = None
         # send initial places
         out_msg = labgrid_coordinator_pb2.ClientOutMessage()
         for place in self.coordinator.places.values():
@@ -137,6 +322,7 @@ class ClientSession(RemoteSession):
         self.queue.put_nowait(out_msg)
 
     def subscribe_resources(self):
+        self.subscription = None
         # collect initial resources
         collected = []
         logging.debug("sending resources to %s", self)
@@ -161,6 +347,21 @@ class ClientSession(RemoteSession):
             out_msg.updates.extend(batch)
             self.queue.put_nowait(out_msg)
 
+    def resync_resource(self, path):
+        """Send the full resource, after the client received a delta it could not apply"""
+        out_msg = labgrid_coordinator_pb2.ClientOutMessage()
+        update = out_msg.updates.add()
+        exporter = self.coordinator.get_exporter_by_name(path.exporter_name)
+        resource = exporter.groups.get(path.group_name, {}).get(path.resource_name) if exporter else None
+        if resource:
+            update.resource.CopyFrom(resource.as_pb2())
+            update.resource.path.CopyFrom(path)
+            if self.subscription is not None:
+                self.known_resources.add(resource.path)
+        else:
+            update.del_resource.CopyFrom(path)
+        self.queue.put_nowait(out_msg)
+
 
 @attr.s(eq=False)
 class ResourceImport(ResourceEntry):
@@ -182,6 +383,42 @@ def locked(func):
     return wrapper
 
 
+# metadata key used by replicas to pass the name of the client they forward a request for
+CLIENT_NAME_METADATA = "labgrid-client-name"
+
+
+class MetricsInterceptor(grpc.aio.ServerInterceptor):
+    """Records the duration of unary RPCs and the number of streaming RPCs of the coordinator service."""
+
+    def __init__(self, coordinator) -> None:
+        self.coordinator = coordinator
+        self.service = labgrid_coordinator_pb2.DESCRIPTOR.services_by_name["Coordinator"].full_name
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        service, _, method = handler_call_details.method.strip("/").rpartition("/")
+        if handler is None or service != self.service:
+            return handler
+
+        if handler.request_streaming or handler.response_streaming:
+            self.coordinator.metric_streams.labels(method).inc()
+            return handler
+
+        duration = self.coordinator.metric_rpc_duration.labels(method)
+        errors = self.coordinator.metric_rpc_errors.labels(method)
+        behavior = handler.unary_unary
+
+        async def wrapper(request, context):
+            with duration.time():
+                try:
+                    return await behavior(request, context)
+                except BaseException:
+                    errors.inc()
+                    raise
+
+        return handler._replace(unary_unary=wrapper)
+
+
 class ExporterCommand:
     def __init__(self, request) -> None:
         self.request = request
@@ -209,55 +446,156 @@ class ExporterError(Exception):
     pass
 
 
+class PlaceOperationError(Exception):
+    def __init__(self, code, details):
+        super().__init__(details)
+        self.code = code
+        self.details = details
+
+
 class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
-    def __init__(self) -> None:
+    # the debounce delay allows collecting multiple changes into one run
+    poll_steps = [("save", 1.0), ("sync_resources", 0.5), ("schedule", 0.1)]
+
+    def __init__(self, *, fair_share=False, snapshot_format="yaml") -> None:
+        self.fair_share = fair_share
+        self.snapshot = get_snapshot_format(snapshot_format)
+        self.history = History(self.snapshot.places_path) if self.snapshot.supports_history else None
+        self.history_lock = asyncio.Lock()
         self.places: dict[str, Place] = {}
         self.reservations = {}
         self.poll_tasks = []
         self.save_scheduled = False
-
-        self.lock = asyncio.Lock()
+        self.journal = Journal("journal.jsonl")
+        self.match_index = MatchIndex()
+
+        self.metrics = Registry()
+        self._create_metrics()
+
+        self.lock = TimedLock(self.metric_lock_wait, self.metric_lock_hold)
+        # serializes acquire and release of each place, which wait for the
+        # exporters without holding the global lock
+        self.place_locks: dict[str, asyncio.Lock] = {}
+        # resource path -> place name, for acquire and release requests in progress
+        self.pending_resources = {}
+        # place name -> place, for acquire requests in progress (the place is
+        # only marked as acquired once all resources are acquired)
+        self.acquiring_places: dict[str, Place] = {}
         self.exporters: dict[str, ExporterSession] = {}
         self.clients: dict[str, ClientSession] = {}
         self.load()
 
         self.loop = asyncio.get_running_loop()
-        for name in ["save", "sync_resources", "schedule"]:
+        self.poll_triggers: dict[str, asyncio.Event] = {}
+        for name, debounce in self.poll_steps:
             step_func = getattr(self, f"_poll_step_{name}")
-            task = self.loop.create_task(self.poll(step_func), name=f"coordinator-poll-{name}")
+            trigger = self.poll_triggers[name] = asyncio.Event()
+            task = self.loop.create_task(
+                self.poll(step_func, trigger, debounce=debounce), name=f"coordinator-poll-{name}"
+            )
             self.poll_tasks.append(task)
 
+    def _create_metrics(self):
+        metrics = self.metrics
+        prefix = "labgrid_coordinator"
+        self.metric_rpc_duration = metrics.histogram(
+            f"{prefix}_rpc_duration_seconds", "Duration of unary RPCs.", ["method"]
+        )
+        self.metric_rpc_errors = metrics.counter(
+            f"{prefix}_rpc_errors", "Number of RPCs which raised an exception or were aborted.", ["method"]
+        )
+        self.metric_streams = metrics.counter(f"{prefix}_streams", "Number of opened streaming RPCs.", ["method"])
+        self.metric_lock_wait = metrics.histogram(f"{prefix}_lock_wait_seconds", "Time spent waiting for the lock.")
+        self.metric_lock_hold = metrics.histogram(f"{prefix}_lock_hold_seconds", "Time the lock was held.")
+        self.metric_step_duration = metrics.histogram(
+            f"{prefix}_step_duration_seconds",
+            "Duration of the save, sync_resources and schedule steps.",
+            ["step"],
+        )
+        self.metric_exporter_command = metrics.histogram(
+            f"{prefix}_exporter_command_duration_seconds",
+            "Round-trip time of acquire and release commands sent to exporters.",
+            ["action"],
+        )
+        metrics.gauge(
+            f"{prefix}_client_queue_depth",
+            "Number of updates pending for each client.",
+            ["peer", "name"],
+            callback=lambda: {(peer, client.name): client.queue.depth for peer, client in self.clients.items()},
+        )
+        metrics.gauge(f"{prefix}_exporters", "Number of connected exporters.", callback=lambda: len(self.exporters))
+        metrics.gauge(f"{prefix}_clients", "Number of connected clients.", callback=lambda: len(self.clients))
+        metrics.gauge(f"{prefix}_places", "Number of places.", callback=lambda: len(self.places))
+        metrics.gauge(
+            f"{prefix}_resources",
+            "Number of exported resources.",
+            callback=lambda: sum(len(group) for e in self.exporters.values() for group in e.groups.values()),
+        )
+        metrics.gauge(
+            f"{prefix}_acquired_places",
+            "Number of acquired places.",
+            callback=lambda: sum(1 for place in self.places.values() if place.acquired),
+        )
+        metrics.gauge(
+            f"{prefix}_reservations",
+            "Number of reservations by state.",
+            ["state"],
+            callback=lambda: {
+                (state.name,): value for state, value in Counter(r.state for r in self.reservations.values()).items()
+            },
+        )
+
     async def _poll_step_save(self):
         # save changes
         if self.save_scheduled:
             with warn_if_slow("save changes", level=logging.DEBUG):
-                await self.save()
+                with self.metric_step_duration.labels("save").time():
+                    await self.save()
 
     async def _poll_step_sync_resources(self):
         # try to synchronize resources
         async with self.lock:
             with warn_if_slow("synchronize resources", limit=3.0):
-                await self._synchronize_resources()
+                with self.metric_step_duration.labels("sync_resources").time():
+                    await self._synchronize_resources()
 
     async def _poll_step_schedule(self):
         # update reservations
         async with self.lock:
             with warn_if_slow("schedule reservations"):
-                self.schedule_reservations()
+                with self.metric_step_duration.labels("schedule").time():
+                    self.schedule_reservations()
 
-    async def poll(self, step_func):
+    async def poll(self, step_func, trigger, *, interval=15.0, debounce=0.1, min_interval=1.0):
+        """Run step_func when triggered or after interval seconds at the latest.
+
+        Triggers are debounced and the step is run at most once per min_interval.
+        """
+        last_run = 0.0
         while not self.loop.is_closed():
             try:
-                await asyncio.sleep(15.0)
+                try:
+                    await asyncio.wait_for(trigger.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+                await asyncio.sleep(max(debounce, last_run + min_interval - time.monotonic()))
+                # triggers during the step cause another run
+                trigger.clear()
+                last_run = time.monotonic()
                 await step_func()
             except asyncio.CancelledError:
                 break
             except Exception:  # pylint: disable=broad-except
                 traceback.print_exc()
 
+    def trigger_poll(self, name):
+        """Run the poll step with the given name soon, instead of waiting for the next interval."""
+        self.poll_triggers[name].set()
+
     def save_later(self):
         logging.debug("Setting Save-later")
         self.save_scheduled = True
+        self.trigger_poll("save")
 
     def _get_resources(self):
         result = {}
@@ -269,53 +607,110 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         logging.debug("Running Save")
         self.save_scheduled = False
 
+        await self._write_history()
+
+        entries = self.journal.take_pending()
+        if not self.journal.needs_compaction(len(entries)):
+            with warn_if_slow("append journal", level=logging.DEBUG):
+                await self.loop.run_in_executor(None, self.journal.append, entries)
+            return
+
+        await self.compact()
+
+    async def _write_history(self):
+        if self.history is None:
+            return
+        # keep the statements in order if called concurrently by GetHistory
+        async with self.history_lock:
+            statements = self.history.take_pending()
+            with warn_if_slow("write history", level=logging.DEBUG):
+                await self.loop.run_in_executor(None, self.history.write, statements)
+
+    def _record_reservation(self, res, event=None):
+        if self.history is None:
+            return
+        places = [name for group in res.allocations.values() for name in group]
+        self.history.record_reservation(res.token, res.owner, event or res.state.name, places)
+        self.history.record_reservation_state(res.token, res.asdict() if res.token in self.reservations else None)
+        self.save_later()
+
+    async def compact(self):
+        """Write full snapshots of resources and places and truncate the journal."""
+        logging.debug("Running Compaction")
+        # the snapshot contains all pending changes
+        self.journal.take_pending()
+
         with warn_if_slow("create resources snapshot", level=logging.DEBUG):
             resources = copy.deepcopy(self._get_resources())
         with warn_if_slow("create places snapshot", level=logging.DEBUG):
             places = copy.deepcopy(self._get_places())
 
         def save_sync(resources, places):
-            with warn_if_slow("dump resources", level=logging.DEBUG):
-                resources = yaml.dump(resources)
-                resources = resources.encode()
-            with warn_if_slow("dump places", level=logging.DEBUG):
-                places = yaml.dump(places)
-                places = places.encode()
-            with warn_if_slow("write resources", level=logging.DEBUG):
-                atomic_replace("resources.yaml", resources)
-            with warn_if_slow("write places", level=logging.DEBUG):
-                atomic_replace("places.yaml", places)
+            with warn_if_slow(f"write {self.snapshot.name} snapshot", level=logging.DEBUG):
+                self.snapshot.write(resources, places)
+            # replaying older entries on top of the new snapshot is harmless
+            # if we crash before this point
+            with warn_if_slow("reset journal", level=logging.DEBUG):
+                self.journal.reset()
 
         await self.loop.run_in_executor(None, save_sync, resources, places)
 
     def load(self):
-        try:
-            self.places = {}
-            with open("places.yaml", "r") as f:
-                self.places = yaml.load(f.read())
-            for placename, config in self.places.items():
-                config["name"] = placename
-                # FIXME maybe recover previously acquired places here?
-                if "acquired" in config:
-                    del config["acquired"]
-                if "acquired_resources" in config:
-                    del config["acquired_resources"]
-                if "allowed" in config:
-                    del config["allowed"]
-                if "reservation" in config:
-                    del config["reservation"]
-                config["matches"] = [ResourceMatch(**match) for match in config["matches"]]
-                place = Place(**config)
-                self.places[placename] = place
-        except FileNotFoundError:
-            pass
+        self.places = {}
+        if not self.snapshot.exists():
+            for name in SNAPSHOT_FORMATS:
+                other = get_snapshot_format(name)
+                if other.exists():
+                    logging.warning(
+                        "ignoring %s, convert it with 'python -m labgrid.remote.snapshot %s %s'",
+                        other.places_path,
+                        other.name,
+                        self.snapshot.name,
+                    )
+        with warn_if_slow("load places", level=logging.DEBUG):
+            configs = self.snapshot.read_places()
+        self.journal.replay_places(configs)
+        for placename, config in configs.items():
+            config["name"] = placename
+            # FIXME maybe recover previously acquired places here?
+            if "acquired" in config:
+                del config["acquired"]
+            if "acquired_resources" in config:
+                del config["acquired_resources"]
+            if "allowed" in config:
+                del config["allowed"]
+            if "reservation" in config:
+                del config["reservation"]
+            config["matches"] = [ResourceMatch(**match) for match in config["matches"]]
+            place = Place(**config)
+            self.places[placename] = place
+            self.match_index.update_place(place)
         logging.info("loaded %s place(s)", len(self.places))
+        if self.history is not None:
+            self._load_reservations()
+
+    def _load_reservations(self):
+        self.reservations = {}
+        for token, config in self.history.get_reservations().items():
+            res = Reservation(token=token, **config)
+            if res.state is ReservationState.acquired:
+                # the places are not kept acquired over restarts
+                res.state = ReservationState.allocated
+            # give the owners time to reconnect, the next scheduling run
+            # handles places deleted in the meantime
+            res.refresh()
+            self.reservations[token] = res
+            for group in res.allocations.values():
+                for name in group:
+                    if name in self.places:
+                        self.places[name].reservation = token
+        logging.info("loaded %s reservation(s)", len(self.reservations))
 
     async def ClientStream(self, request_iterator, context):
         peer = context.peer()
         logging.info("client connected: %s", peer)
         assert peer not in self.clients
-        out_msg_queue = asyncio.Queue()
+        out_msg_queue = ClientQueue()
 
         async def request_task():
             name = None
@@ -332,7 +727,15 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                     elif kind == "startup":
                         version = in_msg.startup.version
                         name = in_msg.startup.name
-                        session = self.clients[peer] = ClientSession(self, peer, name, out_msg_queue, version)
+                        session = self.clients[peer] = ClientSession(
+                            self,
+                            peer,
+                            name,
+                            out_msg_queue,
+                            version,
+                            resource_deltas=in_msg.startup.resource_deltas,
+                            replica=in_msg.startup.replica,
+                        )
                         logging.debug("Received startup from %s with %s", name, version)
                         asyncio.current_task().set_name(f"client-{peer}-rx/started-{name}")
                     elif kind == "subscribe":
@@ -340,6 +743,10 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                             session.subscribe_places()
                         if in_msg.subscribe.all_resources:
                             session.subscribe_resources()
+                        if in_msg.subscribe.HasField("filter"):
+                            session.subscribe_filtered(in_msg.subscribe.filter)
+                    elif kind == "resync_resource":
+                        session.resync_resource(in_msg.resync_resource)
                     else:
                         logging.warning("received unknown kind %s from client %s (version %s)", kind, name, version)
                 logging.debug("client request_task done: %s", context.done())
@@ -350,7 +757,7 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         running_request_task = self.loop.create_task(request_task(), name=f"client-{peer}-rx/init")
 
         try:
-            async for out_msg in queue_as_aiter(out_msg_queue):
+            async for out_msg in out_msg_queue:
                 out_msg: labgrid_coordinator_pb2.ClientOutMessage
                 logging.debug("client output %s", out_msg)
                 yield out_msg
@@ -360,9 +767,34 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                 running_request_task.cancel()
                 await running_request_task
                 logging.debug("client aborted %s, cancelled: %s", session, context.cancelled())
+                logging.debug(
+                    "client queue for %s: sent %s updates, coalesced %s, max depth %s",
+                    peer,
+                    out_msg_queue.sent,
+                    out_msg_queue.coalesced,
+                    out_msg_queue.max_depth,
+                )
             except KeyError:
                 logging.info("Never received startup from peer %s that disconnected", peer)
 
+    async def _get_client_name(self, context):
+        """Return the name of the client session which sent the request.
+
+        Replicas forward requests on behalf of their clients and pass the
+        client's name as metadata.
+        """
+        peer = context.peer()
+        try:
+            session = self.clients[peer]
+        except KeyError:
+            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Peer {peer} does not have a valid session")
+        if not session.replica:
+            return session.name
+        for key, value in context.invocation_metadata():
+            if key == CLIENT_NAME_METADATA:
+                return value
+        await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Replica {session.name} did not send a client name")
+
     def _add_default_place(self, name):
         if name in self.places:
             return
@@ -372,6 +804,8 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         print(place)
         place.matches.append(ResourceMatch(exporter="*", group=name, cls="*"))
         self.places[name] = place
+        self.match_index.update_place(place)
+        self.journal.record_place(name, place.asdict())
 
     def get_exporter_by_name(self, name):
         for exporter in self.exporters.values():
@@ -379,11 +813,13 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                 return exporter
 
     def _publish_place(self, place):
+        self.journal.record_place(place.name, place.asdict())
+
         msg = labgrid_coordinator_pb2.ClientOutMessage()
         msg.updates.add().place.CopyFrom(place.as_pb2())
 
         for client in self.clients.values():
-            client.queue.put_nowait(msg)
+            client.send_place(place, msg)
 
     def _publish_resource(self, resource: ResourceImport):
         msg = labgrid_coordinator_pb2.ClientOutMessage()
@@ -394,19 +830,21 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         update.resource.path.resource_name = resource.path[3]
 
         for client in self.clients.values():
-            client.queue.put_nowait(msg)
+            client.send_resource(resource.path, msg)
 
     async def ExporterStream(self, request_iterator, context):
         peer = context.peer()
         logging.info("exporter connected: %s", peer)
         assert peer not in self.exporters
         command_queue = asyncio.Queue()
-        pending_commands = []
+        pending_commands = OrderedDict()
+        request_ids = count(1)
 
         startup_done = asyncio.Event()
 
         out_msg = labgrid_coordinator_pb2.ExporterOutMessage()
         out_msg.hello.version = labgrid_version()
+        out_msg.hello.resource_deltas = True
         yield out_msg
 
         async def request_task():
@@ -418,7 +856,18 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                     logging.debug("exporter in_msg %s", in_msg)
                     kind = in_msg.WhichOneof("kind")
                     if kind == "response":
-                        cmd = pending_commands.pop(0)
+                        if in_msg.response.HasField("request_id"):
+                            cmd = pending_commands.pop(in_msg.response.request_id, None)
+                            if cmd is None:
+                                logging.warning(
+                                    "ignoring response for unknown request %s from exporter %s",
+                                    in_msg.response.request_id,
+                                    name,
+                                )
+                                continue
+                        else:
+                            # older exporters respond in order without request IDs
+                            _, cmd = pending_commands.popitem(last=False)
                         cmd.complete(in_msg.response)
                         logging.debug("Command %s is done", cmd)
                     elif kind == "startup":
@@ -435,12 +884,46 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                         startup_done.set()
                     elif kind == "resource":
                         logging.debug("Received resource from %s with %s", name, in_msg.resource)
-                        action, _ = session.set_resource(
+                        action, resource = session.set_resource(
                             in_msg.resource.path.group_name, in_msg.resource.path.resource_name, in_msg.resource
                         )
                         if action is Action.ADD:
                             async with self.lock:
                                 self._add_default_place(in_msg.resource.path.group_name)
+                        if action is Action.ADD or resource.acquired:
+                            # orphaned resources may be available again or
+                            # the acquired state may need to be fixed
+                            self.trigger_poll("sync_resources")
+                        self.save_later()
+                    elif kind == "resource_delta":
+                        path = in_msg.resource_delta.path
+                        resource = session.update_resource(path.group_name, path.resource_name, in_msg.resource_delta)
+                        if resource is None:
+                            logging.warning(
+                                "requesting full update for %s/%s/%s after delta mismatch",
+                                name,
+                                path.group_name,
+                                path.resource_name,
+                            )
+                            out_msg = labgrid_coordinator_pb2.ExporterOutMessage()
+                            out_msg.resync_resource.group_name = path.group_name
+                            out_msg.resync_resource.resource_name = path.resource_name
+                            command_queue.put_nowait(out_msg)
+                            continue
+                        if resource.acquired:
+                            self.trigger_poll("sync_resources")
+                        self.save_later()
+                    elif kind == "del_resource":
+                        path = in_msg.del_resource
+                        logging.debug(
+                            "Received resource removal from %s for %s/%s", name, path.group_name, path.resource_name
+                        )
+                        if path.resource_name not in session.groups.get(path.group_name, {}):
+                            continue
+                        _, resource = session.set_resource(path.group_name, path.resource_name, None)
+                        if resource.acquired:
+                            # the place now has an orphaned resource
+                            self.trigger_poll("sync_resources")
                         self.save_later()
                     else:
                         logging.warning("received unknown kind %s from exporter %s (version %s)", kind, name, version)
@@ -477,9 +960,15 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         try:
             async for cmd in queue_as_aiter(command_queue):
                 logging.debug("exporter cmd %s", cmd)
+                if isinstance(cmd, labgrid_coordinator_pb2.ExporterOutMessage):
+                    # messages which don't expect a response
+                    yield cmd
+                    continue
                 out_msg = labgrid_coordinator_pb2.ExporterOutMessage()
                 out_msg.set_acquired_request.CopyFrom(cmd.request)
-                pending_commands.append(cmd)
+                request_id = next(request_ids)
+                out_msg.set_acquired_request.request_id = request_id
+                pending_commands[request_id] = cmd
                 yield out_msg
         except asyncio.exceptions.CancelledError:
             logging.info("exporter disconnected %s", context.peer())
@@ -509,10 +998,25 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         logging.debug("Adding %s", name)
         place = Place(name)
         self.places[name] = place
+        self.match_index.update_place(place)
         self._publish_place(place)
         self.save_later()
+        self.trigger_poll("schedule")
         return labgrid_coordinator_pb2.AddPlaceResponse()
 
+    def _remove_place(self, name):
+        logging.debug("Deleting %s", name)
+        if self.places[name].acquired and self.history is not None:
+            self.history.record_release(name)
+        del self.places[name]
+        self.place_locks.pop(name, None)
+        self.match_index.remove_place(name)
+        self.journal.record_place_deleted(name)
+        msg = labgrid_coordinator_pb2.ClientOutMessage()
+        msg.updates.add().del_place = name
+        for client in self.clients.values():
+            client.send_place_deleted(name, msg)
+
     @locked
     async def DeletePlace(self, request, context):
         name = request.name
@@ -520,13 +1024,9 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "name was not a string")
         if name not in self.places:
             await context.abort(grpc.StatusCode.ALREADY_EXISTS, f"Place {name} does not exist")
-        logging.debug("Deleting %s", name)
-        del self.places[name]
-        msg = labgrid_coordinator_pb2.ClientOutMessage()
-        msg.updates.add().del_place = name
-        for client in self.clients.values():
-            client.queue.put_nowait(msg)
+        self._remove_place(name)
         self.save_later()
+        self.trigger_poll("schedule")
         return labgrid_coordinator_pb2.DeletePlaceResponse()
 
     @locked
@@ -560,33 +1060,39 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         self.save_later()
         return labgrid_coordinator_pb2.DeletePlaceAliasResponse()
 
-    @locked
-    async def SetPlaceTags(self, request, context):
-        placename = request.placename
-        tags = dict(request.tags)
-        try:
-            place = self.places[placename]
-        except KeyError:
-            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Place {placename} does not exist")
+    @staticmethod
+    def _set_tags(place, tags):
+        """Set the tags on the place, removing tags with an empty value."""
         assert isinstance(tags, dict)
         for k, v in tags.items():
             assert isinstance(k, str)
             assert isinstance(v, str)
             if not TAG_KEY.match(k):
-                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Key {k} in {tags} is invalid")
+                raise PlaceOperationError(grpc.StatusCode.INVALID_ARGUMENT, f"Key {k} in {tags} is invalid")
             if not TAG_VAL.match(v):
-                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Value {v} in {tags} is invalid")
+                raise PlaceOperationError(grpc.StatusCode.INVALID_ARGUMENT, f"Value {v} in {tags} is invalid")
         for k, v in tags.items():
             if not v:
-                try:
-                    del place.tags[k]
-                except KeyError:
-                    pass
+                place.tags.pop(k, None)
             else:
                 place.tags[k] = v
+
+    @locked
+    async def SetPlaceTags(self, request, context):
+        placename = request.placename
+        tags = dict(request.tags)
+        try:
+            place = self.places[placename]
+        except KeyError:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Place {placename} does not exist")
+        try:
+            self._set_tags(place, tags)
+        except PlaceOperationError as e:
+            await context.abort(e.code, e.details)
         place.touch()
         self._publish_place(place)
         self.save_later()
+        self.trigger_poll("schedule")
         return labgrid_coordinator_pb2.SetPlaceTagsResponse()
 
     @locked
@@ -616,6 +1122,7 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         if rm in place.matches:
             await context.abort(grpc.StatusCode.ALREADY_EXISTS, f"Match {rm} already exists")
         place.matches.append(rm)
+        self.match_index.update_place(place)
         place.touch()
         self._publish_place(place)
         self.save_later()
@@ -635,65 +1142,229 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
             place.matches.remove(rm)
         except ValueError:
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Match {rm} does not exist in {placename}")
+        self.match_index.update_place(place)
         place.touch()
         self._publish_place(place)
         self.save_later()
         return labgrid_coordinator_pb2.DeletePlaceMatchResponse()
 
+    def _get_staged_place(self, staged, name):
+        """Return the staged copy of the place, copying it on first use."""
+        if name in staged:
+            place = staged[name]
+        elif name in self.places:
+            place = staged[name] = copy.copy(self.places[name])
+            place.aliases = set(place.aliases)
+            place.tags = dict(place.tags)
+            place.matches = list(place.matches)
+        else:
+            place = None
+        if place is None:
+            raise PlaceOperationError(grpc.StatusCode.INVALID_ARGUMENT, f"Place {name} does not exist")
+        return place
+
+    def _stage_place_operation(self, staged, deleted, operation):
+        """Apply the operation to the staged places.
+
+        Staged places are copies, so the coordinator state is unchanged if
+        any operation fails. Deleted places are staged as None.
+        """
+        kind = operation.WhichOneof("kind")
+        request = getattr(operation, kind)
+        if kind == "add_place":
+            name = request.name
+            if not name:
+                raise PlaceOperationError(grpc.StatusCode.INVALID_ARGUMENT, "name was not a string")
+            if staged.get(name, self.places.get(name)) is not None:
+                raise PlaceOperationError(grpc.StatusCode.ALREADY_EXISTS, f"Place {name} already exists")
+            staged[name] = Place(name)
+            return
+        if kind == "delete_place":
+            self._get_staged_place(staged, request.name)
+            staged[request.name] = None
+            if request.name in self.places:
+                deleted.add(request.name)
+            return
+
+        place = self._get_staged_place(staged, request.placename)
+        if kind == "add_alias":
+            place.aliases.add(request.alias)
+        elif kind == "delete_alias":
+            try:
+                place.aliases.remove(request.alias)
+            except KeyError as e:
+                raise PlaceOperationError(
+                    grpc.StatusCode.INVALID_ARGUMENT, f"Failed to remove {request.alias} from {place.name}"
+                ) from e
+        elif kind == "set_tags":
+            self._set_tags(place, dict(request.tags))
+        elif kind == "set_comment":
+            place.comment = request.comment
+        elif kind in ("add_match", "delete_match"):
+            rename = request.rename if request.HasField("rename") else None
+            try:
+                rm = ResourceMatch.fromstr(request.pattern)
+            except ValueError as e:
+                raise PlaceOperationError(grpc.StatusCode.INVALID_ARGUMENT, str(e)) from e
+            rm.rename = rename
+            if kind == "add_match":
+                if rm in place.matches:
+                    raise PlaceOperationError(grpc.StatusCode.ALREADY_EXISTS, f"Match {rm} already exists")
+                place.matches.append(rm)
+            else:
+                try:
+                    place.matches.remove(rm)
+                except ValueError as e:
+                    raise PlaceOperationError(
+                        grpc.StatusCode.INVALID_ARGUMENT, f"Match {rm} does not exist in {place.name}"
+                    ) from e
+        place.touch()
+
+    @locked
+    async def UpdatePlaces(self, request, context):
+        """Apply multiple place operations atomically.
+
+        Either all operations are applied or none. Each changed place is
+        published once and the changes are saved together.
+        """
+        staged = {}
+        deleted = set()
+        for i, operation in enumerate(request.operations):
+            try:
+                self._stage_place_operation(staged, deleted, operation)
+            except PlaceOperationError as e:
+                await context.abort(e.code, f"operation {i}: {e.details}")
+
+        for name in deleted:
+            self._remove_place(name)
+        for name, place in staged.items():
+            if place is None:
+                continue
+            current = self.places.get(name)
+            if current is None:
+                logging.debug("Adding %s", name)
+                self.places[name] = current = place
+            else:
+                # keep the place object, as acquire and release may hold a reference
+                current.aliases = place.aliases
+                current.comment = place.comment
+                current.tags = place.tags
+                current.matches = place.matches
+                current.changed = place.changed
+            self.match_index.update_place(current)
+            self._publish_place(current)
+        if staged:
+            self.save_later()
+            self.trigger_poll("schedule")
+        return labgrid_coordinator_pb2.UpdatePlacesResponse(changed_places=sorted(staged))
+
+    async def _set_acquired(self, resources, place=None):
+        """Send acquire requests (or release requests if place is None) for all
+        resources to their exporters at once and wait for the responses.
+
+        Returns a list with the exception (or None on success) for each resource.
+        """
+        action = "release" if place is None else "acquire"
+        commands = []
+        for resource in resources:
+            # this triggers an update from the exporter which is published
+            # to the clients
+            request = labgrid_coordinator_pb2.ExporterSetAcquiredRequest()
+            request.group_name = resource.path[1]
+            request.resource_name = resource.path[3]
+            if place is not None:
+                request.place_name = place.name
+            # request.place_name is left unset to indicate release
+            cmd = ExporterCommand(request)
+            exporter = self.get_exporter_by_name(resource.path[0])
+            if exporter is None:
+                cmd = ExporterError(f"failed to {action} {resource} (exporter is not connected)")
+            else:
+                exporter.queue.put_nowait(cmd)
+            commands.append(cmd)
+
+        async def wait(cmd):
+            if isinstance(cmd, Exception):
+                raise cmd
+            with self.metric_exporter_command.labels(action).time():
+                await cmd.wait()
+
+        results = await asyncio.gather(*(wait(cmd) for cmd in commands), return_exceptions=True)
+        errors = []
+        for resource, cmd, result in zip(resources, commands, results):
+            if isinstance(result, BaseException):
+                errors.append(result)
+            elif not cmd.response.success:
+                errors.append(ExporterError(f"failed to {action} {resource} ({cmd.response.reason})"))
+            else:
+                errors.append(None)
+                if place is not None and resource.acquired != place.name:
+                    logging.warning("resource %s not acquired by this place after acquire request", resource)
+                elif place is None and resource.acquired:
+                    logging.warning("resource %s still acquired after release request", resource)
+        return errors
+
     async def _acquire_resource(self, place, resource):
         assert self.lock.locked()
 
-        # this triggers an update from the exporter which is published
-        # to the clients
-        request = labgrid_coordinator_pb2.ExporterSetAcquiredRequest()
-        request.group_name = resource.path[1]
-        request.resource_name = resource.path[3]
-        request.place_name = place.name
-        cmd = ExporterCommand(request)
-        self.get_exporter_by_name(resource.path[0]).queue.put_nowait(cmd)
-        await cmd.wait()
-        if not cmd.response.success:
-            raise ExporterError(f"failed to acquire {resource} ({cmd.response.reason})")
-        if resource.acquired != place.name:
-            logging.warning("resource %s not acquired by this place after acquire request", resource)
+        error = (await self._set_acquired([resource], place))[0]
+        if error is not None:
+            raise error
 
-    async def _acquire_resources(self, place, resources):
+    def _reserve_resources(self, place, resources):
+        """Check that all resources are free and mark them as pending for the place."""
         assert self.lock.locked()
 
-        resources = resources.copy()  # we may modify the list
+        used_resources = {}
+        for otherplace in self.places.values():
+            for oldres in otherplace.acquired_resources:
+                used_resources[oldres.path] = oldres
         # all resources need to be free
         for resource in resources:
             if resource.acquired:
                 return False
 
-            for otherplace in self.places.values():
-                for oldres in otherplace.acquired_resources:
-                    if resource.path == oldres.path:
-                        logging.info(
-                            "Conflicting orphaned resource %s for acquire request for place %s", oldres, place.name
-                        )
-                        return False
+            if oldres := used_resources.get(resource.path):
+                logging.info("Conflicting orphaned resource %s for acquire request for place %s", oldres, place.name)
+                return False
 
-        # acquire resources
-        acquired = []
-        try:
-            for resource in resources:
-                await self._acquire_resource(place, resource)
-                acquired.append(resource)
-        except Exception:
-            logging.exception("failed to acquire %s", resource)
-            # cleanup
-            await self._release_resources(place, acquired)
-            return False
+            if resource.path in self.pending_resources:
+                logging.info(
+                    "Conflicting pending request for resource %s for acquire request for place %s",
+                    resource,
+                    place.name,
+                )
+                return False
 
         for resource in resources:
-            place.acquired_resources.append(resource)
-
+            self.pending_resources[resource.path] = place.name
         return True
 
-    async def _release_resources(self, place, resources, callback=True):
-        assert self.lock.locked()
+    def _unreserve_resources(self, resources):
+        for resource in resources:
+            self.pending_resources.pop(resource.path, None)
 
+    async def _acquire_resources(self, place, resources):
+        """Acquire the resources (reserved by _reserve_resources) concurrently.
+
+        If any resource could not be acquired, the others are released again.
+        This does not need the global lock, as the resources are reserved.
+        """
+        errors = await self._set_acquired(resources, place)
+        if not any(errors):
+            return True
+
+        acquired = []
+        for resource, error in zip(resources, errors):
+            if error is None:
+                acquired.append(resource)
+            else:
+                logging.error("failed to acquire %s: %s", resource, error)
+        # cleanup
+        await self._release_resources(place, acquired)
+        return False
+
+    async def _release_resources(self, place, resources, callback=True):
         resources = resources.copy()  # we may modify the list
 
         for resource in resources:
@@ -702,31 +1373,20 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
             except ValueError:
                 pass
 
-        for resource in resources:
-            if resource.orphaned:
+        if not callback:
+            return
+
+        resources = [resource for resource in resources if not resource.orphaned]
+        errors = await self._set_acquired(resources)
+        for resource, error in zip(resources, errors):
+            if error is None:
                 continue
+            logging.error("failed to release %s: %s", resource, error)
+            # at leaset try to notify the clients
             try:
-                # this triggers an update from the exporter which is published
-                # to the clients
-                if callback:
-                    request = labgrid_coordinator_pb2.ExporterSetAcquiredRequest()
-                    request.group_name = resource.path[1]
-                    request.resource_name = resource.path[3]
-                    # request.place_name is left unset to indicate release
-                    cmd = ExporterCommand(request)
-                    self.get_exporter_by_name(resource.path[0]).queue.put_nowait(cmd)
-                    await cmd.wait()
-                    if not cmd.response.success:
-                        raise ExporterError(f"failed to release {resource} ({cmd.response.reason})")
-                    if resource.acquired:
-                        logging.warning("resource %s still acquired after release request", resource)
-            except (ExporterError, TimeoutError):
-                logging.exception("failed to release %s", resource)
-                # at leaset try to notify the clients
-                try:
-                    self._publish_resource(resource)
-                except:
-                    logging.exception("failed to publish released resource %s", resource)
+                self._publish_resource(resource)
+            except:
+                logging.exception("failed to publish released resource %s", resource)
 
     async def _synchronize_resources(self):
         assert self.lock.locked()
@@ -747,11 +1407,9 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         orphaned_resources = {}
 
         # find acquired resources
-        for exporter in self.exporters.values():
-            for group in exporter.groups.values():
-                for resource in group.values():
-                    if resource.acquired:
-                        acquired_resources[resource.path] = resource
+        for resource in self.match_index.resources.values():
+            if resource.acquired:
+                acquired_resources[resource.path] = resource
 
         # find resources used by places
         for place in self.places.values():
@@ -771,6 +1429,8 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         for resource_path in to_release:
             if timeout.expired:
                 continue  # release the coordinator lock
+            if resource_path in self.pending_resources:
+                continue
 
             resource = acquired_resources[resource_path]
             if resource.acquired == "<broken>":
@@ -799,6 +1459,8 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         for resource_path in to_acquire:
             if timeout.expired:
                 continue  # release the coordinator lock
+            if resource_path in self.pending_resources:
+                continue
 
             resource = orphaned_resources[resource_path]
             if resource.acquired == "<broken>":
@@ -847,72 +1509,130 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
             idx = place.acquired_resources.index(oldresource)
             place.acquired_resources[idx] = newresource
 
-    @locked
+    def _get_place_lock(self, name):
+        """Returns the lock serializing acquire and release of the place, or
+        None if the place does not exist."""
+        if name not in self.places:
+            return None
+        return self.place_locks.setdefault(name, asyncio.Lock())
+
+    def _get_locked_place(self, name, place_lock):
+        """Returns the place while holding its place lock, or None if it was
+        deleted (or replaced) in the meantime."""
+        assert self.lock.locked()
+        if self.place_locks.get(name) is not place_lock:
+            return None
+        return self.places.get(name)
+
     async def AcquirePlace(self, request, context):
-        peer = context.peer()
         name = request.placename
-        try:
-            username = self.clients[peer].name
-        except KeyError:
-            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Peer {peer} does not have a valid session")
+        username = await self._get_client_name(context)
         print(request)
 
-        try:
-            place = self.places[name]
-        except KeyError:
+        place_lock = self._get_place_lock(name)
+        if place_lock is None:
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Place {name} does not exist")
-        if place.acquired:
-            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Place {name} is already acquired")
-        if place.reservation:
-            res = self.reservations[place.reservation]
-            if not res.owner == username:
-                await context.abort(grpc.StatusCode.PERMISSION_DENIED, f"Place {name} was not reserved for {username}")
-
-        # FIXME use the session object instead? or something else which
-        # survives disconnecting clients?
-        place.acquired = username
-        resources = []
-        for _, session in sorted(self.exporters.items()):
-            for _, group in sorted(session.groups.items()):
-                for _, resource in sorted(group.items()):
-                    if not place.hasmatch(resource.path):
-                        continue
-                    resources.append(resource)
-        if not await self._acquire_resources(place, resources):
-            # revert earlier change
-            place.acquired = None
-            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Failed to acquire resources for place {name}")
-        place.touch()
-        self._publish_place(place)
-        self.save_later()
-        self.schedule_reservations()
+        async with place_lock:
+            async with self.lock:
+                place = self._get_locked_place(name, place_lock)
+                if place is None:
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Place {name} does not exist")
+                if place.acquired:
+                    await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Place {name} is already acquired")
+                if place.reservation:
+                    res = self.reservations[place.reservation]
+                    if not res.owner == username:
+                        await context.abort(
+                            grpc.StatusCode.PERMISSION_DENIED, f"Place {name} was not reserved for {username}"
+                        )
+
+                resources = self.match_index.get_resources(place.name)
+                if not self._reserve_resources(place, resources):
+                    await context.abort(
+                        grpc.StatusCode.FAILED_PRECONDITION, f"Failed to acquire resources for place {name}"
+                    )
+                self.acquiring_places[name] = place
+
+            # wait for the exporters without blocking unrelated requests
+            success = False
+            deleted = False
+            try:
+                success = await self._acquire_resources(place, resources)
+                async with self.lock:
+                    deleted = self._get_locked_place(name, place_lock) is not place
+                if success and deleted:
+                    # the place was deleted while waiting for the exporters,
+                    # release the resources again while they are still reserved
+                    success = False
+                    await self._release_resources(place, resources)
+            finally:
+                async with self.lock:
+                    self._unreserve_resources(resources)
+                    if self.acquiring_places.get(name) is place:
+                        del self.acquiring_places[name]
+                    if success:
+                        # FIXME use the session object instead? or something else which
+                        # survives disconnecting clients?
+                        place.acquired = username
+                        place.acquired_resources.extend(resources)
+                        place.touch()
+                        if self.history is not None:
+                            self.history.record_acquire(place.name, place.acquired, place.tags, place.changed)
+                        self._publish_place(place)
+                        self.save_later()
+                        self.schedule_reservations()
+
+            if deleted:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Place {name} was deleted")
+            if not success:
+                await context.abort(
+                    grpc.StatusCode.FAILED_PRECONDITION, f"Failed to acquire resources for place {name}"
+                )
         print(f"{place.name}: place acquired by {place.acquired}")
         return labgrid_coordinator_pb2.AcquirePlaceResponse()
 
-    @locked
     async def ReleasePlace(self, request, context):
         name = request.placename
         print(request)
         fromuser = request.fromuser if request.HasField("fromuser") else None
-        try:
-            place = self.places[name]
-        except KeyError:
+        place_lock = self._get_place_lock(name)
+        if place_lock is None:
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Place {name} does not exist")
-        if not place.acquired:
-            if fromuser:
-                return labgrid_coordinator_pb2.ReleasePlaceResponse()
-            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Place {name} is not acquired")
-        if fromuser and place.acquired != fromuser:
-            return labgrid_coordinator_pb2.ReleasePlaceResponse()
-
-        await self._release_resources(place, place.acquired_resources)
-
-        place.acquired = None
-        place.allowed = set()
-        place.touch()
-        self._publish_place(place)
-        self.save_later()
-        self.schedule_reservations()
+        async with place_lock:
+            async with self.lock:
+                place = self._get_locked_place(name, place_lock)
+                if place is None:
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Place {name} does not exist")
+                if not place.acquired:
+                    if fromuser:
+                        return labgrid_coordinator_pb2.ReleasePlaceResponse()
+                    await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Place {name} is not acquired")
+                if fromuser and place.acquired != fromuser:
+                    return labgrid_coordinator_pb2.ReleasePlaceResponse()
+
+                resources = place.acquired_resources.copy()
+                for resource in resources:
+                    self.pending_resources[resource.path] = place.name
+
+            # wait for the exporters without blocking unrelated requests
+            try:
+                await self._release_resources(place, resources)
+            finally:
+                async with self.lock:
+                    self._unreserve_resources(resources)
+
+            async with self.lock:
+                if self._get_locked_place(name, place_lock) is not place:
+                    # the place was deleted while waiting for the exporters
+                    return labgrid_coordinator_pb2.ReleasePlaceResponse()
+                place.acquired = None
+                place.allowed = set()
+                place.touch()
+                if self.history is not None:
+                    self.history.record_release(place.name, place.changed)
+                self._publish_place(place)
+                self.save_later()
+                self.schedule_reservations()
         print(f"{place.name}: place released")
         return labgrid_coordinator_pb2.ReleasePlaceResponse()
 
@@ -920,11 +1640,7 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
     async def AllowPlace(self, request, context):
         placename = request.placename
         user = request.user
-        peer = context.peer()
-        try:
-            username = self.clients[peer].name
-        except KeyError:
-            await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Peer {peer} does not have a valid session")
+        username = await self._get_client_name(context)
         try:
             place = self.places[placename]
         except KeyError:
@@ -952,6 +1668,30 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         except Exception:
             logging.exception("error during get places")
 
+    @locked
+    async def GetPlace(self, request, context):
+        logging.debug("GetPlace %s", request.pattern)
+        if not request.pattern:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "pattern was empty")
+        selection = SubscriptionFilter(places={request.pattern})
+        places = [place.as_pb2() for place in self.places.values() if selection.match_place(place)]
+        return labgrid_coordinator_pb2.GetPlaceResponse(places=places)
+
+    @locked
+    async def GetResourcesForPlace(self, request, context):
+        logging.debug("GetResourcesForPlace %s", request.placename)
+        if request.placename not in self.places:
+            await context.abort(grpc.StatusCode.NOT_FOUND, f"Place {request.placename} does not exist")
+        resources = []
+        for resource in self.match_index.get_resources(request.placename):
+            resource: ResourceImport
+            resource_pb2 = resource.as_pb2()
+            resource_pb2.path.exporter_name = resource.path[0]
+            resource_pb2.path.group_name = resource.path[1]
+            resource_pb2.path.resource_name = resource.path[3]
+            resources.append(resource_pb2)
+        return labgrid_coordinator_pb2.GetResourcesForPlaceResponse(resources=resources)
+
     def schedule_reservations(self):
         # The primary information is stored in the reservations and the places
         # only have a copy for convenience.
@@ -969,9 +1709,11 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                 res.allocations.clear()
                 res.refresh()
                 print(f"reservation ({res.owner}/{res.token}) is now {res.state.name}")
+                self._record_reservation(res)
             else:
                 del self.reservations[res.token]
                 print(f"removed {res.state.name} reservation ({res.owner}/{res.token})")
+                self._record_reservation(res, "removed")
 
         # check which places are already allocated and handle state transitions
         allocated_places = set()
@@ -986,6 +1728,7 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                         res.allocations.clear()
                         res.refresh(300)
                         print(f"reservation ({res.owner}/{res.token}) is now {res.state.name}")
+                        self._record_reservation(res)
                         break
                     if place.acquired is not None:
                         acquired_places.add(name)
@@ -996,16 +1739,18 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                 res.state = ReservationState.acquired
                 res.refresh()
                 print(f"reservation ({res.owner}/{res.token}) is now {res.state.name}")
+                self._record_reservation(res)
             if not acquired_places and res.state is ReservationState.acquired:
                 # all allocated places were released
                 res.state = ReservationState.allocated
                 res.refresh()
                 print(f"reservation ({res.owner}/{res.token}) is now {res.state.name}")
+                self._record_reservation(res)
 
         # check which places are available for allocation
         available_places = set()
         for name, place in self.places.items():
-            if place.acquired is None and place.reservation is None:
+            if place.acquired is None and place.reservation is None and name not in self.acquiring_places:
                 available_places.add(name)
         assert not (available_places & allocated_places), "inconsistent allocation"
         available_places -= allocated_places
@@ -1028,6 +1773,15 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         filter_tagsets = []
         for res in pending_reservations:
             filter_tagsets.append(TagSet(res.token, set(res.filters["main"].items())))
+        if self.fair_share:
+            # serve owners round-robin within each priority
+            usage = Counter(res.owner for res in self.reservations.values() if res.allocations)
+            owners = {res.token: res.owner for res in pending_reservations}
+            filter_tagsets = [
+                f
+                for _, group in groupby(filter_tagsets, key=lambda f: self.reservations[f.name].prio)
+                for f in fair_share(list(group), owners, usage)
+            ]
         allocation = schedule(place_tagsets, filter_tagsets)
 
         # apply allocations
@@ -1037,6 +1791,7 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
             res.state = ReservationState.allocated
             res.refresh()
             print(f"reservation ({res.owner}/{res.token}) is now {res.state.name}")
+            self._record_reservation(res)
 
         # update reservation property of each place and notify
         old_map = {}
@@ -1061,8 +1816,6 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
 
     @locked
     async def CreateReservation(self, request: labgrid_coordinator_pb2.CreateReservationRequest, context):
-        peer = context.peer()
-
         fltrs = {}
         for name, fltr_pb in request.filters.items():
             if name != "main":
@@ -1077,9 +1830,10 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
                     await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Value {v} is invalid")
                 fltr[k] = v
 
-        owner = self.clients[peer].name
+        owner = await self._get_client_name(context)
         res = Reservation(owner=owner, prio=request.prio, filters=fltrs)
         self.reservations[res.token] = res
+        self._record_reservation(res, "created")
         self.schedule_reservations()
         return labgrid_coordinator_pb2.CreateReservationResponse(reservation=res.as_pb2())
 
@@ -1090,7 +1844,7 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
             await context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"Invalid token {token}")
         if token not in self.reservations:
             await context.abort(grpc.StatusCode.FAILED_PRECONDITION, f"Reservation {token} does not exist")
-        del self.reservations[token]
+        self._record_reservation(self.reservations.pop(token), "cancelled")
         self.schedule_reservations()
         return labgrid_coordinator_pb2.CancelReservationResponse()
 
@@ -1109,8 +1863,219 @@ class Coordinator(labgrid_coordinator_pb2_grpc.CoordinatorServicer):
         reservations = [x.as_pb2() for x in self.reservations.values()]
         return labgrid_coordinator_pb2.GetReservationsResponse(reservations=reservations)
 
+    async def GetHistory(self, request: labgrid_coordinator_pb2.GetHistoryRequest, context):
+        if self.history is None:
+            await context.abort(
+                grpc.StatusCode.UNIMPLEMENTED, "The history is only recorded with --snapshot-format sqlite"
+            )
+        # include events which were not saved yet
+        await self._write_history()
+
+        kwargs = {
+            "place": request.place if request.HasField("place") else None,
+            "user": request.user if request.HasField("user") else None,
+            "tags": dict(request.tags),
+            "since": request.since if request.HasField("since") else None,
+            "until": request.until if request.HasField("until") else None,
+        }
+        response = labgrid_coordinator_pb2.GetHistoryResponse()
+        if request.utilization:
+            if kwargs["since"] is None or kwargs["until"] is None:
+                await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Utilization requires since and until")
+            rows = await self.loop.run_in_executor(None, lambda: self.history.get_utilization(**kwargs))
+            for row in rows:
+                response.utilization.add(
+                    place=row.place, acquisitions=row.acquisitions, acquired_seconds=row.acquired_seconds
+                )
+        else:
+            limit = request.limit or 100
+            rows = await self.loop.run_in_executor(None, lambda: self.history.get_entries(limit=limit, **kwargs))
+            for row in rows:
+                entry = response.entries.add(place=row.place, user=row.user, tags=row.tags, acquired=row.acquired)
+                if row.released is not None:
+                    entry.released = row.released
+        return response
+
+
+def _forward(method):
+    async def wrapper(self, request, context):
+        return await self.forward(method, request, context)
+
+    wrapper.__name__ = method
+    return wrapper
+
+
+class ReplicaCoordinator(Coordinator):
+    """A coordinator which mirrors the places and resources of a primary coordinator.
+
+    The replica connects to the primary as a client subscribed to all places
+    and resources and serves client streams and place queries from its copy.
+    All other requests (including reservation queries, as reservations are not
+    part of the client stream) are forwarded to the primary, passing the
+    client's name as metadata. Exporters must connect to the primary.
+    """
+
+    # nothing is persisted or scheduled, the save step only drops the journal entries
+    poll_steps = [("save", 1.0)]
 
-async def serve(listen, cleanup) -> None:
+    def __init__(self, primary) -> None:
+        super().__init__()
+        self.primary = primary
+        self.channel = grpc.aio.insecure_channel(primary)
+        self.stub = labgrid_coordinator_pb2_grpc.CoordinatorStub(self.channel)
+        self.primary_queue = asyncio.Queue()
+        self.primary_syncs = {}
+        self.primary_sync_ids = count(1)
+        self.primary_task = None
+
+    def load(self):
+        pass
+
+    async def save(self):
+        self.save_scheduled = False
+        self.journal.pending.clear()
+
+    async def start(self, name):
+        """Connect to the primary and wait until the initial places and resources are received."""
+        startup = labgrid_coordinator_pb2.ClientInMessage()
+        startup.startup.version = labgrid_version()
+        startup.startup.name = name
+        startup.startup.resource_deltas = True
+        startup.startup.replica = True
+        self.primary_queue.put_nowait(startup)
+        for kind in ("all_places", "all_resources"):
+            msg = labgrid_coordinator_pb2.ClientInMessage()
+            setattr(msg.subscribe, kind, True)
+            self.primary_queue.put_nowait(msg)
+
+        stream = self.stub.ClientStream(queue_as_aiter(self.primary_queue))
+        self.primary_task = self.loop.create_task(self._receive_from_primary(stream), name="replica-primary-rx")
+        await self.sync_with_primary()
+
+    async def sync_with_primary(self):
+        """Wait until all changes made on the primary so far have been applied to the replica."""
+        identifier = next(self.primary_sync_ids)
+        future = self.primary_syncs[identifier] = self.loop.create_future()
+        msg = labgrid_coordinator_pb2.ClientInMessage()
+        msg.sync.id = identifier
+        self.primary_queue.put_nowait(msg)
+        await asyncio.wait_for(asyncio.shield(future), 10)
+
+    async def _receive_from_primary(self, stream):
+        try:
+            async for out_msg in stream:
+                out_msg: labgrid_coordinator_pb2.ClientOutMessage
+                async with self.lock:
+                    for update in out_msg.updates:
+                        self._apply_update(update)
+                if out_msg.HasField("sync"):
+                    future = self.primary_syncs.pop(out_msg.sync.id, None)
+                    if future is not None and not future.done():
+                        future.set_result(None)
+        except grpc.aio.AioRpcError as e:
+            logging.error("connection to primary %s failed: %s", self.primary, e.details())
+        except Exception:
+            logging.exception("error in replica update handler")
+        finally:
+            for future in self.primary_syncs.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"lost connection to primary {self.primary}"))
+            self.primary_syncs.clear()
+
+    def _get_exporter_session(self, name):
+        session = self.get_exporter_by_name(name)
+        if session is None:
+            session = self.exporters[f"replica:{name}"] = ExporterSession(self, self.primary, name, None, None)
+        return session
+
+    def _get_acquired_resource(self, path):
+        session = self.get_exporter_by_name(path[0])
+        resource = session.groups.get(path[1], {}).get(path[3]) if session else None
+        if resource is None:
+            # the resource is orphaned on the primary
+            resource = ResourceImport(data={"cls": path[2], "params": {}}, path=tuple(path))
+            resource.orphaned = True
+        return resource
+
+    def _apply_update(self, update):
+        kind = update.WhichOneof("kind")
+        if kind == "place":
+            place = Place.from_pb2(update.place)
+            place.acquired_resources = [self._get_acquired_resource(path) for path in place.acquired_resources]
+            self.places[place.name] = place
+            self.match_index.update_place(place)
+            self._publish_place(place)
+        elif kind == "del_place":
+            if self.places.pop(update.del_place, None) is None:
+                return
+            self.match_index.remove_place(update.del_place)
+            msg = labgrid_coordinator_pb2.ClientOutMessage()
+            msg.updates.add().del_place = update.del_place
+            for client in self.clients.values():
+                client.send_place_deleted(update.del_place, msg)
+        elif kind == "resource":
+            path = update.resource.path
+            session = self._get_exporter_session(path.exporter_name)
+            session.set_resource(path.group_name, path.resource_name, update.resource)
+        elif kind == "del_resource":
+            path = update.del_resource
+            session = self.get_exporter_by_name(path.exporter_name)
+            if session is None or path.resource_name not in session.groups.get(path.group_name, {}):
+                return
+            session.set_resource(path.group_name, path.resource_name, None)
+        elif kind == "resource_delta":
+            path = update.resource_delta.path
+            session = self.get_exporter_by_name(path.exporter_name)
+            if (
+                session is None
+                or session.update_resource(path.group_name, path.resource_name, update.resource_delta) is None
+            ):
+                msg = labgrid_coordinator_pb2.ClientInMessage()
+                msg.resync_resource.CopyFrom(path)
+                self.primary_queue.put_nowait(msg)
+        else:
+            logging.warning("received unknown update kind %s from primary", kind)
+
+    async def forward(self, method, request, context):
+        """Forward the request to the primary and wait until the replica has received its effects."""
+        metadata = []
+        session = self.clients.get(context.peer())
+        if session is not None:
+            metadata.append((CLIENT_NAME_METADATA, session.name))
+        try:
+            response = await getattr(self.stub, method)(request, metadata=metadata)
+        except grpc.aio.AioRpcError as e:
+            await context.abort(e.code(), e.details())
+        # allow the client to read its own writes after syncing with the replica
+        await self.sync_with_primary()
+        return response
+
+    async def ExporterStream(self, request_iterator, context):
+        await context.abort(grpc.StatusCode.UNIMPLEMENTED, f"Exporters must connect to the primary {self.primary}")
+        yield  # pylint: disable=unreachable
+
+    AddPlace = _forward("AddPlace")
+    DeletePlace = _forward("DeletePlace")
+    AddPlaceAlias = _forward("AddPlaceAlias")
+    DeletePlaceAlias = _forward("DeletePlaceAlias")
+    SetPlaceTags = _forward("SetPlaceTags")
+    SetPlaceComment = _forward("SetPlaceComment")
+    AddPlaceMatch = _forward("AddPlaceMatch")
+    DeletePlaceMatch = _forward("DeletePlaceMatch")
+    UpdatePlaces = _forward("UpdatePlaces")
+    AcquirePlace = _forward("AcquirePlace")
+    ReleasePlace = _forward("ReleasePlace")
+    AllowPlace = _forward("AllowPlace")
+    CreateReservation = _forward("CreateReservation")
+    CancelReservation = _forward("CancelReservation")
+    PollReservation = _forward("PollReservation")
+    GetReservations = _forward("GetReservations")
+    GetHistory = _forward("GetHistory")
+
+
+async def serve(
+    listen, cleanup, *, fair_share=False, metrics_port=None, replica_of=None, snapshot_format="yaml"
+) -> None:
     asyncio.current_task().set_name("coordinator-serve")
     # It seems since https://github.com/grpc/grpc/pull/34647, the
     # ping_timeout_ms default of 60 seconds overrides keepalive_timeout_ms,
@@ -1125,10 +2090,17 @@ async def serve(listen, cleanup) -> None:
         ("grpc.http2.max_pings_without_data", 0),  # no limit
         ("grpc.keepalive_permit_without_calls", 1),  # allow keepalive pings even when there are no calls
     ]
+    if replica_of:
+        coordinator = ReplicaCoordinator(replica_of)
+        # receive the current state before serving clients
+        await coordinator.start(f"replica/{socket.gethostname()}/{listen}")
+        logging.info("Replicating %s", replica_of)
+    else:
+        coordinator = Coordinator(fair_share=fair_share, snapshot_format=snapshot_format)
     server = grpc.aio.server(
         options=channel_options,
+        interceptors=[MetricsInterceptor(coordinator)],
     )
-    coordinator = Coordinator()
     labgrid_coordinator_pb2_grpc.add_CoordinatorServicer_to_server(coordinator, server)
     # enable reflection for use with grpcurl
     reflection.enable_server_reflection(
@@ -1154,6 +2126,20 @@ async def serve(listen, cleanup) -> None:
     if inspect:
         inspect.coordinator = coordinator
 
+    host, sep, port = listen.rpartition(":")
+    if not sep or not port.isdigit():
+        host = listen
+
+    if metrics_port is not None:
+        # asyncio binds to a single address family, so use all interfaces
+        # for wildcard addresses like gRPC does
+        metrics_host = host.strip("[]")
+        if metrics_host in ("", "::", "0.0.0.0"):
+            metrics_host = None
+        metrics_server = await serve_metrics(coordinator.metrics, metrics_host, metrics_port)
+        metrics_port = metrics_server.sockets[0].getsockname()[1]
+        logging.info("Serving metrics on port %s", metrics_port)
+
     async def server_graceful_shutdown():
         logging.info("Starting graceful shutdown...")
         # Shuts down the server with 0 seconds of grace period. During the
@@ -1168,12 +2154,14 @@ async def serve(listen, cleanup) -> None:
     loop = asyncio.get_event_loop()
     loop.add_signal_handler(signal.SIGINT, callback)
     loop.add_signal_handler(signal.SIGTERM, callback)
+    if replica_of:
+        # a replica without its primary would serve stale data
+        coordinator.primary_task.add_done_callback(lambda _: callback())
     logging.info("Coordinator ready")
-    host, sep, port = listen.rpartition(":")
-    if not sep or not port.isdigit():
-        host = listen
     print(f"listening on {host}:{bound}", flush=True)
     await server.wait_for_termination()
+    if replica_of and coordinator.primary_task.done():
+        raise SystemExit(1)
 
 
 def main():
@@ -1187,6 +2175,33 @@ def main():
         help="coordinator listening host and port",
     )
     parser.add_argument("-d", "--debug", action="store_true", default=False, help="enable debug mode")
+    parser.add_argument(
+        "--fair-share",
+        action="store_true",
+        default=False,
+        help="allocate places to reservations of the same priority round-robin per owner",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        metavar="PORT",
+        type=int,
+        default=None,
+        help="serve Prometheus metrics via HTTP on this port (on the listening host)",
+    )
+    parser.add_argument(
+        "--snapshot-format",
+        choices=SNAPSHOT_FORMATS.keys(),
+        default="yaml",
+        help="file format for the places and resources snapshots (default: yaml); "
+        "use 'python -m labgrid.remote.snapshot' to convert existing snapshots",
+    )
+    parser.add_argument(
+        "--replica-of",
+        metavar="HOST:PORT",
+        type=str,
+        default=None,
+        help="run as a read replica of the coordinator at HOST:PORT",
+    )
     parser.add_argument("--pystuck", action="store_true", help="enable pystuck")
     parser.add_argument(
         "--pystuck-port", metavar="PORT", type=int, default=6666, help="use a different pystuck port than 6666"
@@ -1215,7 +2230,16 @@ def main():
     cleanup = []
     loop.set_debug(True)
     try:
-        loop.run_until_complete(serve(args.listen, cleanup))
+        loop.run_until_complete(
+            serve(
+                args.listen,
+                cleanup,
+                fair_share=args.fair_share,
+                metrics_port=args.metrics_port,
+                replica_of=args.replica_of,
+                snapshot_format=args.snapshot_format,
+            )
+        )
     finally:
         if cleanup:
             loop.run_until_complete(*cleanup)
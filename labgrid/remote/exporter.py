@@ -3,6 +3,7 @@ them available to other clients on the same coordinator"""
 
 import argparse
 import asyncio
+import copy
 import logging
 import sys
 import os
@@ -11,6 +12,8 @@ import traceback
 import signal
 import shutil
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlsplit
 import warnings
 from pathlib import Path
@@ -23,6 +26,7 @@ import grpc
 from .config import ResourceConfig
 from .common import ResourceEntry, queue_as_aiter
 from .generated import labgrid_coordinator_pb2, labgrid_coordinator_pb2_grpc
+from ..resource.common import ManagedResource, ResourceManager
 from ..util import get_free_port, labgrid_version
 
 
@@ -46,6 +50,26 @@ class InvalidResourceRequestError(ExporterError):
     pass
 
 
+@attr.s(eq=False)
+class PollStats:
+    """Duration statistics for the polls of a single resource."""
+
+    count = attr.ib(default=0)
+    total = attr.ib(default=0.0)
+    max = attr.ib(default=0.0)
+    last = attr.ib(default=0.0)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.last = duration
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
 def log_subprocess_kernel_stack(logger, child):
     if child.poll() is not None:  # nothing to check if no longer running
         return
@@ -72,6 +96,11 @@ class ResourceExport(ResourceEntry):
     local_params = attr.ib(init=False)
     start_params = attr.ib(init=False)
 
+    # seconds between polls, None selects the default for the local resource
+    poll_interval = None
+    # poll() may block (for example on network requests), so run it in a thread
+    blocking_poll = False
+
     def __attrs_post_init__(self):
         super().__attrs_post_init__()
         self.logger = logging.getLogger(f"ResourceExport({self.cls})")
@@ -107,6 +136,24 @@ class ResourceExport(ResourceEntry):
     def _get_params(self):
         return {}
 
+    def get_poll_interval(self):
+        """Return the interval in seconds between polls of this export.
+
+        Managed resources can appear and disappear at any time, while other
+        resources only change on acquire and release, which poll immediately.
+        """
+        if self.poll_interval is not None:
+            return self.poll_interval
+        if isinstance(self.local, ManagedResource):
+            return 1.0
+        return 10.0
+
+    def has_pending_events(self):
+        """Return True if the local resource should be polled before its interval expires."""
+        if isinstance(self.local, ManagedResource):
+            return self.local.manager.has_pending_events()
+        return False
+
     def _start(self, start_params):
         """Start exporting the local resource"""
         pass
@@ -184,6 +231,13 @@ class ResourceExport(ResourceEntry):
         super().release(*args, **kwargs)
         self.poll()
 
+    def remove(self):
+        """Stop exporting the local resource before the export is removed."""
+        if self.start_params is not None and not self.broken:
+            self.stop()
+        if isinstance(self.local, ManagedResource):
+            self.local.manager._remove_resource(self.local)
+
 
 @attr.s(eq=False)
 class SerialPortExport(ResourceExport):
@@ -762,6 +816,9 @@ class LXAIOBusNodeExport(ResourceExport):
         local_cls = getattr(lxaiobus, local_cls_name)
         self.local = local_cls(target=None, name=None, **self.local_params)
 
+    # the manager requests the node state via HTTP
+    blocking_poll = True
+
     def _get_params(self):
         return self.local_params
 
@@ -809,6 +866,9 @@ exports["YKUSHPowerPort"] = YKUSHPowerPortExport
 
 
 class Exporter:
+    # interval for logging the resources with the slowest polls
+    poll_stats_interval = 300.0
+
     def __init__(self, config) -> None:
         """Set up internal datastructures on successful connection:
         - Setup loop, name, authid and address
@@ -843,30 +903,33 @@ class Exporter:
         self.pump_task = None
 
         self.poll_task = None
+        # monotonic time of the next scheduled poll for each resource
+        self.poll_due = {}
+        self.poll_stats = {}
+        # running polls of resources with blocking_poll
+        self.poll_futures = {}
+        self.poll_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="poll")
+        # set to run the next poll step immediately
+        self.poll_wakeup = asyncio.Event()
+        # group and resource name for each managed local resource
+        self.managed_exports = {}
 
         self.groups = {}
+        # cls and params from the resource config for each resource, used to
+        # find changed resources on reload
+        self.resource_params = {}
+        self.reload_lock = asyncio.Lock()
+        # data of the last update sent for each resource, used for deltas
+        self.sent = {}
+        self.resource_deltas = False
 
     async def run(self) -> None:
         self.pump_task = self.loop.create_task(self.message_pump())
         self.send_started()
 
-        config_template_env = {
-            "env": os.environ,
-            "isolated": self.isolated,
-            "hostname": self.hostname,
-            "name": self.name,
-        }
-        resource_config = ResourceConfig(self.config["resources"], config_template_env)
-        for group_name, group in resource_config.data.items():
-            group_name = str(group_name)
-            for resource_name, params in group.items():
-                resource_name = str(resource_name)
-                if resource_name == "location":
-                    continue
-                if params is None:
-                    continue
-                cls = params.pop("cls", resource_name)
-
+        resource_config = self._read_resource_config()
+        for group_name, group in resource_config.items():
+            for resource_name, (cls, params) in group.items():
                 # this may call back to acquire the resource immediately
                 await self.add_resource(group_name, resource_name, cls, params)
 
@@ -881,6 +944,7 @@ class Exporter:
                         logging.debug("pump task exited, shutting down exporter")
                         return
 
+        self._attach_managers()
         logging.info("creating poll task")
         self.poll_task = self.loop.create_task(self.poll())
 
@@ -895,6 +959,88 @@ class Exporter:
         except asyncio.CancelledError:
             return
 
+    def _read_resource_config(self):
+        """Return the resource config as a dict of group names to dicts of
+        resource names to (cls, params) tuples."""
+        config_template_env = {
+            "env": os.environ,
+            "isolated": self.isolated,
+            "hostname": self.hostname,
+            "name": self.name,
+        }
+        resource_config = ResourceConfig(self.config["resources"], config_template_env)
+        groups = {}
+        for group_name, group in resource_config.data.items():
+            group_name = str(group_name)
+            for resource_name, params in group.items():
+                resource_name = str(resource_name)
+                if resource_name == "location":
+                    continue
+                if params is None:
+                    continue
+                cls = params.pop("cls", resource_name)
+                groups.setdefault(group_name, {})[resource_name] = (cls, params)
+        return groups
+
+    async def reload(self):
+        """Read the resource config again and apply the differences.
+
+        Only added, removed and changed resources are sent to the coordinator,
+        unchanged resources (and their running exports) are left untouched.
+        Changes to acquired resources are skipped until the next reload.
+        """
+        async with self.reload_lock:
+            logging.info("reloading resource config %s", self.config["resources"])
+            try:
+                resource_config = self._read_resource_config()
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("failed to read resource config, keeping the current resources")
+                return
+
+            wanted = {
+                (group_name, resource_name): value
+                for group_name, group in resource_config.items()
+                for resource_name, value in group.items()
+            }
+            removed = 0
+            for key, value in list(self.resource_params.items()):
+                if wanted.get(key) == value:
+                    continue
+                resource = self.groups[key[0]][key[1]]
+                if resource.acquired and not getattr(resource, "broken", None):
+                    logging.warning("resource %s/%s is acquired by %s, not applying changes", *key, resource.acquired)
+                    continue
+                await self.remove_resource(*key)
+                removed += 1
+            added = 0
+            for key, (cls, params) in wanted.items():
+                if key in self.resource_params:
+                    continue
+                await self.add_resource(*key, cls, params)
+                added += 1
+            logging.info(
+                "reloaded resource config: %d removed or changed, %d added or changed, %d unchanged",
+                removed,
+                added,
+                len(self.resource_params) - added,
+            )
+            if self.poll_task is not None:
+                # new resources may have created a manager
+                self._attach_managers()
+
+    def _attach_managers(self):
+        """Let the resource managers handle their events in our event loop."""
+        for manager in list(ResourceManager.instances.values()):
+            manager.attach_loop(self.loop, self._on_resources_changed)
+
+    def _on_resources_changed(self, resources):
+        """Poll the exports of the changed local resources immediately."""
+        for resource in resources:
+            key = self.managed_exports.get(resource)
+            if key is not None:
+                self.poll_due[key] = 0.0
+                self.poll_wakeup.set()
+
     def send_started(self):
         msg = labgrid_coordinator_pb2.ExporterInMessage()
         msg.startup.version = labgrid_version()
@@ -911,6 +1057,7 @@ class Exporter:
                 if kind == "hello":
                     print("Exporter ready", flush=True)
                     logging.info("connected to coordinator version %s", out_message.hello.version)
+                    self.resource_deltas = out_message.hello.resource_deltas
                 elif kind == "set_acquired_request":
                     logging.debug("acquire request")
                     success = False
@@ -936,9 +1083,18 @@ class Exporter:
                         in_message.response.success = success
                         if reason:
                             in_message.response.reason = reason
+                        if out_message.set_acquired_request.HasField("request_id"):
+                            in_message.response.request_id = out_message.set_acquired_request.request_id
                         logging.debug("queuing %s", in_message)
                         self.out_queue.put_nowait(in_message)
                         logging.debug("queued %s", in_message)
+                elif kind == "resync_resource":
+                    group_name = out_message.resync_resource.group_name
+                    resource_name = out_message.resync_resource.resource_name
+                    logging.info("coordinator requested full update for resource %s/%s", group_name, resource_name)
+                    self.sent.pop((group_name, resource_name), None)
+                    if resource_name in self.groups.get(group_name, {}):
+                        await self.update_resource(group_name, resource_name)
                 else:
                     logging.debug("unknown request: %s", kind)
         except grpc.aio.AioRpcError as e:
@@ -967,6 +1123,7 @@ class Exporter:
             raise UnknownResourceError(
                 f"acquire request for unknown resource {group_name}/{resource_name} by {place_name}"
             )
+        await self._wait_for_poll(group_name, resource_name)
 
         if resource.acquired:
             raise InvalidResourceRequestError(
@@ -976,12 +1133,15 @@ class Exporter:
         try:
             resource.acquire(place_name)
         finally:
+            # poll again on the next step, in case the state changed (or the resource broke)
+            self.poll_due.pop((group_name, resource_name), None)
             await self.update_resource(group_name, resource_name)
 
     async def release(self, group_name, resource_name):
         resource = self.groups.get(group_name, {}).get(resource_name)
         if resource is None:
             raise UnknownResourceError(f"release request for unknown resource {group_name}/{resource_name}")
+        await self._wait_for_poll(group_name, resource_name)
 
         if not resource.acquired:
             raise InvalidResourceRequestError(f"Resource {group_name}/{resource_name} is not acquired")
@@ -989,30 +1149,95 @@ class Exporter:
         try:
             resource.release()
         finally:
+            # poll again on the next step, in case the state changed (or the resource broke)
+            self.poll_due.pop((group_name, resource_name), None)
+            await self.update_resource(group_name, resource_name)
+
+    async def _wait_for_poll(self, group_name, resource_name):
+        """Wait until a running poll in the thread pool has finished."""
+        future = self.poll_futures.get((group_name, resource_name))
+        if future is not None:
+            await asyncio.wait((future,))
+
+    def _timed_poll(self, key, resource):
+        start = time.monotonic()
+        try:
+            return resource.poll()
+        finally:
+            duration = time.monotonic() - start
+            self.poll_stats.setdefault(key, PollStats()).add(duration)
+            if duration > 0.1:
+                logging.warning("polling %s/%s took %.3f seconds", key[0], key[1], duration)
+
+    def _log_poll_stats(self, count=5):
+        """Log the poll duration statistics of the resources with the slowest polls."""
+        slowest = sorted(self.poll_stats.items(), key=lambda item: item[1].max, reverse=True)
+        for (group_name, resource_name), stats in slowest[:count]:
+            logging.debug(
+                "poll stats for %s/%s: %d polls, mean %.3f, max %.3f, last %.3f seconds",
+                group_name,
+                resource_name,
+                stats.count,
+                stats.mean,
+                stats.max,
+                stats.last,
+            )
+
+    async def _poll_resource(self, group_name, resource_name, resource):
+        key = (group_name, resource_name)
+        try:
+            if resource.blocking_poll:
+                changed = await self.loop.run_in_executor(self.poll_executor, self._timed_poll, key, resource)
+            else:
+                changed = self._timed_poll(key, resource)
+        except Exception:  # pylint: disable=broad-except
+            print(f"Exception while polling {resource}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            return
+        if changed:
             await self.update_resource(group_name, resource_name)
 
     async def _poll_step(self):
+        """Poll the resources which are due or have pending events."""
+        now = time.monotonic()
+        # collect the resources first, as the first poll handles the pending
+        # events of a manager for all of its resources
+        selected = []
         for group_name, group in self.groups.items():
             for resource_name, resource in group.items():
                 if not isinstance(resource, ResourceExport):
                     continue
-                try:
-                    changed = resource.poll()
-                except Exception:  # pylint: disable=broad-except
-                    print(f"Exception while polling {resource}", file=sys.stderr)
-                    traceback.print_exc(file=sys.stderr)
+                key = (group_name, resource_name)
+                if key in self.poll_futures:
                     continue
-                if changed:
-                    await self.update_resource(group_name, resource_name)
-                else:
-                    # let other tasks run, see https://github.com/python/asyncio/issues/284
-                    await asyncio.sleep(0)
+                if self.poll_due.get(key, 0.0) > now and not resource.has_pending_events():
+                    continue
+                self.poll_due[key] = now + resource.get_poll_interval()
+                selected.append((key, resource))
+
+        for key, resource in selected:
+            if resource.blocking_poll:
+                future = self.loop.create_task(self._poll_resource(*key, resource))
+                self.poll_futures[key] = future
+                future.add_done_callback(lambda _, key=key: self.poll_futures.pop(key, None))
+            else:
+                await self._poll_resource(*key, resource)
+                # let other tasks run, see https://github.com/python/asyncio/issues/284
+                await asyncio.sleep(0)
 
     async def poll(self):
+        next_stats = time.monotonic() + self.poll_stats_interval
         while True:
             try:
-                await asyncio.sleep(0.25)
+                try:
+                    await asyncio.wait_for(self.poll_wakeup.wait(), 0.25)
+                except asyncio.TimeoutError:
+                    pass
+                self.poll_wakeup.clear()
                 await self._poll_step()
+                if time.monotonic() >= next_stats:
+                    next_stats = time.monotonic() + self.poll_stats_interval
+                    self._log_poll_stats()
             except asyncio.CancelledError:
                 break
             except Exception:  # pylint: disable=broad-except
@@ -1027,6 +1252,8 @@ class Exporter:
         print(f"add resource {group_name}/{resource_name}: {cls}/{params}")
         group = self.groups.setdefault(group_name, {})
         assert resource_name not in group
+        # the exports modify the params, so keep a copy for reloads
+        self.resource_params[(group_name, resource_name)] = (cls, copy.deepcopy(params))
         export_cls = exports.get(cls, ResourceEntry)
         config = {
             "avail": export_cls is ResourceEntry,
@@ -1038,6 +1265,8 @@ class Exporter:
             res = group[resource_name] = export_cls(
                 config, host=self.hostname, proxy=getfqdn(), proxy_required=proxy_req
             )
+            if isinstance(res.local, ManagedResource):
+                self.managed_exports[res.local] = (group_name, resource_name)
             res.poll()
         else:
             config["params"]["extra"] = {
@@ -1047,13 +1276,47 @@ class Exporter:
             group[resource_name] = export_cls(config)
         await self.update_resource(group_name, resource_name)
 
+    async def remove_resource(self, group_name, resource_name):
+        """Remove a resource from the exporter and from the coordinator"""
+        print(f"remove resource {group_name}/{resource_name}")
+        key = (group_name, resource_name)
+        await self._wait_for_poll(group_name, resource_name)
+        resource = self.groups[group_name].pop(resource_name)
+        if not self.groups[group_name]:
+            del self.groups[group_name]
+        del self.resource_params[key]
+        self.poll_due.pop(key, None)
+        self.poll_stats.pop(key, None)
+        self.sent.pop(key, None)
+        if isinstance(resource, ResourceExport):
+            self.managed_exports.pop(resource.local, None)
+            try:
+                resource.remove()
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("failed to stop removed resource %s/%s", group_name, resource_name)
+
+        msg = labgrid_coordinator_pb2.ExporterInMessage()
+        msg.del_resource.group_name = group_name
+        msg.del_resource.resource_name = resource_name
+        self.out_queue.put_nowait(msg)
+        logging.info("queued removal of resource %s/%s", group_name, resource_name)
+
     async def update_resource(self, group_name, resource_name):
         """Update status on the coordinator"""
         resource = self.groups[group_name][resource_name]
+        resource.version += 1
         msg = labgrid_coordinator_pb2.ExporterInMessage()
-        msg.resource.CopyFrom(resource.as_pb2())
-        msg.resource.path.group_name = group_name
-        msg.resource.path.resource_name = resource_name
+        old = self.sent.get((group_name, resource_name))
+        delta = resource.as_delta_pb2(old) if self.resource_deltas and old else None
+        if delta is not None:
+            msg.resource_delta.CopyFrom(delta)
+            msg.resource_delta.path.group_name = group_name
+            msg.resource_delta.path.resource_name = resource_name
+        else:
+            msg.resource.CopyFrom(resource.as_pb2())
+            msg.resource.path.group_name = group_name
+            msg.resource.path.resource_name = resource_name
+        self.sent[(group_name, resource_name)] = resource.snapshot()
         self.out_queue.put_nowait(msg)
         logging.info("queued update for resource %s/%s", group_name, resource_name)
 
@@ -1067,9 +1330,13 @@ async def amain(config) -> bool:
     def _stop():
         asyncio.ensure_future(exporter.stop())
 
+    def _reload():
+        asyncio.ensure_future(exporter.reload())
+
     loop = asyncio.get_event_loop()
     loop.add_signal_handler(signal.SIGINT, _stop)
     loop.add_signal_handler(signal.SIGTERM, _stop)
+    loop.add_signal_handler(signal.SIGHUP, _reload)
 
     await exporter.run()
 
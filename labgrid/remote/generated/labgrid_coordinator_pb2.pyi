@@ -6,14 +6,16 @@ from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Map
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class ClientInMessage(_message.Message):
-    __slots__ = ("sync", "startup", "subscribe")
+    __slots__ = ("sync", "startup", "subscribe", "resync_resource")
     SYNC_FIELD_NUMBER: _ClassVar[int]
     STARTUP_FIELD_NUMBER: _ClassVar[int]
     SUBSCRIBE_FIELD_NUMBER: _ClassVar[int]
+    RESYNC_RESOURCE_FIELD_NUMBER: _ClassVar[int]
     sync: Sync
     startup: StartupDone
     subscribe: Subscribe
-    def __init__(self, sync: _Optional[_Union[Sync, _Mapping]] = ..., startup: _Optional[_Union[StartupDone, _Mapping]] = ..., subscribe: _Optional[_Union[Subscribe, _Mapping]] = ...) -> None: ...
+    resync_resource: Resource.Path
+    def __init__(self, sync: _Optional[_Union[Sync, _Mapping]] = ..., startup: _Optional[_Union[StartupDone, _Mapping]] = ..., subscribe: _Optional[_Union[Subscribe, _Mapping]] = ..., resync_resource: _Optional[_Union[Resource.Path, _Mapping]] = ...) -> None: ...
 
 class Sync(_message.Message):
     __slots__ = ("id",)
@@ -22,22 +24,44 @@ class Sync(_message.Message):
     def __init__(self, id: _Optional[int] = ...) -> None: ...
 
 class StartupDone(_message.Message):
-    __slots__ = ("version", "name")
+    __slots__ = ("version", "name", "resource_deltas", "replica")
     VERSION_FIELD_NUMBER: _ClassVar[int]
     NAME_FIELD_NUMBER: _ClassVar[int]
+    RESOURCE_DELTAS_FIELD_NUMBER: _ClassVar[int]
+    REPLICA_FIELD_NUMBER: _ClassVar[int]
     version: str
     name: str
-    def __init__(self, version: _Optional[str] = ..., name: _Optional[str] = ...) -> None: ...
+    resource_deltas: bool
+    replica: bool
+    def __init__(self, version: _Optional[str] = ..., name: _Optional[str] = ..., resource_deltas: bool = ..., replica: bool = ...) -> None: ...
 
 class Subscribe(_message.Message):
-    __slots__ = ("is_unsubscribe", "all_places", "all_resources")
+    __slots__ = ("is_unsubscribe", "all_places", "all_resources", "filter")
+    class Filter(_message.Message):
+        __slots__ = ("places", "exporters", "tags")
+        class TagsEntry(_message.Message):
+            __slots__ = ("key", "value")
+            KEY_FIELD_NUMBER: _ClassVar[int]
+            VALUE_FIELD_NUMBER: _ClassVar[int]
+            key: str
+            value: str
+            def __init__(self, key: _Optional[str] = ..., value: _Optional[str] = ...) -> None: ...
+        PLACES_FIELD_NUMBER: _ClassVar[int]
+        EXPORTERS_FIELD_NUMBER: _ClassVar[int]
+        TAGS_FIELD_NUMBER: _ClassVar[int]
+        places: _containers.RepeatedScalarFieldContainer[str]
+        exporters: _containers.RepeatedScalarFieldContainer[str]
+        tags: _containers.ScalarMap[str, str]
+        def __init__(self, places: _Optional[_Iterable[str]] = ..., exporters: _Optional[_Iterable[str]] = ..., tags: _Optional[_Mapping[str, str]] = ...) -> None: ...
     IS_UNSUBSCRIBE_FIELD_NUMBER: _ClassVar[int]
     ALL_PLACES_FIELD_NUMBER: _ClassVar[int]
     ALL_RESOURCES_FIELD_NUMBER: _ClassVar[int]
+    FILTER_FIELD_NUMBER: _ClassVar[int]
     is_unsubscribe: bool
     all_places: bool
     all_resources: bool
-    def __init__(self, is_unsubscribe: bool = ..., all_places: bool = ..., all_resources: bool = ...) -> None: ...
+    filter: Subscribe.Filter
+    def __init__(self, is_unsubscribe: bool = ..., all_places: bool = ..., all_resources: bool = ..., filter: _Optional[_Union[Subscribe.Filter, _Mapping]] = ...) -> None: ...
 
 class ClientOutMessage(_message.Message):
     __slots__ = ("sync", "updates")
@@ -48,29 +72,35 @@ class ClientOutMessage(_message.Message):
     def __init__(self, sync: _Optional[_Union[Sync, _Mapping]] = ..., updates: _Optional[_Iterable[_Union[UpdateResponse, _Mapping]]] = ...) -> None: ...
 
 class UpdateResponse(_message.Message):
-    __slots__ = ("resource", "del_resource", "place", "del_place")
+    __slots__ = ("resource", "del_resource", "place", "del_place", "resource_delta")
     RESOURCE_FIELD_NUMBER: _ClassVar[int]
     DEL_RESOURCE_FIELD_NUMBER: _ClassVar[int]
     PLACE_FIELD_NUMBER: _ClassVar[int]
     DEL_PLACE_FIELD_NUMBER: _ClassVar[int]
+    RESOURCE_DELTA_FIELD_NUMBER: _ClassVar[int]
     resource: Resource
     del_resource: Resource.Path
     place: Place
     del_place: str
-    def __init__(self, resource: _Optional[_Union[Resource, _Mapping]] = ..., del_resource: _Optional[_Union[Resource.Path, _Mapping]] = ..., place: _Optional[_Union[Place, _Mapping]] = ..., del_place: _Optional[str] = ...) -> None: ...
+    resource_delta: ResourceDelta
+    def __init__(self, resource: _Optional[_Union[Resource, _Mapping]] = ..., del_resource: _Optional[_Union[Resource.Path, _Mapping]] = ..., place: _Optional[_Union[Place, _Mapping]] = ..., del_place: _Optional[str] = ..., resource_delta: _Optional[_Union[ResourceDelta, _Mapping]] = ...) -> None: ...
 
 class ExporterInMessage(_message.Message):
-    __slots__ = ("resource", "startup", "response")
+    __slots__ = ("resource", "startup", "response", "resource_delta", "del_resource")
     RESOURCE_FIELD_NUMBER: _ClassVar[int]
     STARTUP_FIELD_NUMBER: _ClassVar[int]
     RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    RESOURCE_DELTA_FIELD_NUMBER: _ClassVar[int]
+    DEL_RESOURCE_FIELD_NUMBER: _ClassVar[int]
     resource: Resource
     startup: StartupDone
     response: ExporterResponse
-    def __init__(self, resource: _Optional[_Union[Resource, _Mapping]] = ..., startup: _Optional[_Union[StartupDone, _Mapping]] = ..., response: _Optional[_Union[ExporterResponse, _Mapping]] = ...) -> None: ...
+    resource_delta: ResourceDelta
+    del_resource: Resource.Path
+    def __init__(self, resource: _Optional[_Union[Resource, _Mapping]] = ..., startup: _Optional[_Union[StartupDone, _Mapping]] = ..., response: _Optional[_Union[ExporterResponse, _Mapping]] = ..., resource_delta: _Optional[_Union[ResourceDelta, _Mapping]] = ..., del_resource: _Optional[_Union[Resource.Path, _Mapping]] = ...) -> None: ...
 
 class Resource(_message.Message):
-    __slots__ = ("path", "cls", "params", "extra", "acquired", "avail")
+    __slots__ = ("path", "cls", "params", "extra", "acquired", "avail", "version")
     class Path(_message.Message):
         __slots__ = ("exporter_name", "group_name", "resource_name")
         EXPORTER_NAME_FIELD_NUMBER: _ClassVar[int]
@@ -100,13 +130,51 @@ class Resource(_message.Message):
     EXTRA_FIELD_NUMBER: _ClassVar[int]
     ACQUIRED_FIELD_NUMBER: _ClassVar[int]
     AVAIL_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
     path: Resource.Path
     cls: str
     params: _containers.MessageMap[str, MapValue]
     extra: _containers.MessageMap[str, MapValue]
     acquired: str
     avail: bool
-    def __init__(self, path: _Optional[_Union[Resource.Path, _Mapping]] = ..., cls: _Optional[str] = ..., params: _Optional[_Mapping[str, MapValue]] = ..., extra: _Optional[_Mapping[str, MapValue]] = ..., acquired: _Optional[str] = ..., avail: bool = ...) -> None: ...
+    version: int
+    def __init__(self, path: _Optional[_Union[Resource.Path, _Mapping]] = ..., cls: _Optional[str] = ..., params: _Optional[_Mapping[str, MapValue]] = ..., extra: _Optional[_Mapping[str, MapValue]] = ..., acquired: _Optional[str] = ..., avail: bool = ..., version: _Optional[int] = ...) -> None: ...
+
+class ResourceDelta(_message.Message):
+    __slots__ = ("path", "version", "acquired", "avail", "params", "extra", "removed_params", "removed_extra", "base_version")
+    class ParamsEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: MapValue
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[MapValue, _Mapping]] = ...) -> None: ...
+    class ExtraEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: MapValue
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[_Union[MapValue, _Mapping]] = ...) -> None: ...
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    ACQUIRED_FIELD_NUMBER: _ClassVar[int]
+    AVAIL_FIELD_NUMBER: _ClassVar[int]
+    PARAMS_FIELD_NUMBER: _ClassVar[int]
+    EXTRA_FIELD_NUMBER: _ClassVar[int]
+    REMOVED_PARAMS_FIELD_NUMBER: _ClassVar[int]
+    REMOVED_EXTRA_FIELD_NUMBER: _ClassVar[int]
+    BASE_VERSION_FIELD_NUMBER: _ClassVar[int]
+    path: Resource.Path
+    version: int
+    acquired: str
+    avail: bool
+    params: _containers.MessageMap[str, MapValue]
+    extra: _containers.MessageMap[str, MapValue]
+    removed_params: _containers.RepeatedScalarFieldContainer[str]
+    removed_extra: _containers.RepeatedScalarFieldContainer[str]
+    base_version: int
+    def __init__(self, path: _Optional[_Union[Resource.Path, _Mapping]] = ..., version: _Optional[int] = ..., acquired: _Optional[str] = ..., avail: bool = ..., params: _Optional[_Mapping[str, MapValue]] = ..., extra: _Optional[_Mapping[str, MapValue]] = ..., removed_params: _Optional[_Iterable[str]] = ..., removed_extra: _Optional[_Iterable[str]] = ..., base_version: _Optional[int] = ...) -> None: ...
 
 class MapValue(_message.Message):
     __slots__ = ("bool_value", "int_value", "uint_value", "float_value", "string_value")
@@ -123,36 +191,44 @@ class MapValue(_message.Message):
     def __init__(self, bool_value: bool = ..., int_value: _Optional[int] = ..., uint_value: _Optional[int] = ..., float_value: _Optional[float] = ..., string_value: _Optional[str] = ...) -> None: ...
 
 class ExporterResponse(_message.Message):
-    __slots__ = ("success", "reason")
+    __slots__ = ("success", "reason", "request_id")
     SUCCESS_FIELD_NUMBER: _ClassVar[int]
     REASON_FIELD_NUMBER: _ClassVar[int]
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
     success: bool
     reason: str
-    def __init__(self, success: bool = ..., reason: _Optional[str] = ...) -> None: ...
+    request_id: int
+    def __init__(self, success: bool = ..., reason: _Optional[str] = ..., request_id: _Optional[int] = ...) -> None: ...
 
 class Hello(_message.Message):
-    __slots__ = ("version",)
+    __slots__ = ("version", "resource_deltas")
     VERSION_FIELD_NUMBER: _ClassVar[int]
+    RESOURCE_DELTAS_FIELD_NUMBER: _ClassVar[int]
     version: str
-    def __init__(self, version: _Optional[str] = ...) -> None: ...
+    resource_deltas: bool
+    def __init__(self, version: _Optional[str] = ..., resource_deltas: bool = ...) -> None: ...
 
 class ExporterOutMessage(_message.Message):
-    __slots__ = ("hello", "set_acquired_request")
+    __slots__ = ("hello", "set_acquired_request", "resync_resource")
     HELLO_FIELD_NUMBER: _ClassVar[int]
     SET_ACQUIRED_REQUEST_FIELD_NUMBER: _ClassVar[int]
+    RESYNC_RESOURCE_FIELD_NUMBER: _ClassVar[int]
     hello: Hello
     set_acquired_request: ExporterSetAcquiredRequest
-    def __init__(self, hello: _Optional[_Union[Hello, _Mapping]] = ..., set_acquired_request: _Optional[_Union[ExporterSetAcquiredRequest, _Mapping]] = ...) -> None: ...
+    resync_resource: Resource.Path
+    def __init__(self, hello: _Optional[_Union[Hello, _Mapping]] = ..., set_acquired_request: _Optional[_Union[ExporterSetAcquiredRequest, _Mapping]] = ..., resync_resource: _Optional[_Union[Resource.Path, _Mapping]] = ...) -> None: ...
 
 class ExporterSetAcquiredRequest(_message.Message):
-    __slots__ = ("group_name", "resource_name", "place_name")
+    __slots__ = ("group_name", "resource_name", "place_name", "request_id")
     GROUP_NAME_FIELD_NUMBER: _ClassVar[int]
     RESOURCE_NAME_FIELD_NUMBER: _ClassVar[int]
     PLACE_NAME_FIELD_NUMBER: _ClassVar[int]
+    REQUEST_ID_FIELD_NUMBER: _ClassVar[int]
     group_name: str
     resource_name: str
     place_name: str
-    def __init__(self, group_name: _Optional[str] = ..., resource_name: _Optional[str] = ..., place_name: _Optional[str] = ...) -> None: ...
+    request_id: int
+    def __init__(self, group_name: _Optional[str] = ..., resource_name: _Optional[str] = ..., place_name: _Optional[str] = ..., request_id: _Optional[int] = ...) -> None: ...
 
 class AddPlaceRequest(_message.Message):
     __slots__ = ("name",)
@@ -184,6 +260,30 @@ class GetPlacesResponse(_message.Message):
     places: _containers.RepeatedCompositeFieldContainer[Place]
     def __init__(self, places: _Optional[_Iterable[_Union[Place, _Mapping]]] = ...) -> None: ...
 
+class GetPlaceRequest(_message.Message):
+    __slots__ = ("pattern",)
+    PATTERN_FIELD_NUMBER: _ClassVar[int]
+    pattern: str
+    def __init__(self, pattern: _Optional[str] = ...) -> None: ...
+
+class GetPlaceResponse(_message.Message):
+    __slots__ = ("places",)
+    PLACES_FIELD_NUMBER: _ClassVar[int]
+    places: _containers.RepeatedCompositeFieldContainer[Place]
+    def __init__(self, places: _Optional[_Iterable[_Union[Place, _Mapping]]] = ...) -> None: ...
+
+class GetResourcesForPlaceRequest(_message.Message):
+    __slots__ = ("placename",)
+    PLACENAME_FIELD_NUMBER: _ClassVar[int]
+    placename: str
+    def __init__(self, placename: _Optional[str] = ...) -> None: ...
+
+class GetResourcesForPlaceResponse(_message.Message):
+    __slots__ = ("resources",)
+    RESOURCES_FIELD_NUMBER: _ClassVar[int]
+    resources: _containers.RepeatedCompositeFieldContainer[Resource]
+    def __init__(self, resources: _Optional[_Iterable[_Union[Resource, _Mapping]]] = ...) -> None: ...
+
 class Place(_message.Message):
     __slots__ = ("name", "aliases", "comment", "tags", "matches", "acquired", "acquired_resources", "allowed", "created", "changed", "reservation")
     class TagsEntry(_message.Message):
@@ -314,6 +414,38 @@ class DeletePlaceMatchResponse(_message.Message):
     __slots__ = ()
     def __init__(self) -> None: ...
 
+class PlaceOperation(_message.Message):
+    __slots__ = ("add_place", "delete_place", "add_alias", "delete_alias", "set_tags", "set_comment", "add_match", "delete_match")
+    ADD_PLACE_FIELD_NUMBER: _ClassVar[int]
+    DELETE_PLACE_FIELD_NUMBER: _ClassVar[int]
+    ADD_ALIAS_FIELD_NUMBER: _ClassVar[int]
+    DELETE_ALIAS_FIELD_NUMBER: _ClassVar[int]
+    SET_TAGS_FIELD_NUMBER: _ClassVar[int]
+    SET_COMMENT_FIELD_NUMBER: _ClassVar[int]
+    ADD_MATCH_FIELD_NUMBER: _ClassVar[int]
+    DELETE_MATCH_FIELD_NUMBER: _ClassVar[int]
+    add_place: AddPlaceRequest
+    delete_place: DeletePlaceRequest
+    add_alias: AddPlaceAliasRequest
+    delete_alias: DeletePlaceAliasRequest
+    set_tags: SetPlaceTagsRequest
+    set_comment: SetPlaceCommentRequest
+    add_match: AddPlaceMatchRequest
+    delete_match: DeletePlaceMatchRequest
+    def __init__(self, add_place: _Optional[_Union[AddPlaceRequest, _Mapping]] = ..., delete_place: _Optional[_Union[DeletePlaceRequest, _Mapping]] = ..., add_alias: _Optional[_Union[AddPlaceAliasRequest, _Mapping]] = ..., delete_alias: _Optional[_Union[DeletePlaceAliasRequest, _Mapping]] = ..., set_tags: _Optional[_Union[SetPlaceTagsRequest, _Mapping]] = ..., set_comment: _Optional[_Union[SetPlaceCommentRequest, _Mapping]] = ..., add_match: _Optional[_Union[AddPlaceMatchRequest, _Mapping]] = ..., delete_match: _Optional[_Union[DeletePlaceMatchRequest, _Mapping]] = ...) -> None: ...
+
+class UpdatePlacesRequest(_message.Message):
+    __slots__ = ("operations",)
+    OPERATIONS_FIELD_NUMBER: _ClassVar[int]
+    operations: _containers.RepeatedCompositeFieldContainer[PlaceOperation]
+    def __init__(self, operations: _Optional[_Iterable[_Union[PlaceOperation, _Mapping]]] = ...) -> None: ...
+
+class UpdatePlacesResponse(_message.Message):
+    __slots__ = ("changed_places",)
+    CHANGED_PLACES_FIELD_NUMBER: _ClassVar[int]
+    changed_places: _containers.RepeatedScalarFieldContainer[str]
+    def __init__(self, changed_places: _Optional[_Iterable[str]] = ...) -> None: ...
+
 class AcquirePlaceRequest(_message.Message):
     __slots__ = ("placename",)
     PLACENAME_FIELD_NUMBER: _ClassVar[int]
@@ -446,3 +578,75 @@ class GetReservationsResponse(_message.Message):
 class GetReservationsRequest(_message.Message):
     __slots__ = ()
     def __init__(self) -> None: ...
+
+class GetHistoryRequest(_message.Message):
+    __slots__ = ("place", "user", "tags", "since", "until", "limit", "utilization")
+    class TagsEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: str
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[str] = ...) -> None: ...
+    PLACE_FIELD_NUMBER: _ClassVar[int]
+    USER_FIELD_NUMBER: _ClassVar[int]
+    TAGS_FIELD_NUMBER: _ClassVar[int]
+    SINCE_FIELD_NUMBER: _ClassVar[int]
+    UNTIL_FIELD_NUMBER: _ClassVar[int]
+    LIMIT_FIELD_NUMBER: _ClassVar[int]
+    UTILIZATION_FIELD_NUMBER: _ClassVar[int]
+    place: str
+    user: str
+    tags: _containers.ScalarMap[str, str]
+    since: float
+    until: float
+    limit: int
+    utilization: bool
+    def __init__(self, place: _Optional[str] = ..., user: _Optional[str] = ..., tags: _Optional[_Mapping[str, str]] = ..., since: _Optional[float] = ..., until: _Optional[float] = ..., limit: _Optional[int] = ..., utilization: bool = ...) -> None: ...
+
+class HistoryEntry(_message.Message):
+    __slots__ = ("place", "user", "tags", "acquired", "released")
+    class TagsEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: str
+        value: str
+        def __init__(self, key: _Optional[str] = ..., value: _Optional[str] = ...) -> None: ...
+    PLACE_FIELD_NUMBER: _ClassVar[int]
+    USER_FIELD_NUMBER: _ClassVar[int]
+    TAGS_FIELD_NUMBER: _ClassVar[int]
+    ACQUIRED_FIELD_NUMBER: _ClassVar[int]
+    RELEASED_FIELD_NUMBER: _ClassVar[int]
+    place: str
+    user: str
+    tags: _containers.ScalarMap[str, str]
+    acquired: float
+    released: float
+    def __init__(self, place: _Optional[str] = ..., user: _Optional[str] = ..., tags: _Optional[_Mapping[str, str]] = ..., acquired: _Optional[float] = ..., released: _Optional[float] = ...) -> None: ...
+
+class PlaceUtilization(_message.Message):
+    __slots__ = ("place", "acquisitions", "acquired_seconds")
+    PLACE_FIELD_NUMBER: _ClassVar[int]
+    ACQUISITIONS_FIELD_NUMBER: _ClassVar[int]
+    ACQUIRED_SECONDS_FIELD_NUMBER: _ClassVar[int]
+    place: str
+    acquisitions: int
+    acquired_seconds: float
+    def __init__(self, place: _Optional[str] = ..., acquisitions: _Optional[int] = ..., acquired_seconds: _Optional[float] = ...) -> None: ...
+
+class GetHistoryResponse(_message.Message):
+    __slots__ = ("entries", "utilization")
+    ENTRIES_FIELD_NUMBER: _ClassVar[int]
+    UTILIZATION_FIELD_NUMBER: _ClassVar[int]
+    entries: _containers.RepeatedCompositeFieldContainer[HistoryEntry]
+    utilization: _containers.RepeatedCompositeFieldContainer[PlaceUtilization]
+    def __init__(self, entries: _Optional[_Iterable[_Union[HistoryEntry, _Mapping]]] = ..., utilization: _Optional[_Iterable[_Union[PlaceUtilization, _Mapping]]] = ...) -> None: ...
+
+class Snapshot(_message.Message):
+    __slots__ = ("places", "resources")
+    PLACES_FIELD_NUMBER: _ClassVar[int]
+    RESOURCES_FIELD_NUMBER: _ClassVar[int]
+    places: _containers.RepeatedCompositeFieldContainer[Place]
+    resources: _containers.RepeatedCompositeFieldContainer[Resource]
+    def __init__(self, places: _Optional[_Iterable[_Union[Place, _Mapping]]] = ..., resources: _Optional[_Iterable[_Union[Resource, _Mapping]]] = ...) -> None: ...
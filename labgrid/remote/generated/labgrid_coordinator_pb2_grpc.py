@@ -39,6 +39,16 @@ class CoordinatorStub(object):
                 request_serializer=labgrid__coordinator__pb2.GetPlacesRequest.SerializeToString,
                 response_deserializer=labgrid__coordinator__pb2.GetPlacesResponse.FromString,
                 )
+        self.GetPlace = channel.unary_unary(
+                '/labgrid.Coordinator/GetPlace',
+                request_serializer=labgrid__coordinator__pb2.GetPlaceRequest.SerializeToString,
+                response_deserializer=labgrid__coordinator__pb2.GetPlaceResponse.FromString,
+                )
+        self.GetResourcesForPlace = channel.unary_unary(
+                '/labgrid.Coordinator/GetResourcesForPlace',
+                request_serializer=labgrid__coordinator__pb2.GetResourcesForPlaceRequest.SerializeToString,
+                response_deserializer=labgrid__coordinator__pb2.GetResourcesForPlaceResponse.FromString,
+                )
         self.AddPlaceAlias = channel.unary_unary(
                 '/labgrid.Coordinator/AddPlaceAlias',
                 request_serializer=labgrid__coordinator__pb2.AddPlaceAliasRequest.SerializeToString,
@@ -69,6 +79,11 @@ class CoordinatorStub(object):
                 request_serializer=labgrid__coordinator__pb2.DeletePlaceMatchRequest.SerializeToString,
                 response_deserializer=labgrid__coordinator__pb2.DeletePlaceMatchResponse.FromString,
                 )
+        self.UpdatePlaces = channel.unary_unary(
+                '/labgrid.Coordinator/UpdatePlaces',
+                request_serializer=labgrid__coordinator__pb2.UpdatePlacesRequest.SerializeToString,
+                response_deserializer=labgrid__coordinator__pb2.UpdatePlacesResponse.FromString,
+                )
         self.AcquirePlace = channel.unary_unary(
                 '/labgrid.Coordinator/AcquirePlace',
                 request_serializer=labgrid__coordinator__pb2.AcquirePlaceRequest.SerializeToString,
@@ -104,6 +119,11 @@ class CoordinatorStub(object):
                 request_serializer=labgrid__coordinator__pb2.GetReservationsRequest.SerializeToString,
                 response_deserializer=labgrid__coordinator__pb2.GetReservationsResponse.FromString,
                 )
+        self.GetHistory = channel.unary_unary(
+                '/labgrid.Coordinator/GetHistory',
+                request_serializer=labgrid__coordinator__pb2.GetHistoryRequest.SerializeToString,
+                response_deserializer=labgrid__coordinator__pb2.GetHistoryResponse.FromString,
+                )
 
 
 class CoordinatorServicer(object):
@@ -139,6 +159,18 @@ class CoordinatorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetPlace(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetResourcesForPlace(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AddPlaceAlias(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -175,6 +207,12 @@ class CoordinatorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def UpdatePlaces(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def AcquirePlace(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -217,6 +255,12 @@ class CoordinatorServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetHistory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_CoordinatorServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -245,6 +289,16 @@ def add_CoordinatorServicer_to_server(servicer, server):
                     request_deserializer=labgrid__coordinator__pb2.GetPlacesRequest.FromString,
                     response_serializer=labgrid__coordinator__pb2.GetPlacesResponse.SerializeToString,
             ),
+            'GetPlace': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPlace,
+                    request_deserializer=labgrid__coordinator__pb2.GetPlaceRequest.FromString,
+                    response_serializer=labgrid__coordinator__pb2.GetPlaceResponse.SerializeToString,
+            ),
+            'GetResourcesForPlace': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetResourcesForPlace,
+                    request_deserializer=labgrid__coordinator__pb2.GetResourcesForPlaceRequest.FromString,
+                    response_serializer=labgrid__coordinator__pb2.GetResourcesForPlaceResponse.SerializeToString,
+            ),
             'AddPlaceAlias': grpc.unary_unary_rpc_method_handler(
                     servicer.AddPlaceAlias,
                     request_deserializer=labgrid__coordinator__pb2.AddPlaceAliasRequest.FromString,
@@ -275,6 +329,11 @@ def add_CoordinatorServicer_to_server(servicer, server):
                     request_deserializer=labgrid__coordinator__pb2.DeletePlaceMatchRequest.FromString,
                     response_serializer=labgrid__coordinator__pb2.DeletePlaceMatchResponse.SerializeToString,
             ),
+            'UpdatePlaces': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdatePlaces,
+                    request_deserializer=labgrid__coordinator__pb2.UpdatePlacesRequest.FromString,
+                    response_serializer=labgrid__coordinator__pb2.UpdatePlacesResponse.SerializeToString,
+            ),
             'AcquirePlace': grpc.unary_unary_rpc_method_handler(
                     servicer.AcquirePlace,
                     request_deserializer=labgrid__coordinator__pb2.AcquirePlaceRequest.FromString,
@@ -310,6 +369,11 @@ def add_CoordinatorServicer_to_server(servicer, server):
                     request_deserializer=labgrid__coordinator__pb2.GetReservationsRequest.FromString,
                     response_serializer=labgrid__coordinator__pb2.GetReservationsResponse.SerializeToString,
             ),
+            'GetHistory': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetHistory,
+                    request_deserializer=labgrid__coordinator__pb2.GetHistoryRequest.FromString,
+                    response_serializer=labgrid__coordinator__pb2.GetHistoryResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'labgrid.Coordinator', rpc_method_handlers)
@@ -405,6 +469,40 @@ class Coordinator(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def GetPlace(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/labgrid.Coordinator/GetPlace',
+            labgrid__coordinator__pb2.GetPlaceRequest.SerializeToString,
+            labgrid__coordinator__pb2.GetPlaceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetResourcesForPlace(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/labgrid.Coordinator/GetResourcesForPlace',
+            labgrid__coordinator__pb2.GetResourcesForPlaceRequest.SerializeToString,
+            labgrid__coordinator__pb2.GetResourcesForPlaceResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def AddPlaceAlias(request,
             target,
@@ -507,6 +605,23 @@ class Coordinator(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def UpdatePlaces(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/labgrid.Coordinator/UpdatePlaces',
+            labgrid__coordinator__pb2.UpdatePlacesRequest.SerializeToString,
+            labgrid__coordinator__pb2.UpdatePlacesResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def AcquirePlace(request,
             target,
@@ -625,3 +740,20 @@ class Coordinator(object):
             labgrid__coordinator__pb2.GetReservationsResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetHistory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/labgrid.Coordinator/GetHistory',
+            labgrid__coordinator__pb2.GetHistoryRequest.SerializeToString,
+            labgrid__coordinator__pb2.GetHistoryResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,205 @@
+"""
+This module contains the history of place acquisitions and reservations,
+recorded by the coordinator in an SQLite database.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+
+import attr
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS acquisitions (
+    id INTEGER PRIMARY KEY,
+    place TEXT NOT NULL,
+    user TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    acquired REAL NOT NULL,
+    released REAL
+);
+CREATE INDEX IF NOT EXISTS acquisitions_acquired ON acquisitions (acquired);
+CREATE INDEX IF NOT EXISTS acquisitions_place ON acquisitions (place, acquired);
+CREATE INDEX IF NOT EXISTS acquisitions_user ON acquisitions (user, acquired);
+CREATE INDEX IF NOT EXISTS acquisitions_open ON acquisitions (place) WHERE released IS NULL;
+CREATE TABLE IF NOT EXISTS reservation_events (
+    id INTEGER PRIMARY KEY,
+    token TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    event TEXT NOT NULL,
+    places TEXT NOT NULL,
+    time REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reservation_events_token ON reservation_events (token, time);
+CREATE INDEX IF NOT EXISTS reservation_events_owner ON reservation_events (owner, time);
+CREATE TABLE IF NOT EXISTS reservations (
+    token TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+@attr.s(eq=False)
+class HistoryEntry:
+    place = attr.ib()
+    user = attr.ib()
+    tags = attr.ib()
+    acquired = attr.ib()
+    released = attr.ib()
+
+
+@attr.s(eq=False)
+class PlaceUtilization:
+    place = attr.ib()
+    acquisitions = attr.ib()
+    acquired_seconds = attr.ib()
+
+
+@attr.s(eq=False)
+class History:
+    """Persistent history of place acquisitions and reservation state changes.
+
+    The current state of each reservation is stored as well, so that the
+    coordinator can restore them after a restart. Events are collected in memory and written in a single transaction by
+    write(), which is called from the coordinator's save step in an executor
+    thread. Queries aggregate in SQLite, so the history is never loaded
+    into memory as a whole.
+    """
+
+    path = attr.ib(validator=attr.validators.instance_of(str))
+    pending = attr.ib(init=False, default=attr.Factory(list))
+
+    def __attrs_post_init__(self):
+        with connect(self.path) as conn:
+            conn.executescript(SCHEMA)
+            # the coordinator does not keep places acquired over restarts
+            closed = conn.execute(
+                "UPDATE acquisitions SET released = ? WHERE released IS NULL", (time.time(),)
+            ).rowcount
+        conn.close()
+        if closed:
+            logging.info("closed %s acquisitions left open by a previous coordinator run", closed)
+
+    def record_acquire(self, place, user, tags, timestamp=None):
+        self.pending.append(
+            (
+                "INSERT INTO acquisitions (place, user, tags, acquired) VALUES (?, ?, ?, ?)",
+                (place, user, json.dumps(tags, sort_keys=True), timestamp or time.time()),
+            )
+        )
+
+    def record_release(self, place, timestamp=None):
+        self.pending.append(
+            (
+                "UPDATE acquisitions SET released = ? WHERE place = ? AND released IS NULL",
+                (timestamp or time.time(), place),
+            )
+        )
+
+    def record_reservation(self, token, owner, event, places=(), timestamp=None):
+        self.pending.append(
+            (
+                "INSERT INTO reservation_events (token, owner, event, places, time) VALUES (?, ?, ?, ?, ?)",
+                (token, owner, event, json.dumps(sorted(places)), timestamp or time.time()),
+            )
+        )
+
+    def record_reservation_state(self, token, data):
+        """Store the current state of a reservation, or remove it if data is None."""
+        if data is None:
+            self.pending.append(("DELETE FROM reservations WHERE token = ?", (token,)))
+            return
+        self.pending.append(
+            (
+                "INSERT OR REPLACE INTO reservations (token, data) VALUES (?, ?)",
+                (token, json.dumps(data, sort_keys=True)),
+            )
+        )
+
+    def get_reservations(self):
+        """Return the stored reservation states as a dictionary of token -> data."""
+        conn = connect(self.path)
+        try:
+            rows = conn.execute("SELECT token, data FROM reservations ORDER BY token").fetchall()
+        finally:
+            conn.close()
+        return {row["token"]: json.loads(row["data"]) for row in rows}
+
+    def take_pending(self):
+        """Return the pending statements and reset the list of pending statements."""
+        pending, self.pending = self.pending, []
+        return pending
+
+    def write(self, statements):
+        """Execute the given statements in a single transaction."""
+        if not statements:
+            return
+        conn = connect(self.path)
+        try:
+            with conn:
+                for sql, params in statements:
+                    conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _filter(*, place=None, user=None, tags=None, since=None, until=None, now=None):
+        conditions = []
+        params = []
+        if place is not None:
+            conditions.append("place = ?")
+            params.append(place)
+        if user is not None:
+            conditions.append("user = ?")
+            params.append(user)
+        for key, value in (tags or {}).items():
+            conditions.append("json_extract(tags, ?) = ?")
+            params.extend([f'$."{key}"', value])
+        if until is not None:
+            conditions.append("acquired < ?")
+            params.append(until)
+        if since is not None:
+            conditions.append("COALESCE(released, ?) > ?")
+            params.extend([now, since])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def get_entries(self, *, place=None, user=None, tags=None, since=None, until=None, limit=100):
+        """Return the acquisitions overlapping the time range, newest first."""
+        where, params = self._filter(place=place, user=user, tags=tags, since=since, until=until, now=time.time())
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                f"SELECT place, user, tags, acquired, released FROM acquisitions {where} "
+                "ORDER BY acquired DESC LIMIT ?",
+                params + [limit],
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            HistoryEntry(row["place"], row["user"], json.loads(row["tags"]), row["acquired"], row["released"])
+            for row in rows
+        ]
+
+    def get_utilization(self, *, since, until, place=None, user=None, tags=None):
+        """Return the number of acquisitions and the acquired time per place within the time range."""
+        now = time.time()
+        where, params = self._filter(place=place, user=user, tags=tags, since=since, until=until, now=now)
+        conn = connect(self.path)
+        try:
+            rows = conn.execute(
+                "SELECT place, COUNT(*) AS acquisitions, "
+                "SUM(MIN(COALESCE(released, ?), ?) - MAX(acquired, ?)) AS acquired_seconds "
+                f"FROM acquisitions {where} GROUP BY place ORDER BY place",
+                [now, until, since] + params,
+            ).fetchall()
+        finally:
+            conn.close()
+        return [PlaceUtilization(row["place"], row["acquisitions"], row["acquired_seconds"]) for row in rows]
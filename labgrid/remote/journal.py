@@ -0,0 +1,98 @@
+"""
+This module contains the append-only journal used by the coordinator to persist
+place changes between full snapshots.
+"""
+
+import json
+import logging
+import os
+
+import attr
+
+
+@attr.s(eq=False)
+class Journal:
+    """Append-only log of place changes.
+
+    Each entry contains the complete state of a single place (or its
+    deletion), so replaying any prefix of the journal on top of a snapshot
+    taken later results in the state of that snapshot.
+    This allows the coordinator to write only the changed places on each
+    save and rewrite the full snapshot only when compacting.
+    Resources are not journalled, as they are not restored on startup but sent
+    again by the exporters.
+    """
+
+    path = attr.ib(validator=attr.validators.instance_of(str))
+    compact_threshold = attr.ib(default=1000, validator=attr.validators.instance_of(int))
+    pending = attr.ib(init=False, default=attr.Factory(list))
+    written = attr.ib(init=False, default=0)
+
+    def record_place(self, name, data):
+        self.pending.append(json.dumps({"place": name, "data": data}))
+
+    def record_place_deleted(self, name):
+        self.pending.append(json.dumps({"place": name, "data": None}))
+
+    def take_pending(self):
+        """Return the pending entries and reset the list of pending entries."""
+        pending, self.pending = self.pending, []
+        return pending
+
+    def needs_compaction(self, count=0):
+        """Return True if the journal should be compacted after writing count additional entries."""
+        return self.written + count >= self.compact_threshold
+
+    def append(self, entries):
+        """Append the given entries to the journal file."""
+        if not entries:
+            return
+        data = "".join(entry + "\n" for entry in entries).encode()
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.written += len(entries)
+
+    def reset(self):
+        """Truncate the journal after the state has been written to a snapshot."""
+        with open(self.path, "wb") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self.written = 0
+
+    def read(self):
+        """Yield the decoded entries from the journal file.
+
+        An incomplete last entry (caused by a crash during writing) is skipped.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return
+
+        self.written = 0
+        for index, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                if index == len(lines) - 1:
+                    logging.warning("ignoring incomplete last entry in journal %s", self.path)
+                    break
+                raise
+            self.written += 1
+            yield entry
+
+    def replay_places(self, places):
+        """Apply the place entries from the journal to the given dict of place configs."""
+        for entry in self.read():
+            if "place" not in entry:
+                continue
+            if entry["data"] is None:
+                places.pop(entry["place"], None)
+            else:
+                places[entry["place"]] = entry["data"]
+        return places
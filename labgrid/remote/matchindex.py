@@ -0,0 +1,168 @@
+"""
+This module contains the index used by the coordinator to find the places
+matching a resource (and vice versa) without checking every ResourceMatch
+of every place.
+"""
+
+import re
+from collections import defaultdict
+from fnmatch import translate
+
+import attr
+
+WILDCARD = re.compile(r"[*?[]")
+
+
+def _compile(pattern):
+    if pattern is None:
+        return None
+    if not WILDCARD.search(pattern):
+        return pattern
+    return re.compile(translate(pattern)).match
+
+
+def _field_matches(matcher, value):
+    if isinstance(matcher, str):
+        return matcher == value
+    return matcher(value) is not None
+
+
+@attr.s(eq=False)
+class CompiledMatch:
+    """A ResourceMatch with precompiled patterns for the wildcard fields."""
+
+    exporter = attr.ib()
+    group = attr.ib()
+    cls = attr.ib()
+    name = attr.ib()
+
+    @classmethod
+    def from_match(cls, match):
+        # an empty name matches all resource names, like None
+        name = _compile(match.name or None)
+        return cls(_compile(match.exporter), _compile(match.group), _compile(match.cls), name)
+
+    @property
+    def exact(self):
+        """Return the path key if no field contains a wildcard, None otherwise."""
+        fields = (self.exporter, self.group, self.cls, self.name)
+        if all(field is None or isinstance(field, str) for field in fields):
+            return fields
+        return None
+
+    def ismatch(self, resource_path):
+        """Same semantics as ResourceMatch.ismatch(), for a (exporter, group, cls, name) path."""
+        exporter, group, cls, name = resource_path
+        if not _field_matches(self.exporter, exporter):
+            return False
+        if not _field_matches(self.group, group):
+            return False
+        if not _field_matches(self.cls, cls):
+            return False
+        if name and self.name and not _field_matches(self.name, name):
+            return False
+        return True
+
+
+@attr.s(eq=False)
+class MatchIndex:
+    """Maintains the mapping between resource paths and the places matching them.
+
+    Matches without wildcards are looked up directly by their path, so only
+    the wildcard matches need to be checked against each new resource.
+    A resource path has the structure (exporter, group, cls, name).
+    """
+
+    resources = attr.ib(init=False, default=attr.Factory(dict))
+    prefixes = attr.ib(init=False, default=attr.Factory(lambda: defaultdict(set)))
+    exact = attr.ib(init=False, default=attr.Factory(lambda: defaultdict(set)))
+    wildcard = attr.ib(init=False, default=attr.Factory(dict))
+    place_keys = attr.ib(init=False, default=attr.Factory(dict))
+    resource_places = attr.ib(init=False, default=attr.Factory(lambda: defaultdict(set)))
+    place_resources = attr.ib(init=False, default=attr.Factory(lambda: defaultdict(set)))
+
+    def _match_resource(self, path):
+        exporter, group, cls, name = path
+        places = set()
+        places |= self.exact.get((exporter, group, cls, name), set())
+        places |= self.exact.get((exporter, group, cls, None), set())
+        for place_name, matches in self.wildcard.items():
+            if place_name in places:
+                continue
+            if any(match.ismatch(path) for match in matches):
+                places.add(place_name)
+        return places
+
+    def add_resource(self, path, resource):
+        """Add a resource to the index."""
+        assert len(path) == 4
+        self.remove_resource(path)
+        self.resources[path] = resource
+        self.prefixes[path[:3]].add(path)
+        for place_name in self._match_resource(path):
+            self.resource_places[path].add(place_name)
+            self.place_resources[place_name].add(path)
+
+    def remove_resource(self, path):
+        """Remove a resource from the index."""
+        if path in self.resources:
+            del self.resources[path]
+            self.prefixes[path[:3]].discard(path)
+            if not self.prefixes[path[:3]]:
+                del self.prefixes[path[:3]]
+        for place_name in self.resource_places.pop(path, set()):
+            self.place_resources[place_name].discard(path)
+
+    def update_place(self, place):
+        """Add a place to the index or update it after its matches were changed."""
+        self.remove_place(place.name)
+
+        keys = set()
+        wildcard = []
+        for match in place.matches:
+            compiled = CompiledMatch.from_match(match)
+            key = compiled.exact
+            if key is None:
+                wildcard.append(compiled)
+            else:
+                keys.add(key)
+        for key in keys:
+            self.exact[key].add(place.name)
+        self.place_keys[place.name] = keys
+        if wildcard:
+            self.wildcard[place.name] = wildcard
+
+        matched = set()
+        for key in keys:
+            if key[3] is not None:
+                if key in self.resources:
+                    matched.add(key)
+            else:
+                # exact matches without a name match all resource names
+                matched |= self.prefixes.get(key[:3], set())
+        if wildcard:
+            for path in self.resources:
+                if path not in matched and any(match.ismatch(path) for match in wildcard):
+                    matched.add(path)
+        self.place_resources[place.name] = matched
+        for path in matched:
+            self.resource_places[path].add(place.name)
+
+    def remove_place(self, place_name):
+        """Remove a place from the index."""
+        for key in self.place_keys.pop(place_name, set()):
+            self.exact[key].discard(place_name)
+            if not self.exact[key]:
+                del self.exact[key]
+        self.wildcard.pop(place_name, None)
+        for path in self.place_resources.pop(place_name, set()):
+            self.resource_places[path].discard(place_name)
+
+    def get_places(self, path):
+        """Return the names of the places matching the resource path."""
+        return self.resource_places.get(path, set())
+
+    def get_resources(self, place_name):
+        """Return the resources matching the place, sorted by their path."""
+        paths = self.place_resources.get(place_name, set())
+        return [self.resources[path] for path in sorted(paths)]
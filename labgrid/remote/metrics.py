@@ -0,0 +1,307 @@
+"""
+This module contains a minimal implementation of Prometheus metrics, used by
+the coordinator to expose its internal state in the text exposition format.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+import attr
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+@attr.s(eq=False)
+class Metric:
+    """Base class for metrics with an optional set of label names.
+
+    Metrics without labels are used directly, metrics with labels via the
+    child returned by labels().
+    """
+
+    type = None
+
+    name = attr.ib(validator=attr.validators.instance_of(str))
+    documentation = attr.ib(validator=attr.validators.instance_of(str))
+    labelnames = attr.ib(default=(), converter=tuple)
+    children = attr.ib(init=False, default=attr.Factory(dict))
+
+    def labels(self, *values):
+        """Return the child for the given label values, creating it if needed."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        values = tuple(str(value) for value in values)
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = self._create_child()
+        return child
+
+    def _create_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels, use labels() first")
+        return self.labels()
+
+    def _samples(self):
+        for values, child in self.children.items():
+            yield from child.samples(self.name, self.labelnames, values)
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for name, labels, value in self._samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return lines
+
+
+@attr.s(eq=False)
+class _CounterChild:
+    value = attr.ib(default=0.0)
+
+    def inc(self, amount=1.0):
+        if amount < 0:
+            raise ValueError("counters can only be increased")
+        self.value += amount
+
+    def samples(self, name, labelnames, values):
+        yield f"{name}_total", _format_labels(labelnames, values), self.value
+
+
+@attr.s(eq=False)
+class Counter(Metric):
+    """Monotonically increasing value, exposed with the _total suffix."""
+
+    type = "counter"
+
+    def _create_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1.0):
+        self._default().inc(amount)
+
+
+@attr.s(eq=False)
+class _GaugeChild:
+    value = attr.ib(default=0.0)
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1.0):
+        self.value += amount
+
+    def dec(self, amount=1.0):
+        self.value -= amount
+
+    def samples(self, name, labelnames, values):
+        yield name, _format_labels(labelnames, values), self.value
+
+
+@attr.s(eq=False)
+class Gauge(Metric):
+    """Value which can go up and down.
+
+    If a callback is given, it is called on each collection and returns the
+    value (or a dict of label value tuples to values for gauges with labels).
+    """
+
+    type = "gauge"
+
+    callback = attr.ib(default=None, kw_only=True)
+
+    def _create_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default().set(value)
+
+    def inc(self, amount=1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount=1.0):
+        self._default().dec(amount)
+
+    def _samples(self):
+        if self.callback is None:
+            yield from super()._samples()
+            return
+        values = self.callback()
+        if not self.labelnames:
+            values = {(): values}
+        for labelvalues, value in values.items():
+            yield self.name, _format_labels(self.labelnames, labelvalues), value
+
+
+@attr.s(eq=False)
+class _HistogramChild:
+    buckets = attr.ib()
+    counts = attr.ib(init=False)
+    sum = attr.ib(init=False, default=0.0)
+    count = attr.ib(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self):
+        """Observe the duration of the with block."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(time.monotonic() - start)
+
+    def samples(self, name, labelnames, values):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f"{name}_bucket", _format_labels(labelnames, values, [("le", _format_value(bound))]), cumulative
+        yield f"{name}_bucket", _format_labels(labelnames, values, [("le", "+Inf")]), self.count
+        yield f"{name}_sum", _format_labels(labelnames, values), self.sum
+        yield f"{name}_count", _format_labels(labelnames, values), self.count
+
+
+@attr.s(eq=False)
+class Histogram(Metric):
+    """Distribution of observed values (usually durations in seconds)."""
+
+    type = "histogram"
+
+    buckets = attr.ib(default=DEFAULT_BUCKETS, converter=lambda b: tuple(sorted(float(x) for x in b)), kw_only=True)
+
+    def _create_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+@attr.s(eq=False)
+class Registry:
+    """Collection of metrics, exposed in the Prometheus text format."""
+
+    metrics = attr.ib(init=False, default=attr.Factory(dict))
+
+    def _add(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=(), *, callback=None):
+        return self._add(Gauge(name, documentation, labelnames, callback=callback))
+
+    def histogram(self, name, documentation, labelnames=(), *, buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def expose(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics.values():
+            try:
+                lines.extend(metric.expose())
+            except Exception:  # pylint: disable=broad-except
+                logging.exception("failed to collect metric %s", metric.name)
+        return "\n".join(lines) + "\n"
+
+
+@attr.s(eq=False)
+class TimedLock:
+    """asyncio.Lock wrapper which records the time spent waiting for and holding the lock."""
+
+    wait_time = attr.ib()
+    hold_time = attr.ib()
+    lock = attr.ib(init=False, default=attr.Factory(asyncio.Lock))
+    acquired_at = attr.ib(init=False, default=None)
+
+    def locked(self):
+        return self.lock.locked()
+
+    async def acquire(self):
+        start = time.monotonic()
+        await self.lock.acquire()
+        self.acquired_at = time.monotonic()
+        self.wait_time.observe(self.acquired_at - start)
+        return True
+
+    def release(self):
+        self.hold_time.observe(time.monotonic() - self.acquired_at)
+        self.lock.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+async def serve_metrics(registry, host, port):
+    """Start an HTTP server on host:port returning the registry's metrics for GET /metrics.
+
+    Returns the asyncio.Server.
+    """
+
+    async def handle(reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+            method, _, rest = request.decode("latin-1").partition(" ")
+            path = rest.partition(" ")[0].partition("?")[0]
+            if method != "GET":
+                status, body = "405 Method Not Allowed", "method not allowed\n"
+            elif path not in ("/", "/metrics"):
+                status, body = "404 Not Found", "not found\n"
+            else:
+                status, body = "200 OK", registry.expose()
+            body = body.encode()
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n"
+                "\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
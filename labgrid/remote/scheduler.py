@@ -1,4 +1,4 @@
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
 
 import attr
 
@@ -46,6 +46,93 @@ def schedule_overlaps(places, filters):
     return allocation
 
 
+def build_tag_index(places):
+    "Return a dictionary mapping each tag to the places having it."
+    index = defaultdict(set)
+    for place in places:
+        for tag in place.tags:
+            index[tag].add(place)
+    return index
+
+
+def find_candidates(f, places, index, positions):
+    "Return the places matching all tags of the filter, in the order of places."
+    candidates = None
+    # start with the least common tag
+    for tag in sorted(f.tags, key=lambda tag: len(index.get(tag, ()))):
+        tagged = index.get(tag, set())
+        candidates = tagged.copy() if candidates is None else candidates & tagged
+        if not candidates:
+            return []
+    if candidates is None:
+        return list(places)
+    return sorted(candidates, key=positions.__getitem__)
+
+
+def schedule_matching(places, filters):
+    """Allocate places to filters using a maximum bipartite matching.
+
+    The filters are handled in the given order (highest priority first).
+    For each filter, an augmenting path is searched, which may move earlier
+    filters to other matching places, but never removes their allocation.
+    This results in a maximum matching, where a filter is only left
+    unallocated if it cannot be allocated without removing the allocation
+    of a filter with higher priority.
+    """
+    index = build_tag_index(places)
+    positions = {place: position for position, place in enumerate(places)}
+    candidates = {}
+    allocation = {}  # filter -> place
+    allocated = {}  # place -> filter
+    for f in filters:
+        candidates[f] = find_candidates(f, places, index, positions)
+        if not candidates[f]:
+            continue
+
+        # breadth first search for the shortest augmenting path
+        parent = {}  # place -> filter which would take it
+        queue = deque([f])
+        found = None
+        while queue and found is None:
+            current = queue.popleft()
+            for place in candidates[current]:
+                if place in parent:
+                    continue
+                parent[place] = current
+                if place not in allocated:
+                    found = place
+                    break
+                queue.append(allocated[place])
+
+        # move the filters along the path
+        place = found
+        while place is not None:
+            current = parent[place]
+            previous = allocation.get(current)
+            allocation[current] = place
+            allocated[place] = current
+            place = previous
+
+    return allocation
+
+
+def fair_share(filters, owners, usage=None):
+    """Reorder the filters so that their owners are served round-robin.
+
+    owners maps each filter name to its owner and usage maps owners to the
+    number of places they already have allocated.
+    The filters should have the same priority, their relative order per owner
+    is kept.
+    """
+    usage = Counter(usage or {})
+    ranked = []
+    for position, f in enumerate(filters):
+        owner = owners[f.name]
+        ranked.append((usage[owner], position, f))
+        usage[owner] += 1
+    return [f for _, _, f in sorted(ranked, key=lambda x: x[:2])]
+
+
 def schedule(places, filters):
-    allocation = schedule_overlaps(places, filters)
+    allocation = schedule_matching(places, filters)
     return {f.name: p.name for f, p in allocation.items()}
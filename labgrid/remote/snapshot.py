@@ -0,0 +1,354 @@
+"""
+This module contains the formats used by the coordinator to write full
+snapshots of its places and resources, and a tool to convert between them.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+
+import attr
+
+from ..util import atomic_replace, yaml
+from .common import Place, ResourceEntry, ResourceMatch
+from .generated import labgrid_coordinator_pb2
+
+
+@attr.s(eq=False)
+class SnapshotFormat:
+    """Base class for snapshot formats.
+
+    Places are represented as a dict of place name to the place's asdict()
+    config, resources as nested dicts of exporter, group and resource name to
+    the resource's asdict() data.
+    """
+
+    name = None
+    suffix = None
+    supports_history = False
+
+    directory = attr.ib(default="", validator=attr.validators.instance_of(str))
+
+    @property
+    def places_path(self):
+        return os.path.join(self.directory, f"places.{self.suffix}")
+
+    @property
+    def resources_path(self):
+        return os.path.join(self.directory, f"resources.{self.suffix}")
+
+    def exists(self):
+        return os.path.exists(self.places_path)
+
+    def dump_places(self, places):
+        raise NotImplementedError
+
+    def load_places(self, data):
+        raise NotImplementedError
+
+    def dump_resources(self, resources):
+        raise NotImplementedError
+
+    def load_resources(self, data):
+        raise NotImplementedError
+
+    def read_places(self):
+        """Return the places from the snapshot, or an empty dict if there is none."""
+        try:
+            with open(self.places_path, "rb") as f:
+                return self.load_places(f.read())
+        except FileNotFoundError:
+            return {}
+
+    def read_resources(self):
+        """Return the resources from the snapshot, or an empty dict if there is none."""
+        try:
+            with open(self.resources_path, "rb") as f:
+                return self.load_resources(f.read())
+        except FileNotFoundError:
+            return {}
+
+    def write(self, resources, places):
+        atomic_replace(self.resources_path, self.dump_resources(resources))
+        atomic_replace(self.places_path, self.dump_places(places))
+
+
+@attr.s(eq=False)
+class YAMLSnapshot(SnapshotFormat):
+    """Human-readable snapshots in places.yaml and resources.yaml (the default)."""
+
+    name = "yaml"
+    suffix = "yaml"
+
+    def dump_places(self, places):
+        return yaml.dump(places).encode()
+
+    def load_places(self, data):
+        return yaml.load(data.decode()) or {}
+
+    def dump_resources(self, resources):
+        return yaml.dump(resources).encode()
+
+    def load_resources(self, data):
+        return yaml.load(data.decode()) or {}
+
+
+@attr.s(eq=False)
+class ProtobufSnapshot(SnapshotFormat):
+    """Binary snapshots in places.pb and resources.pb, using the Snapshot message.
+
+    Parsing and serializing is implemented in the protobuf C extension, so
+    this is much faster than YAML for large labs.
+    """
+
+    name = "protobuf"
+    suffix = "pb"
+
+    def dump_places(self, places):
+        snapshot = labgrid_coordinator_pb2.Snapshot()
+        for name, config in places.items():
+            config = config.copy()
+            acquired_resources = config.pop("acquired_resources", [])
+            config["matches"] = [ResourceMatch(**match) for match in config["matches"]]
+            place_pb2 = snapshot.places.add()
+            place_pb2.CopyFrom(Place(name=name, **config).as_pb2())
+            place_pb2.acquired_resources.extend("/".join(path) for path in acquired_resources)
+        return snapshot.SerializeToString()
+
+    def load_places(self, data):
+        snapshot = labgrid_coordinator_pb2.Snapshot.FromString(data)
+        return {place_pb2.name: Place.from_pb2(place_pb2).asdict() for place_pb2 in snapshot.places}
+
+    def dump_resources(self, resources):
+        snapshot = labgrid_coordinator_pb2.Snapshot()
+        for exporter, groups in resources.items():
+            for group_name, group in groups.items():
+                for resource_name, data in group.items():
+                    resource_pb2 = snapshot.resources.add()
+                    resource_pb2.CopyFrom(ResourceEntry(data).as_pb2())
+                    resource_pb2.path.exporter_name = exporter
+                    resource_pb2.path.group_name = group_name
+                    resource_pb2.path.resource_name = resource_name
+        return snapshot.SerializeToString()
+
+    def load_resources(self, data):
+        snapshot = labgrid_coordinator_pb2.Snapshot.FromString(data)
+        resources = {}
+        for resource_pb2 in snapshot.resources:
+            path = resource_pb2.path
+            group = resources.setdefault(path.exporter_name, {}).setdefault(path.group_name, {})
+            group[path.resource_name] = ResourceEntry.data_from_pb2(resource_pb2)
+        return resources
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS places (
+    name TEXT PRIMARY KEY,
+    comment TEXT NOT NULL,
+    acquired TEXT,
+    acquired_resources TEXT NOT NULL,
+    allowed TEXT NOT NULL,
+    created REAL NOT NULL,
+    changed REAL NOT NULL,
+    reservation TEXT
+);
+CREATE TABLE IF NOT EXISTS place_aliases (
+    place TEXT NOT NULL REFERENCES places (name) ON DELETE CASCADE,
+    alias TEXT NOT NULL,
+    PRIMARY KEY (place, alias)
+);
+CREATE TABLE IF NOT EXISTS place_tags (
+    place TEXT NOT NULL REFERENCES places (name) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (place, key)
+);
+CREATE INDEX IF NOT EXISTS place_tags_key ON place_tags (key, value);
+CREATE TABLE IF NOT EXISTS place_matches (
+    place TEXT NOT NULL REFERENCES places (name) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    exporter TEXT NOT NULL,
+    "group" TEXT NOT NULL,
+    cls TEXT NOT NULL,
+    name TEXT,
+    rename TEXT,
+    PRIMARY KEY (place, position)
+);
+CREATE TABLE IF NOT EXISTS resources (
+    exporter TEXT NOT NULL,
+    "group" TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (exporter, "group", name)
+);
+"""
+
+
+@attr.s(eq=False)
+class SQLiteSnapshot(SnapshotFormat):
+    """Snapshots in the tables of the SQLite database coordinator.sqlite.
+
+    Each snapshot is written in a single transaction.
+    The same database contains the history of place acquisitions and
+    reservations (see labgrid.remote.history).
+    """
+
+    name = "sqlite"
+    suffix = "sqlite"
+    supports_history = True
+
+    @property
+    def places_path(self):
+        return os.path.join(self.directory, "coordinator.sqlite")
+
+    @property
+    def resources_path(self):
+        return self.places_path
+
+    def exists(self):
+        if not os.path.exists(self.places_path):
+            return False
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT EXISTS (SELECT 1 FROM places)").fetchone()[0] == 1
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.places_path, timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript(SQLITE_SCHEMA)
+        return conn
+
+    def read_places(self):
+        if not os.path.exists(self.places_path):
+            return {}
+        conn = self._connect()
+        try:
+            places = {}
+            for row in conn.execute("SELECT * FROM places ORDER BY name"):
+                name, comment, acquired, acquired_resources, allowed, created, changed, reservation = row
+                places[name] = {
+                    "aliases": [],
+                    "comment": comment,
+                    "tags": {},
+                    "matches": [],
+                    "acquired": acquired,
+                    "acquired_resources": json.loads(acquired_resources),
+                    "allowed": json.loads(allowed),
+                    "created": created,
+                    "changed": changed,
+                    "reservation": reservation,
+                }
+            for place, alias in conn.execute("SELECT place, alias FROM place_aliases"):
+                places[place]["aliases"].append(alias)
+            for place, key, value in conn.execute("SELECT place, key, value FROM place_tags"):
+                places[place]["tags"][key] = value
+            for place, exporter, group, cls, name, rename in conn.execute(
+                'SELECT place, exporter, "group", cls, name, rename FROM place_matches ORDER BY place, position'
+            ):
+                places[place]["matches"].append(
+                    {"exporter": exporter, "group": group, "cls": cls, "name": name, "rename": rename}
+                )
+            return places
+        finally:
+            conn.close()
+
+    def read_resources(self):
+        if not os.path.exists(self.resources_path):
+            return {}
+        conn = self._connect()
+        try:
+            resources = {}
+            for exporter, group, name, data in conn.execute('SELECT exporter, "group", name, data FROM resources'):
+                resources.setdefault(exporter, {}).setdefault(group, {})[name] = json.loads(data)
+            return resources
+        finally:
+            conn.close()
+
+    def write(self, resources, places):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM places")
+                conn.execute("DELETE FROM resources")
+                conn.executemany(
+                    "INSERT INTO places VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            name,
+                            config["comment"],
+                            config["acquired"],
+                            json.dumps([list(path) for path in config["acquired_resources"]]),
+                            json.dumps(sorted(config["allowed"])),
+                            config["created"],
+                            config["changed"],
+                            config["reservation"],
+                        )
+                        for name, config in places.items()
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO place_aliases VALUES (?, ?)",
+                    ((name, alias) for name, config in places.items() for alias in config["aliases"]),
+                )
+                conn.executemany(
+                    "INSERT INTO place_tags VALUES (?, ?, ?)",
+                    ((name, k, v) for name, config in places.items() for k, v in config["tags"].items()),
+                )
+                conn.executemany(
+                    "INSERT INTO place_matches VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (name, i, m["exporter"], m["group"], m["cls"], m["name"], m["rename"])
+                        for name, config in places.items()
+                        for i, m in enumerate(config["matches"])
+                    ),
+                )
+                conn.executemany(
+                    "INSERT INTO resources VALUES (?, ?, ?, ?)",
+                    (
+                        (exporter, group_name, name, json.dumps(data))
+                        for exporter, groups in resources.items()
+                        for group_name, group in groups.items()
+                        for name, data in group.items()
+                    ),
+                )
+        finally:
+            conn.close()
+
+
+SNAPSHOT_FORMATS = {cls.name: cls for cls in (YAMLSnapshot, ProtobufSnapshot, SQLiteSnapshot)}
+
+
+def get_snapshot_format(name, directory=""):
+    try:
+        return SNAPSHOT_FORMATS[name](directory)
+    except KeyError:
+        raise ValueError(f"unknown snapshot format {name}, available: {', '.join(SNAPSHOT_FORMATS)}") from None
+
+
+def convert(source, target):
+    """Write the places and resources from the source snapshot to the target snapshot."""
+    target.write(source.read_resources(), source.read_places())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="convert coordinator snapshots between formats")
+    parser.add_argument(
+        "-d", "--directory", default=".", help="coordinator working directory (default: current directory)"
+    )
+    parser.add_argument("source", choices=SNAPSHOT_FORMATS.keys(), help="format to read")
+    parser.add_argument("target", choices=SNAPSHOT_FORMATS.keys(), help="format to write")
+    args = parser.parse_args()
+
+    source = get_snapshot_format(args.source, args.directory)
+    target = get_snapshot_format(args.target, args.directory)
+    if not source.exists():
+        parser.error(f"{source.places_path} does not exist")
+    convert(source, target)
+    print(f"converted {source.places_path} to {target.places_path}")
+
+
+if __name__ == "__main__":
+    main()
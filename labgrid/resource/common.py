@@ -132,12 +132,31 @@ class ResourceManager:
         self.resources.append(resource)
         self.on_resource_added(resource)
 
+    def _remove_resource(self, resource: 'ManagedResource'):
+        self.resources.remove(resource)
+        self.on_resource_removed(resource)
+
     def on_resource_added(self, resource: 'ManagedResource'):
         pass
 
+    def on_resource_removed(self, resource: 'ManagedResource'):
+        pass
+
     def poll(self):
         pass
 
+    def has_pending_events(self):
+        """Return True if events are queued which the next poll() would handle."""
+        return False
+
+    def attach_loop(self, loop, callback):
+        """Handle events directly in the asyncio loop, calling callback with the
+        list of changed resources after each batch of events.
+
+        Managers which don't support this continue to be polled.
+        """
+        pass
+
 
 @attr.s(eq=False)
 class ManagedResource(Resource):
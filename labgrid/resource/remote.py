@@ -16,13 +16,13 @@ class RemotePlaceManager(ResourceManager):
         self.ready = None
         self.unmanaged_resources = []
 
-    def _start(self):
+    def _start(self, place_name):
         if self.session:
             return
 
         from ..remote.client import start_session
         try:
-            self.session = start_session(self.url, extra={'env': self.env})
+            self.session = start_session(self.url, extra={'env': self.env, 'place_filter': [place_name]})
         except ConnectionRefusedError as e:
             raise ConnectionRefusedError(f"Could not connect to coordinator {self.url}") \
                 from e
@@ -42,7 +42,9 @@ class RemotePlaceManager(ResourceManager):
             if self.env:
                 config = self.env.config
                 self.url = config.get_option("coordinator_address", self.url)
-            self._start()
+            self._start(remote_place.name)
+        elif not self.loop.is_running():
+            self.loop.run_until_complete(self.session.subscribe_places([remote_place.name]))
         place = self.session.get_place(remote_place.name)  # pylint: disable=no-member
         resource_entries = self.session.get_target_resources(place)  # pylint: disable=no-member
         expanded = []
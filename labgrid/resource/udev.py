@@ -1,7 +1,9 @@
 import queue
 import warnings
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from functools import partial
 from importlib import import_module
+from itertools import count
 
 import attr
 
@@ -11,40 +13,201 @@ from .base import SerialPort, NetworkInterface
 from ..util import Timeout
 
 
+@attr.s(eq=False)
+class UdevIndex:
+    """Index of udev resources, used to find the resources which may match a udev event.
+
+    Each resource is indexed by the value of the first of the index keys
+    contained in its match (without '@'). These are udev properties, so they
+    can be looked up cheaply for each event, instead of calling try_match()
+    on every resource.
+    Resources which already have a device are also indexed by its sys_path,
+    as they only handle events for that device.
+    """
+    keys = ('ID_PATH', 'ID_SERIAL_SHORT', 'ID_SERIAL', 'ID_MODEL_ID', 'ID_VENDOR_ID', 'SUBSYSTEM')
+
+    def __attrs_post_init__(self):
+        self._order = {}
+        self._counter = count()
+        self._by_key = {key: defaultdict(list) for key in self.keys}
+        self._unkeyed = []
+        self._sys_paths = {}
+        self._by_sys_path = defaultdict(list)
+
+    def _get_key(self, resource):
+        for key in self.keys:
+            if key in resource.match:
+                return key, resource.match[key]
+        return None, None
+
+    def add(self, resource):
+        self._order[resource] = next(self._counter)
+        key, value = self._get_key(resource)
+        if key is None:
+            self._unkeyed.append(resource)
+        else:
+            self._by_key[key][value].append(resource)
+        self.update(resource)
+
+    def remove(self, resource):
+        del self._order[resource]
+        key, value = self._get_key(resource)
+        if key is None:
+            self._unkeyed.remove(resource)
+        else:
+            self._by_key[key][value].remove(resource)
+        self._remove_sys_path(resource)
+
+    def _remove_sys_path(self, resource):
+        sys_path = self._sys_paths.pop(resource, None)
+        if sys_path is not None:
+            self._by_sys_path[sys_path].remove(resource)
+            if not self._by_sys_path[sys_path]:
+                del self._by_sys_path[sys_path]
+
+    def update(self, resource):
+        """Update the sys_path index after the device of the resource has changed."""
+        sys_path = resource.device.sys_path if resource.device is not None else None
+        if self._sys_paths.get(resource) == sys_path:
+            return
+        self._remove_sys_path(resource)
+        if sys_path is not None:
+            self._sys_paths[resource] = sys_path
+            self._by_sys_path[sys_path].append(resource)
+
+    def candidates(self, device):
+        """Return the resources which may match the device, in the order they were added."""
+        found = set(self._by_sys_path.get(device.sys_path, ()))
+        properties = device.properties
+        for key, index in self._by_key.items():
+            value = properties.get(key)
+            if value is not None and value in index:
+                found.update(index[value])
+        found.update(self._unkeyed)
+        return sorted(found, key=self._order.__getitem__)
+
+
 @attr.s(eq=False)
 class UdevManager(ResourceManager):
     def __attrs_post_init__(self):
         super().__attrs_post_init__()
         self.queue = queue.Queue()
+        self.index = UdevIndex()
+        self._loop = None
+        self._callback = None
+        self._devices = {}
+        # incremented for each event, to detect events during an enumeration
+        self._generations = {}
 
         self._pyudev = import_module('pyudev')
         self._context = self._pyudev.Context()
         self._monitor = self._pyudev.Monitor.from_netlink(self._context)
+        self._start_observer()
+
+    def _start_observer(self):
         self._observer = self._pyudev.MonitorObserver(self._monitor,
                                                 callback=self._insert_into_queue)
         self._observer.start()
 
+    def attach_loop(self, loop, callback):
+        """Read the udev monitor in the asyncio loop instead of the observer thread.
+
+        The events are matched as soon as they are received and callback is
+        called with the list of resources which matched.
+        """
+        if self._loop is not None:
+            return
+        # events already received by the thread stay in the queue
+        self._observer.stop()
+        self._loop = loop
+        self._callback = callback
+        self._monitor.start()
+        loop.add_reader(self._monitor.fileno(), self._read_monitor)
+
+    def detach_loop(self):
+        """Go back to receiving events in the observer thread."""
+        if self._loop is None:
+            return
+        self._loop.remove_reader(self._monitor.fileno())
+        self._loop = None
+        self._callback = None
+        self._start_observer()
+
+    def _read_monitor(self):
+        for device in iter(partial(self._monitor.poll, timeout=0), None):
+            self._insert_into_queue(device)
+        matched = self._handle_events()
+        if matched:
+            self._callback(matched)
+
+    def _list_devices(self, subsystem):
+        """Return the devices of a subsystem, enumerating them only once until
+        an event for that subsystem invalidates the cached list."""
+        devices = self._devices.get(subsystem)
+        if devices is None:
+            generation = self._generations.get(subsystem, 0)
+            devices = list(self._context.list_devices(subsystem=subsystem))
+            # the list may be stale if an event was received in the meantime
+            if self._generations.get(subsystem, 0) == generation:
+                self._devices[subsystem] = devices
+        return devices
+
     def on_resource_added(self, resource):
-        devices = self._context.list_devices()
-        devices.match_subsystem(resource.match['SUBSYSTEM'])
-        for device in devices:
+        self.index.add(resource)
+        for device in self._list_devices(resource.match['SUBSYSTEM']):
             if resource.try_match(device):
+                self.index.update(resource)
                 self.logger.debug(" matched successfully against %s", resource.device)
 
+    def on_resource_removed(self, resource):
+        self.index.remove(resource)
+
     def _insert_into_queue(self, device):
+        subsystem = device.properties.get('SUBSYSTEM')
+        self._generations[subsystem] = self._generations.get(subsystem, 0) + 1
+        self._devices.pop(subsystem, None)
         self.queue.put(device)
 
-    def poll(self):
+    def has_pending_events(self):
+        return not self.queue.empty()
+
+    @staticmethod
+    def _coalesce(devices):
+        """Drop change events which are directly followed by another change
+        event for the same device, as only the latest state is needed."""
+        result = []
+        pending = {}
+        for device in devices:
+            previous = pending.pop(device.sys_path, None)
+            if device.action == 'change':
+                if previous is not None:
+                    result[previous] = None
+                pending[device.sys_path] = len(result)
+            result.append(device)
+        return [device for device in result if device is not None]
+
+    def _handle_events(self):
+        """Match the queued events and return the resources which matched."""
         timeout = Timeout(0.1)
+        devices = []
         while not timeout.expired:
             try:
-                device = self.queue.get(False)
+                devices.append(self.queue.get(False))
             except queue.Empty:
                 break
+        matched = []
+        for device in self._coalesce(devices):
             self.logger.debug("%s: %s", device.action, device)
-            for resource in self.resources:
+            for resource in self.index.candidates(device):
                 if resource.try_match(device):
+                    self.index.update(resource)
                     self.logger.debug(" matched successfully")
+                    if resource not in matched:
+                        matched.append(resource)
+        return matched
+
+    def poll(self):
+        self._handle_events()
 
 @attr.s(eq=False)
 class USBResource(ManagedResource):
@@ -2,7 +2,7 @@ from .atomic import atomic_replace
 from .dict import diff_dict, flat_dict, filter_dict, find_dict
 from .expect import PtxExpect
 from .timeout import Timeout
-from .marker import gen_marker
+from .marker import gen_marker, MarkerMatcher
 from .yaml import load, dump
 from .ssh import sshmanager
 from .helper import get_free_port, get_user, re_vt100
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Command server used by SSHConnection.run().
+
+It is started once per connection and reads JSON requests from stdin, one per
+line. Each request contains a list of commands, which are run one after
+another with the user's shell, the results for all of them are sent back as a
+single line. This script must only depend on the standard library, as it is
+passed to the remote python interpreter on the command line.
+"""
+
+import base64
+import json
+import os
+import subprocess
+import sys
+
+
+def b2s(b):
+    return base64.b85encode(b).decode('ascii')
+
+
+def run(shell, command, stderr_merge):
+    proc = subprocess.run(
+        [shell, '-c', command],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT if stderr_merge else subprocess.PIPE,
+    )
+    returncode = proc.returncode
+    if returncode < 0:
+        # report signals like the shell does
+        returncode = 128 - returncode
+    return {
+        'stdout': b2s(proc.stdout),
+        'stderr': b2s(proc.stderr or b''),
+        'returncode': returncode,
+    }
+
+
+def send(data):
+    sys.stdout.write(json.dumps(data)+'\n')
+    sys.stdout.flush()
+
+
+def main():
+    shell = os.environ.get('SHELL') or '/bin/sh'
+    send({'ready': True})
+    for line in sys.stdin:
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            send({'error': f'request parsing failed for {repr(line)}'})
+            break
+
+        if request.get('close', False):
+            break
+
+        try:
+            results = [run(shell, command, request.get('stderr_merge', False))
+                       for command in request['commands']]
+        except Exception as e:  # pylint: disable=broad-except
+            send({'error': repr(e)})
+            continue
+        send({'results': results})
+
+
+if __name__ == '__main__':
+    main()
@@ -40,4 +40,5 @@ class PtxExpect(pexpect.spawn):
         assert timeout is not None
         if timeout == -1:
             timeout = self.timeout
-        return self.driver.read(size=size, timeout=timeout)
+        read = getattr(self.driver, "_read_expect", self.driver.read)
+        return read(size=size, timeout=timeout)
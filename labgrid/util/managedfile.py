@@ -1,11 +1,15 @@
 import hashlib
+import json
 import logging
 import os
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from importlib import import_module
 
 import attr
 
+from .atomic import atomic_replace
 from .helper import get_user
 from .ssh import sshmanager
 from ..resource.common import Resource, NetworkResource
@@ -16,6 +20,162 @@ class ManagedFileError(Exception):
     pass
 
 
+_hash_cache_lock = threading.Lock()
+_hash_cache_max_entries = 1000
+
+_nfs_stat_format = "inode=%i,size=%s,modified=%Y"
+
+
+def get_hash_cache_path():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "labgrid", "managedfile-hashes.json")
+
+
+def get_remote_cache_size():
+    """Returns the size limit of the user's cache on the remote hosts in MiB
+    from LG_MANAGEDFILE_CACHE_SIZE, or None if the cache is not limited."""
+    size = os.environ.get("LG_MANAGEDFILE_CACHE_SIZE")
+    return int(size) if size else None
+
+
+def _load_hash_cache(path):
+    try:
+        with open(path, 'r') as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def _hash_cache_key(st):
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def _lookup_hash(path, st):
+    """Returns the cached hash of the file at path, if its inode, size and
+    modification time have not changed since it was stored."""
+    with _hash_cache_lock:
+        entry = _load_hash_cache(get_hash_cache_path()).get(path)
+    if isinstance(entry, dict) and entry.get('stat') == _hash_cache_key(st):
+        return entry.get('sha256')
+    return None
+
+
+def _store_hash(path, st, digest):
+    cache_path = get_hash_cache_path()
+    with _hash_cache_lock:
+        entries = _load_hash_cache(cache_path)
+        # re-insert to keep the most recently stored entries
+        entries.pop(path, None)
+        entries[path] = {'stat': _hash_cache_key(st), 'sha256': digest}
+        while len(entries) > _hash_cache_max_entries:
+            del entries[next(iter(entries))]
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            atomic_replace(cache_path, json.dumps(entries).encode('utf-8'))
+        except OSError as e:
+            logging.getLogger("ManagedFile").debug("Failed to update hash cache %s: %s", cache_path, e)
+
+
+def _sync_to_host(host, managed_files):
+    """Synchronises the managed files to a single host.
+
+    The NFS and remote cache checks for all files are run in one batch each,
+    only files which are not yet in the cache are uploaded."""
+    conn = sshmanager.open(host)
+
+    nfs_checks = [mf for mf in managed_files if mf._needs_nfs_check()]
+    if nfs_checks:
+        results = conn.run_batch(
+            [mf._get_nfs_check_command() for mf in nfs_checks],
+            decodeerrors="backslashreplace"
+        )
+        for mf, result in zip(nfs_checks, results):
+            mf._check_nfs(result)
+
+    cached = []
+    for mf in managed_files:
+        if mf._on_nfs_cached:
+            mf.logger.info("File %s is accessible on %s, skipping copy", mf.local_path, host)
+            mf.rpath = os.path.dirname(mf.local_path) + "/"
+        else:
+            cached.append(mf)
+    if not cached:
+        return
+
+    # touch the hash directories to mark them as recently used for the cache eviction
+    results = conn.run_batch([
+        f"touch -c {mf._get_cache_path()} && test -f {mf._get_cache_path()}{os.path.basename(mf.local_path)}"
+        for mf in cached
+    ])
+    for mf, (_, _, exitcode) in zip(cached, results):
+        mf.rpath = mf._get_cache_path()
+        if exitcode == 0:
+            mf.logger.info("File %s is already cached on %s, skipping copy", mf.local_path, host)
+            continue
+        mf.logger.info("Synchronizing %s to %s", mf.local_path, host)
+        conn.run_check(f"mkdir -p {mf.rpath}")
+        conn.put_file(
+            mf.local_path,
+            f"{mf.rpath}{os.path.basename(mf.local_path)}"
+        )
+
+    _evict_remote_cache(conn, cached)
+
+
+def _evict_remote_cache(conn, managed_files):
+    """Removes the least recently used hash directories from the user's cache
+    on the remote host until it is smaller than LG_MANAGEDFILE_CACHE_SIZE,
+    keeping those of the given files."""
+    limit = get_remote_cache_size()
+    if limit is None:
+        return
+
+    cache_path = managed_files[0].get_user_cache_path()
+    keep = " ".join(mf.get_hash() for mf in managed_files)
+    # the hash directory names only consist of hex digits, so word splitting is fine here
+    script = (
+        f'cd {cache_path} 2>/dev/null || exit 0; '
+        f'total=$(du -sk . | cut -f1); '
+        f'for dir in $(ls -dtr -- */ 2>/dev/null); do '
+        f'[ "$total" -le {limit * 1024} ] && break; '
+        f'case " {keep} " in *" ${{dir%/}} "*) continue;; esac; '
+        f'size=$(du -sk "$dir" | cut -f1); '
+        f'rm -rf "$dir" && total=$((total - size)); '
+        f'done'
+    )
+    _, stderr, exitcode = conn.run(script)
+    if exitcode != 0:
+        logging.getLogger("ManagedFile").warning(
+            "Cache eviction on %s failed with exit code %d: %s", conn.host, exitcode, stderr
+        )
+
+
+def sync_to_resources(managed_files):
+    """Synchronises several ManagedFiles to their resources.
+
+    Files are checked in one batch per host and the uploads to different hosts
+    run concurrently.
+
+    Raises:
+        ExecutionError: if the SSH connection/copy fails
+    """
+    hosts = {}
+    for mf in managed_files:
+        if isinstance(mf.resource, NetworkResource):
+            hosts.setdefault(mf.resource.host, []).append(mf)
+        else:
+            mf.sync_to_resource()
+
+    if not hosts:
+        return
+
+    with ThreadPoolExecutor(max_workers=len(hosts)) as executor:
+        futures = [executor.submit(_sync_to_host, host, files) for host, files in hosts.items()]
+        for future in futures:
+            future.result()
+
+
 @attr.s
 class ManagedFile:
     """ The ManagedFile allows the synchronisation of a file to a remote host.
@@ -55,18 +215,7 @@ class ManagedFile:
         if isinstance(self.resource, NetworkResource):
             host = self.resource.host
             conn = sshmanager.open(host)
-
-            if self._on_nfs(conn):
-                self.logger.info("File %s is accessible on %s, skipping copy", self.local_path, host)
-                self.rpath = os.path.dirname(self.local_path) + "/"
-            else:
-                self.rpath = f"{self.get_user_cache_path()}/{self.get_hash()}/"
-                self.logger.info("Synchronizing %s to %s", self.local_path, host)
-                conn.run_check(f"mkdir -p {self.rpath}")
-                conn.put_file(
-                    self.local_path,
-                    f"{self.rpath}{os.path.basename(self.local_path)}"
-                )
+            _sync_to_host(host, [self])
         else:
             self.rpath = os.path.dirname(self.local_path) + "/"
 
@@ -89,15 +238,22 @@ class ManagedFile:
 
 
     def _on_nfs(self, conn):
-        if self._on_nfs_cached is not None:
-            return self._on_nfs_cached
+        if not self._needs_nfs_check():
+            return bool(self._on_nfs_cached)
 
-        if not self.detect_nfs:
-            return False
+        remote = conn.run(self._get_nfs_check_command(), decodeerrors="backslashreplace")
+        return self._check_nfs(remote)
+
+    def _needs_nfs_check(self):
+        return self.detect_nfs and self._on_nfs_cached is None
+
+    def _get_nfs_check_command(self):
+        return f"stat --format '{_nfs_stat_format}' {self.local_path}"
 
+    def _check_nfs(self, remote):
+        """Compares the output of the remote stat command with the local file."""
         self._on_nfs_cached = False
 
-        fmt = "inode=%i,size=%s,modified=%Y"
         # The stat command is very different on MacOs
         platform = import_module('platform')
         if platform.system() == 'Darwin':
@@ -105,15 +261,13 @@ class ManagedFile:
             local = subprocess.run(["stat", "-f", darwin_fmt, self.local_path],
                                    stdout=subprocess.PIPE)
         else:
-            local = subprocess.run(["stat", "--format", fmt, self.local_path],
+            local = subprocess.run(["stat", "--format", _nfs_stat_format, self.local_path],
                                    stdout=subprocess.PIPE)
 
         if local.returncode != 0:
             self.logger.debug("local: stat: unsuccessful error code %d", local.returncode)
             return False
 
-        remote = conn.run(f"stat --format '{fmt}' {self.local_path}",
-                          decodeerrors="backslashreplace")
         if remote[2] != 0:
             self.logger.debug("remote: stat: unsuccessful error code %d", remote[2])
             return False
@@ -152,6 +306,11 @@ class ManagedFile:
             str: SHA256 hexdigest of the file
         """
 
+        if self.hash is not None:
+            return self.hash
+
+        st = os.stat(self.local_path)
+        self.hash = _lookup_hash(self.local_path, st)
         if self.hash is not None:
             return self.hash
 
@@ -161,7 +320,14 @@ class ManagedFile:
                 hasher.update(block)
         self.hash = hasher.hexdigest()
 
+        # only cache the hash if the file was not modified while hashing
+        if _hash_cache_key(os.stat(self.local_path)) == _hash_cache_key(st):
+            _store_hash(self.local_path, st, self.hash)
+
         return self.hash
 
     def get_user_cache_path(self):
         return f"/var/cache/labgrid/{get_user()}"
+
+    def _get_cache_path(self):
+        return f"{self.get_user_cache_path()}/{self.get_hash()}/"
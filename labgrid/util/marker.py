@@ -1,9 +1,121 @@
 import random
+import re
 import string
 
+import attr
+
+from .helper import re_vt100
+
 
 # Remove RID to avoid markers containing substrings like ERROR, FAIL, WARN, INFO or DEBUG
 MARKER_POOL = tuple(c for c in string.ascii_uppercase if c not in 'RID')
 
 def gen_marker():
     return ''.join(random.choice(MARKER_POOL) for i in range(10))
+
+
+@attr.s(eq=False)
+class MarkerMatcher:
+    """
+    Incrementally matches command output framed by two markers, followed by a tail (such as the
+    exit code and the prompt).
+
+    Data is passed to feed() as it arrives, only new data is scanned and the complete output lines
+    are returned as soon as they are found, decoded and with VT100 sequences removed.
+
+    Args:
+        marker (str): marker printed before and after the command output
+        tail (regex): pattern which must match after the second marker
+        codec (str): codec to decode the output lines with
+        decodeerrors (str): how to handle decoding errors
+        marker_line (bool): whether the markers are printed on their own lines
+    """
+    marker = attr.ib(validator=attr.validators.instance_of(str))
+    tail = attr.ib(validator=attr.validators.instance_of(str))
+    codec = attr.ib(default="utf-8", validator=attr.validators.instance_of(str))
+    decodeerrors = attr.ib(default="strict", validator=attr.validators.instance_of(str))
+    marker_line = attr.ib(default=False, validator=attr.validators.instance_of(bool))
+
+    def __attrs_post_init__(self):
+        self._marker = self.marker.encode("ASCII")
+        self._tail = re.compile(self.tail.encode("utf-8"), re.DOTALL)
+        self._buf = bytearray()
+        # position up to which the buffer is known to contain no marker and no newline
+        self._scan = 0
+        self._state = "start"
+        self.match = None
+
+    @property
+    def done(self):
+        return self._state == "done"
+
+    @property
+    def remainder(self):
+        """The data which was not consumed by the matcher"""
+        return bytes(self._buf)
+
+    def _decode(self, line):
+        if line.endswith(b"\r"):
+            line = line[:-1]
+        line = line.decode(self.codec, self.decodeerrors)
+        if "\x1b" in line or "\x9b" in line:
+            line = re_vt100.sub("", line)
+        return line
+
+    def feed(self, data):
+        """
+        Adds data to the matcher and returns the output lines completed by it.
+        """
+        self._buf += data
+        lines = []
+        buf = self._buf
+
+        if self._state == "start":
+            index = buf.find(self._marker, self._scan)
+            if index < 0:
+                del buf[:max(0, len(buf) - len(self._marker) + 1)]
+                self._scan = 0
+                return lines
+            del buf[:index + len(self._marker)]
+            self._scan = 0
+            self._state = "skip" if self.marker_line else "output"
+
+        if self._state == "skip":
+            index = buf.find(b"\n")
+            if index < 0:
+                return lines
+            del buf[:index + 1]
+            self._state = "output"
+
+        if self._state == "output":
+            end = buf.find(self._marker, self._scan)
+            limit = end if end >= 0 else len(buf)
+            start = 0
+            while True:
+                index = buf.find(b"\n", start, limit)
+                if index < 0:
+                    break
+                lines.append(self._decode(bytes(buf[start:index])))
+                start = index + 1
+            if end < 0:
+                del buf[:start]
+                self._scan = max(0, len(buf) - len(self._marker) + 1)
+                return lines
+            # an unterminated last line is part of the output, unless the markers are printed on
+            # their own lines (possibly prefixed with a timestamp)
+            if start < end and not self.marker_line:
+                line = self._decode(bytes(buf[start:end]))
+                if line:
+                    lines.append(line)
+            del buf[:end + len(self._marker)]
+            self._scan = 0
+            self._state = "tail"
+
+        if self._state == "tail":
+            match = self._tail.match(bytes(buf))
+            if match:
+                self.match = match
+                del buf[:match.end()]
+                self._state = "done"
+
+        return lines
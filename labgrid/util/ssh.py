@@ -1,9 +1,14 @@
 import atexit
+import base64
+import contextlib
+import json
 import tempfile
 import logging
+import shlex
 import shutil
 import subprocess
 import os
+import threading
 from select import select
 from functools import wraps
 from typing import Dict
@@ -19,6 +24,106 @@ def get_ssh_connect_timeout():
     return int(os.environ.get("LG_SSH_CONNECT_TIMEOUT", 30))
 
 
+def _split_lines(output):
+    lines = output.split('\n')
+    if lines[-1] == '':
+        lines.pop()
+    return lines
+
+
+class ExecServerError(Exception):
+    pass
+
+
+class ExecServer:
+    """Client for the command server in execserver.py, which runs commands
+    without starting a new process (and SSH session) for each of them.
+
+    Args:
+        prefix (list): command prefix which runs a shell command line, e.g.
+            the ssh command for a host
+        timeout (float): seconds to wait for the server to start
+    """
+
+    def __init__(self, prefix, *, timeout=30.0):
+        script = os.path.join(
+            os.path.abspath(os.path.dirname(__file__)),
+            'execserver.py')
+        with open(script) as script_fd:
+            source = script_fd.read()
+        self._lock = threading.Lock()
+        self._proc = subprocess.Popen(
+            prefix + [f"python3 -c {shlex.quote(source)}"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        try:
+            ready = self._receive(timeout=timeout).get('ready')
+        except (ValueError, ExecServerError):
+            ready = False
+        if ready is not True:
+            # don't wait for a server which hangs during startup
+            self._proc.kill()
+            self._proc.communicate()
+            self._proc = None
+            raise ExecServerError("command server did not start")
+
+    def _receive(self, timeout=None):
+        if timeout is not None:
+            readable, _, _ = select([self._proc.stdout], [], [], timeout)
+            if not readable:
+                raise ExecServerError("command server did not respond")
+        response = self._proc.stdout.readline()
+        if not response:
+            raise ExecServerError("command server terminated")
+        return json.loads(response.decode('ASCII'))
+
+    def isrunning(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def run(self, commands, *, stderr_merge=False):
+        """Runs the commands one after another and returns a list of
+        (stdout, stderr, returncode) tuples with the raw output.
+
+        The server handles one request at a time, concurrent calls wait for
+        each other."""
+        request = json.dumps({
+            'commands': list(commands),
+            'stderr_merge': stderr_merge,
+        })
+        with self._lock:
+            if not self.isrunning():
+                raise ExecServerError("command server is not running")
+            try:
+                self._proc.stdin.write(request.encode('ASCII')+b'\n')
+                self._proc.stdin.flush()
+                response = self._receive()
+            except (OSError, ExecServerError) as e:
+                self.close()
+                raise ExecServerError("command server terminated") from e
+        if 'error' in response:
+            raise ExecServerError(response['error'])
+        return [
+            (base64.b85decode(result['stdout']), base64.b85decode(result['stderr']),
+             result['returncode'])
+            for result in response['results']
+        ]
+
+    def close(self):
+        if self._proc is None:
+            return
+        with contextlib.suppress(OSError):
+            self._proc.stdin.write(json.dumps({'close': True}).encode('ASCII')+b'\n')
+        try:
+            self._proc.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.communicate()
+        self._proc = None
+
+
 @attr.s
 class SSHConnectionManager:
     """The SSHConnectionManager manages multiple SSH connections. This class
@@ -129,6 +234,9 @@ class SSHConnection:
 
     A public identity infrastructure is assumed, no extra username or passwords
     are supported."""
+    # sshd limits the sessions per connection (MaxSessions, 10 by default)
+    max_exec_servers = 4
+
     host = attr.ib(validator=attr.validators.instance_of(str))
     _connected = attr.ib(
         default=False, init=False, validator=attr.validators.instance_of(bool)
@@ -146,6 +254,11 @@ class SSHConnection:
         self._socket = None
         self._master = None
         self._keepalive = None
+        # idle command servers, and the number of idle and busy ones
+        self._exec_servers = []
+        self._exec_server_count = 0
+        self._exec_server_available = True
+        self._exec_server_lock = threading.Lock()
         atexit.register(self.cleanup)
 
     @staticmethod
@@ -204,6 +317,13 @@ class SSHConnection:
 
         """Run a command over the SSHConnection
 
+        Unless a tty is requested, the command is sent to a command server
+        which is started on the host on first use, avoiding a new ssh process
+        for each command. Each server runs one command at a time, so further
+        servers are started for concurrent commands. If max_exec_servers are
+        busy (or if python3 is not available on the host), a new ssh process
+        is used instead.
+
         Args:
             command (string): The command to run
             codec (string, optional): output encoding. Defaults to "utf-8".
@@ -222,6 +342,130 @@ class SSHConnection:
             (stdout, stderr, returncode)
         """
 
+        if not force_tty:
+            server = self._get_exec_server()
+            if server is not None:
+                self._logger.debug("Sending command to command server: %s", command)
+                try:
+                    results = server.run([command], stderr_merge=stderr_merge)
+                except ExecServerError as e:
+                    raise ExecutionError(f"error executing command: {command}: {e}") from e
+                finally:
+                    self._put_exec_server(server)
+                return self._decode_result(
+                    results[0], codec=codec, decodeerrors=decodeerrors,
+                    stderr_loglevel=stderr_loglevel, stdout_loglevel=stdout_loglevel
+                )
+
+        return self._run_process(
+            command, codec=codec, decodeerrors=decodeerrors, force_tty=force_tty,
+            stderr_merge=stderr_merge, stderr_loglevel=stderr_loglevel,
+            stdout_loglevel=stdout_loglevel
+        )
+
+    @_check_connected
+    def run_batch(self, commands, *, codec="utf-8", decodeerrors="strict",
+                  stderr_merge=False, stderr_loglevel=None, stdout_loglevel=None):
+        """Run several commands one after another over the SSHConnection
+
+        With the command server, all commands are sent in a single request.
+        If no server is available, each command is run in a new ssh process.
+        The arguments are the same as for run().
+
+        returns:
+            list of (stdout, stderr, returncode) for each command
+        """
+        commands = list(commands)
+        results = None
+        server = self._get_exec_server()
+        if server is not None:
+            self._logger.debug("Sending commands to command server: %s", commands)
+            try:
+                results = server.run(commands, stderr_merge=stderr_merge)
+            except ExecServerError as e:
+                raise ExecutionError(f"error executing commands: {commands}: {e}") from e
+            finally:
+                self._put_exec_server(server)
+
+        if results is None:
+            return [
+                self._run_process(
+                    command, codec=codec, decodeerrors=decodeerrors,
+                    stderr_merge=stderr_merge, stderr_loglevel=stderr_loglevel,
+                    stdout_loglevel=stdout_loglevel
+                )
+                for command in commands
+            ]
+
+        return [
+            self._decode_result(
+                result, codec=codec, decodeerrors=decodeerrors,
+                stderr_loglevel=stderr_loglevel, stdout_loglevel=stdout_loglevel
+            )
+            for result in results
+        ]
+
+    def _get_exec_server(self):
+        """Returns an idle command server for this connection, starting a new
+        one if all are busy. Returns None if max_exec_servers are busy or if
+        the server can not be started on the host, e.g. because python3 is
+        missing. The server must be returned with _put_exec_server()."""
+        with self._exec_server_lock:
+            while self._exec_servers:
+                server = self._exec_servers.pop()
+                if server.isrunning():
+                    return server
+                self._exec_server_count -= 1
+            if not self._exec_server_available or self._exec_server_count >= self.max_exec_servers:
+                return None
+            self._exec_server_count += 1
+
+        # start the server without the lock, so that other commands don't
+        # wait for it
+        try:
+            server = ExecServer(["ssh"] + self._get_ssh_args() + [self.host])
+        except ExecServerError:
+            self._logger.debug(
+                "Command server on %s not available, using a new ssh process per command",
+                self.host
+            )
+            with self._exec_server_lock:
+                self._exec_server_count -= 1
+                self._exec_server_available = False
+            return None
+        self._logger.debug("Started command server on %s", self.host)
+        return server
+
+    def _put_exec_server(self, server):
+        """Returns a command server from _get_exec_server() to the idle ones."""
+        with self._exec_server_lock:
+            if self._connected and server.isrunning():
+                self._exec_servers.append(server)
+                return
+            self._exec_server_count -= 1
+        server.close()
+
+    def _stop_exec_server(self):
+        with self._exec_server_lock:
+            servers, self._exec_servers = self._exec_servers, []
+            self._exec_server_count -= len(servers)
+        for server in servers:
+            server.close()
+
+    def _decode_result(self, result, *, codec, decodeerrors, stderr_loglevel, stdout_loglevel):
+        raw_stdout, raw_stderr, returncode = result
+        stdout = _split_lines(raw_stdout.decode(codec, decodeerrors))
+        stderr = _split_lines(raw_stderr.decode(codec, decodeerrors))
+        for output, loglevel in ((stdout, stdout_loglevel), (stderr, stderr_loglevel)):
+            if loglevel is not None:
+                for line in output:
+                    self._logger.log(loglevel, line)
+        return stdout, stderr, returncode
+
+    def _run_process(self, command, *, codec="utf-8", decodeerrors="strict",
+                     force_tty=False, stderr_merge=False, stderr_loglevel=None,
+                     stdout_loglevel=None):
+        """Run a command in a new ssh process, see run() for the arguments"""
         complete_cmd = ["ssh"] + self._get_ssh_args()
         if force_tty:
             complete_cmd += ["-tt"]
@@ -521,6 +765,7 @@ class SSHConnection:
     def disconnect(self):
         assert self._connected
         try:
+            self._stop_exec_server()
             self._stop_keepalive()
 
             if self._socket:
@@ -186,12 +186,16 @@ class Exporter(LabgridComponent):
 
 
 class Coordinator(LabgridComponent):
+    def __init__(self, cwd, args=''):
+        super().__init__(cwd)
+        self.args = args
+
     def start(self):
         assert self.spawn is None
         assert self.reader is None
 
         self.spawn = pexpect.spawn(
-            'python -m labgrid.remote.coordinator',
+            f'python -m labgrid.remote.coordinator {self.args}',
             logfile=Prefixer(sys.stdout.buffer, 'coordinator'),
             cwd=self.cwd)
         try:
@@ -248,6 +252,39 @@ def coordinator(tmpdir):
 
     coordinator.stop()
 
+@pytest.fixture(scope='function')
+def coordinator_with_metrics(tmpdir):
+    coordinator = Coordinator(tmpdir, '--metrics-port 20410')
+    coordinator.start()
+
+    yield coordinator
+
+    coordinator.stop()
+
+@pytest.fixture(scope='function')
+def start_coordinator(tmpdir):
+    coordinators = []
+
+    def _start_coordinator(args=''):
+        coordinator = Coordinator(tmpdir, args)
+        coordinator.start()
+        coordinators.append(coordinator)
+        return coordinator
+
+    yield _start_coordinator
+
+    for coordinator in coordinators:
+        coordinator.stop()
+
+@pytest.fixture(scope='function')
+def replica(tmpdir, coordinator):
+    replica = Coordinator(tmpdir.mkdir('replica'), '-l 127.0.0.1:20411 --replica-of 127.0.0.1:20408')
+    replica.start()
+
+    yield replica
+
+    replica.stop()
+
 @pytest.fixture(scope='function')
 def exporter(tmpdir, coordinator):
     config = "exports.yaml"
@@ -1,5 +1,6 @@
 import os
 import re
+import signal
 import time
 
 import pytest
@@ -247,6 +248,47 @@ def test_place_acquire_broken(place, exporter):
         print(spawn.before.decode())
         assert spawn.exitstatus == 0, spawn.before.strip()
 
+def test_place_acquire_rollback(place, exporter):
+    with pexpect.spawn('python -m labgrid.remote.client -p test add-match "*/Many/*" "*/Broken/*"') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn('python -m labgrid.remote.client -p test acquire') as spawn:
+        spawn.expect('Failed to acquire resources for place test')
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 1, spawn.before.strip()
+
+    # the resources acquired successfully must have been released again
+    with pexpect.spawn('python -m labgrid.remote.client resources -a') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'/Many/' not in spawn.before
+
+    with pexpect.spawn('python -m labgrid.remote.client -p test del-match "*/Broken/*"') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn('python -m labgrid.remote.client -p test acquire') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn('python -m labgrid.remote.client resources -a') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'/Many/NetworkSerialPort' in spawn.before
+        assert b'/Many/NetworkService' in spawn.before
+
+    with pexpect.spawn('python -m labgrid.remote.client -p test release') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
 def test_place_release_from(monkeypatch, place, exporter):
     user = "test-user"
     host = "test-host"
@@ -433,6 +475,36 @@ def test_reservation(place_acquire, tmpdir):
         spawn.close()
         assert spawn.exitstatus == 0, spawn.before.strip()
 
+def test_reservation_scheduled_on_tag_change(place):
+    with pexpect.spawn('python -m labgrid.remote.client reserve --shell board=otherboard') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        m = re.search(rb"^export LG_TOKEN=(\S+)$", spawn.before.replace(b'\r\n', b'\n'), re.MULTILINE)
+        assert m is not None, spawn.before.strip()
+        token = m.group(1)
+
+    with pexpect.spawn('python -m labgrid.remote.client reservations') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'waiting' in spawn.before, spawn.before.strip()
+
+    with pexpect.spawn('python -m labgrid.remote.client -p test set-tags board=otherboard') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    # the scheduler should run without waiting for the periodic poll
+    time.sleep(1)
+
+    with pexpect.spawn('python -m labgrid.remote.client reservations') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'allocated' in spawn.before, spawn.before.strip()
+        assert token in spawn.before, spawn.before.strip()
+
 def test_resource_acquired_state_on_exporter_restart(monkeypatch, place, exporter):
     user = "test-user"
     host = "test-host"
@@ -616,3 +688,168 @@ def test_same_name_resources(place, exporter, tmpdir):
         spawn.expect(pexpect.EOF)
         spawn.close()
         assert spawn.exitstatus == 0, spawn.before.strip()
+
+def test_replica(replica, exporter):
+    client = 'python -m labgrid.remote.client -x 127.0.0.1:20411'
+
+    with pexpect.spawn(f'{client} -p replicated create') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn(f'{client} -p replicated add-match "*/Testport/*"') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn(f'{client} -p replicated acquire') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    # the change was made on the primary
+    with pexpect.spawn('python -m labgrid.remote.client who') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'replicated' in spawn.before
+
+    # and is visible on the replica
+    with pexpect.spawn(f'{client} -p replicated show') as spawn:
+        spawn.expect("acquired resources:")
+        spawn.expect("testhost/Testport/NetworkSerialPort/NetworkSerialPort")
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn(f'{client} resources -a') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'testhost/Testport/NetworkSerialPort' in spawn.before
+
+    with pexpect.spawn(f'{client} -p replicated release') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn(f'{client} -p replicated delete') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn(f'{client} places') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'replicated' not in spawn.before
+
+def test_history(start_coordinator):
+    start_coordinator('--snapshot-format sqlite')
+
+    for cmd in ('create', 'acquire', 'release'):
+        with pexpect.spawn(f'python -m labgrid.remote.client -p history-test {cmd}') as spawn:
+            spawn.expect(pexpect.EOF)
+            spawn.close()
+            assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn('python -m labgrid.remote.client history') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'history-test' in spawn.before
+
+    with pexpect.spawn('python -m labgrid.remote.client -p history-test history -u') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'history-test' in spawn.before
+
+def test_import_export_places(coordinator, tmpdir):
+    tmpdir.join('places.yaml').write("""
+imported1:
+  aliases: [alias1]
+  comment: first board
+  tags:
+    board: imx8
+  matches:
+  - exporter: testhost
+    group: board1
+    cls: NetworkSerialPort
+    name: null
+    rename: null
+imported2:
+  matches:
+  - testhost/board2/NetworkSerialPort -> console
+""")
+
+    with pexpect.spawn(f'python -m labgrid.remote.client import-places {tmpdir}/places.yaml') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'changed 2 place(s)' in spawn.before
+
+    with pexpect.spawn(f'python -m labgrid.remote.client import-places {tmpdir}/places.yaml') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'places are up to date' in spawn.before
+
+    with pexpect.spawn(f'python -m labgrid.remote.client export-places {tmpdir}/exported.yaml') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    exported = tmpdir.join('exported.yaml').read()
+    assert 'first board' in exported
+    assert 'rename: console' in exported
+
+    tmpdir.join('places.yaml').write("""
+imported2:
+  comment: only board
+""")
+    with pexpect.spawn(f'python -m labgrid.remote.client import-places --delete {tmpdir}/places.yaml') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+
+    with pexpect.spawn('python -m labgrid.remote.client -p imported2 show') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'only board' in spawn.before
+        assert b'console' in spawn.before
+
+    with pexpect.spawn('python -m labgrid.remote.client places') as spawn:
+        spawn.expect(pexpect.EOF)
+        spawn.close()
+        assert spawn.exitstatus == 0, spawn.before.strip()
+        assert b'imported1' not in spawn.before
+
+def test_exporter_reload(tmpdir, exporter):
+    tmpdir.join('exports.yaml').write("""
+    Testport:
+        NetworkSerialPort:
+          host: 'localhost'
+          port: 4000
+    Reloaded:
+        NetworkSerialPort:
+          host: 'localhost'
+          port: 4001
+    """)
+    exporter.spawn.kill(signal.SIGHUP)
+
+    for _ in range(50):
+        with pexpect.spawn('python -m labgrid.remote.client resources') as spawn:
+            spawn.expect(pexpect.EOF)
+            spawn.close()
+            assert spawn.exitstatus == 0, spawn.before.strip()
+        if b'Reloaded' in spawn.before and b'Many' not in spawn.before:
+            break
+        time.sleep(0.1)
+
+    assert b'testhost/Testport/NetworkSerialPort' in spawn.before
+    assert b'testhost/Reloaded/NetworkSerialPort' in spawn.before
+    assert b'Broken' not in spawn.before
+    assert b'Many' not in spawn.before
+    assert exporter.isalive()
@@ -0,0 +1,109 @@
+import asyncio
+
+from labgrid.remote.clientqueue import ClientQueue
+from labgrid.remote.common import ResourceEntry, Place
+from labgrid.remote.generated import labgrid_coordinator_pb2
+
+
+def place_msg(name, comment=""):
+    msg = labgrid_coordinator_pb2.ClientOutMessage()
+    msg.updates.add().place.CopyFrom(Place(name, comment=comment).as_pb2())
+    return msg
+
+
+def resource_msg(entry):
+    msg = labgrid_coordinator_pb2.ClientOutMessage()
+    update = msg.updates.add()
+    update.resource.CopyFrom(entry.as_pb2())
+    update.resource.path.exporter_name = "exporter"
+    update.resource.path.group_name = "group"
+    update.resource.path.resource_name = "name"
+    return msg
+
+
+def delta_msg(old, new):
+    msg = labgrid_coordinator_pb2.ClientOutMessage()
+    update = msg.updates.add()
+    update.resource_delta.CopyFrom(new.as_delta_pb2(old.snapshot()))
+    update.resource_delta.path.exporter_name = "exporter"
+    update.resource_delta.path.group_name = "group"
+    update.resource_delta.path.resource_name = "name"
+    return msg
+
+
+def make_entry(version, **params):
+    return ResourceEntry({"cls": "NetworkService", "params": params, "avail": True}, version=version)
+
+
+def test_clientqueue_coalesce_places():
+    queue = ClientQueue()
+    queue.put_nowait(place_msg("a", "first"))
+    queue.put_nowait(place_msg("b"))
+    queue.put_nowait(place_msg("a", "second"))
+    assert queue.depth == 2
+    assert queue.coalesced == 1
+
+    out_msg = queue.get_nowait()
+    assert [update.place.name for update in out_msg.updates] == ["a", "b"]
+    assert out_msg.updates[0].place.comment == "second"
+    assert queue.get_nowait() is None
+
+
+def test_clientqueue_merge_deltas():
+    entries = [
+        make_entry(1, address="a", username="root"),
+        make_entry(2, address="b", username="root"),
+        make_entry(3, address="b", username="user", port=22),
+        make_entry(4, address="c", port=22),
+    ]
+
+    # deltas merged into a full resource
+    queue = ClientQueue()
+    queue.put_nowait(resource_msg(entries[0]))
+    for old, new in zip(entries, entries[1:]):
+        queue.put_nowait(delta_msg(old, new))
+    resource = queue.get_nowait().updates[0].resource
+    assert resource.version == 4
+    assert ResourceEntry.data_from_pb2(resource) == ResourceEntry.data_from_pb2(entries[-1].as_pb2())
+
+    # deltas merged with each other
+    queue = ClientQueue()
+    for old, new in zip(entries, entries[1:]):
+        queue.put_nowait(delta_msg(old, new))
+    delta = queue.get_nowait().updates[0].resource_delta
+    assert delta.base_version == 1
+    assert delta.version == 4
+    data = ResourceEntry.data_from_delta_pb2(ResourceEntry.data_from_pb2(entries[0].as_pb2()), delta)
+    assert data == ResourceEntry.data_from_pb2(entries[-1].as_pb2())
+
+
+def test_clientqueue_sync_order():
+    queue = ClientQueue(batch_size=2)
+    for name in "abc":
+        queue.put_nowait(place_msg(name))
+    msg = labgrid_coordinator_pb2.ClientOutMessage()
+    msg.sync.id = 1
+    queue.put_nowait(msg)
+    queue.put_nowait(place_msg("d"))
+
+    out_msg = queue.get_nowait()
+    assert len(out_msg.updates) == 2
+    assert not out_msg.HasField("sync")
+    out_msg = queue.get_nowait()
+    assert [update.place.name for update in out_msg.updates] == ["c", "d"]
+    assert out_msg.sync.id == 1
+
+
+def test_clientqueue_get():
+    async def run():
+        queue = ClientQueue()
+        task = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        assert not task.done()
+        queue.put_nowait(place_msg("a"))
+        out_msg = await task
+        assert out_msg.updates[0].place.name == "a"
+        queue.put_nowait(None)
+        assert await queue.get() is None
+
+    asyncio.run(run())
@@ -1,12 +1,18 @@
+import time
+
 import pytest
 
 import grpc
 import labgrid.remote.generated.labgrid_coordinator_pb2_grpc as labgrid_coordinator_pb2_grpc
 import labgrid.remote.generated.labgrid_coordinator_pb2 as labgrid_coordinator_pb2
+from labgrid.remote.common import ReservationState
 
 
-@pytest.fixture(scope="function")
-def channel_stub():
+def connect_client():
+    """Connect to the coordinator and start a client session.
+
+    The session lasts as long as the returned stream is referenced.
+    """
     import queue
 
     queue = queue.Queue()
@@ -27,6 +33,12 @@ def channel_stub():
             queue.task_done()
 
     stream = stub.ClientStream(generate_startup(queue))
+    return channel, stub, stream
+
+
+@pytest.fixture(scope="function")
+def channel_stub():
+    channel, stub, stream = connect_client()
     yield stub
     channel.close()
 
@@ -121,6 +133,118 @@ def test_coordinator_place_acquire_release(coordinator, coordinator_place):
     assert res
 
 
+class FakeExporter:
+    """Exporter stream with a single resource, matched by the place "test"."""
+
+    def __init__(self, stub):
+        import queue
+
+        self.queue = queue.Queue()
+        self.stream = stub.ExporterStream(self._generate(), wait_for_ready=True, timeout=30)
+        assert next(self.stream).HasField("hello")
+        stub.AddPlaceMatch(labgrid_coordinator_pb2.AddPlaceMatchRequest(placename="test", pattern="testporter/group/*"))
+        for _ in range(50):
+            res = stub.GetResourcesForPlace(labgrid_coordinator_pb2.GetResourcesForPlaceRequest(placename="test"))
+            if res.resources:
+                break
+            time.sleep(0.1)
+        assert len(res.resources) == 1
+
+    def _generate(self):
+        msg = labgrid_coordinator_pb2.ExporterInMessage()
+        msg.startup.version = "2.0.0"
+        msg.startup.name = "testporter"
+        yield msg
+        msg = labgrid_coordinator_pb2.ExporterInMessage()
+        msg.resource.path.group_name = "group"
+        msg.resource.path.resource_name = "resource"
+        msg.resource.cls = "Resource"
+        msg.resource.avail = True
+        yield msg
+        while (msg := self.queue.get()) is not None:
+            yield msg
+
+    def next_request(self):
+        return next(self.stream).set_acquired_request
+
+    def respond(self, request_id):
+        msg = labgrid_coordinator_pb2.ExporterInMessage()
+        msg.response.success = True
+        msg.response.request_id = request_id
+        self.queue.put(msg)
+
+    def close(self):
+        self.queue.put(None)
+        self.stream.cancel()
+
+
+def test_coordinator_place_delete_during_acquire(coordinator, coordinator_place):
+    stub = coordinator_place
+    exporter = FakeExporter(stub)
+
+    # delete the place while the acquire waits for the exporter
+    acquire = stub.AcquirePlace.future(labgrid_coordinator_pb2.AcquirePlaceRequest(placename="test"))
+    request = exporter.next_request()
+    assert request.place_name == "test"
+    stub.DeletePlace(labgrid_coordinator_pb2.DeletePlaceRequest(name="test"))
+    exporter.respond(request.request_id)
+
+    # the resource is released again and the acquire fails
+    request = exporter.next_request()
+    assert not request.HasField("place_name")
+    exporter.respond(request.request_id)
+    with pytest.raises(grpc.RpcError) as excinfo:
+        acquire.result(timeout=10)
+    assert excinfo.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+    res = stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    assert "test" not in {place.name for place in res.places}
+
+    exporter.close()
+
+
+def test_coordinator_place_acquire_in_progress(coordinator, coordinator_place):
+    stub = coordinator_place
+    exporter = FakeExporter(stub)
+
+    acquire = stub.AcquirePlace.future(labgrid_coordinator_pb2.AcquirePlaceRequest(placename="test"))
+    request = exporter.next_request()
+
+    # the place is only acquired once the exporter has acquired the resource
+    res = stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    assert not res.places[0].acquired
+    exporter.respond(request.request_id)
+    acquire.result(timeout=10)
+    res = stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    assert res.places[0].acquired == "testclient"
+    assert len(res.places[0].acquired_resources) == 1
+
+    exporter.close()
+
+
+def test_coordinator_exporter_unknown_response(coordinator, coordinator_place):
+    stub = coordinator_place
+    exporter = FakeExporter(stub)
+
+    # a duplicate or unknown response doesn't end the exporter stream
+    exporter.respond(1000)
+    acquire = stub.AcquirePlace.future(labgrid_coordinator_pb2.AcquirePlaceRequest(placename="test"))
+    request = exporter.next_request()
+    exporter.respond(request.request_id)
+    exporter.respond(request.request_id)
+    acquire.result(timeout=10)
+
+    res = stub.GetResourcesForPlace(labgrid_coordinator_pb2.GetResourcesForPlaceRequest(placename="test"))
+    assert len(res.resources) == 1
+    release = stub.ReleasePlace.future(labgrid_coordinator_pb2.ReleasePlaceRequest(placename="test"))
+    request = exporter.next_request()
+    assert not request.HasField("place_name")
+    exporter.respond(request.request_id)
+    release.result(timeout=10)
+
+    exporter.close()
+
+
 def test_coordinator_place_add_alias(coordinator, coordinator_place):
     stub = coordinator_place
     res = stub.AddPlaceAlias(labgrid_coordinator_pb2.AddPlaceAliasRequest(placename="test", alias="testalias"))
@@ -191,3 +315,228 @@ def test_coordinator_create_reservation(coordinator, coordinator_place):
     assert res
     res: labgrid_coordinator_pb2.CreateReservationResponse
     assert len(res.reservation.token) > 0
+
+
+def test_coordinator_subscribe_filter(coordinator, coordinator_place):
+    import queue
+
+    stub = coordinator_place
+    res = stub.AddPlace(labgrid_coordinator_pb2.AddPlaceRequest(name="other"))
+    assert res
+    res = stub.SetPlaceTags(labgrid_coordinator_pb2.SetPlaceTagsRequest(placename="other", tags={"board": "foo"}))
+    assert res
+
+    queue = queue.Queue()
+
+    def generate_messages(queue):
+        msg = labgrid_coordinator_pb2.ClientInMessage()
+        msg.startup.version = "2.0.0"
+        msg.startup.name = "filtered"
+        yield msg
+        while True:
+            yield queue.get()
+
+    def send_sync(identifier):
+        msg = labgrid_coordinator_pb2.ClientInMessage()
+        msg.sync.id = identifier
+        queue.put(msg)
+
+    def receive_places(stream):
+        places = set()
+        for out_msg in stream:
+            for update in out_msg.updates:
+                if update.WhichOneof("kind") == "place":
+                    places.add(update.place.name)
+            if out_msg.HasField("sync"):
+                return places
+
+    # use a separate channel, as the coordinator allows only one stream per peer
+    channel = grpc.insecure_channel("127.0.0.1:20408", options=[("grpc.use_local_subchannel_pool", 1)])
+    stream = labgrid_coordinator_pb2_grpc.CoordinatorStub(channel).ClientStream(generate_messages(queue))
+    msg = labgrid_coordinator_pb2.ClientInMessage()
+    msg.subscribe.filter.places.append("tes")
+    queue.put(msg)
+    send_sync(1)
+    assert receive_places(stream) == {"test"}
+
+    # updates to other places are not sent
+    res = stub.SetPlaceComment(labgrid_coordinator_pb2.SetPlaceCommentRequest(placename="other", comment="hidden"))
+    assert res
+    send_sync(2)
+    assert receive_places(stream) == set()
+
+    msg = labgrid_coordinator_pb2.ClientInMessage()
+    msg.subscribe.filter.tags["board"] = "foo"
+    queue.put(msg)
+    send_sync(3)
+    assert receive_places(stream) == {"other"}
+
+    stream.cancel()
+    channel.close()
+
+
+def test_coordinator_get_place(coordinator, coordinator_place):
+    stub = coordinator_place
+    res = stub.AddPlace(labgrid_coordinator_pb2.AddPlaceRequest(name="other"))
+    assert res
+    res = stub.AddPlaceAlias(labgrid_coordinator_pb2.AddPlaceAliasRequest(placename="other", alias="testalias"))
+    assert res
+
+    res = stub.GetPlace(labgrid_coordinator_pb2.GetPlaceRequest(pattern="test"))
+    assert {place.name for place in res.places} == {"test", "other"}
+    res = stub.GetPlace(labgrid_coordinator_pb2.GetPlaceRequest(pattern="oth"))
+    assert [place.name for place in res.places] == ["other"]
+
+    res = stub.GetResourcesForPlace(labgrid_coordinator_pb2.GetResourcesForPlaceRequest(placename="test"))
+    assert list(res.resources) == []
+    with pytest.raises(grpc.RpcError) as excinfo:
+        stub.GetResourcesForPlace(labgrid_coordinator_pb2.GetResourcesForPlaceRequest(placename="missing"))
+    assert excinfo.value.code() == grpc.StatusCode.NOT_FOUND
+
+def test_coordinator_metrics(coordinator_with_metrics, coordinator_place):
+    import urllib.request
+
+    stub = coordinator_place
+    stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    with pytest.raises(grpc.RpcError):
+        stub.GetResourcesForPlace(labgrid_coordinator_pb2.GetResourcesForPlaceRequest(placename="missing"))
+
+    # the error status is sent to the client before the error is counted
+    for _ in range(10):
+        with urllib.request.urlopen("http://127.0.0.1:20410/metrics") as response:
+            assert response.status == 200
+            lines = response.read().decode().splitlines()
+        if 'labgrid_coordinator_rpc_errors_total{method="GetResourcesForPlace"} 1.0' in lines:
+            break
+        time.sleep(0.1)
+
+    assert "labgrid_coordinator_places 1" in lines
+    assert "labgrid_coordinator_clients 1" in lines
+    assert "labgrid_coordinator_exporters 0" in lines
+    assert 'labgrid_coordinator_rpc_duration_seconds_count{method="AddPlace"} 1' in lines
+    assert 'labgrid_coordinator_rpc_duration_seconds_count{method="GetPlaces"} 1' in lines
+    assert 'labgrid_coordinator_rpc_errors_total{method="GetResourcesForPlace"} 1.0' in lines
+    assert 'labgrid_coordinator_streams_total{method="ClientStream"} 1.0' in lines
+    assert any(line.startswith('labgrid_coordinator_client_queue_depth{peer="') for line in lines)
+    assert any(line.startswith("labgrid_coordinator_lock_hold_seconds_count ") for line in lines)
+
+def test_coordinator_snapshot_format(tmpdir, start_coordinator):
+    import subprocess
+    import sys
+
+    tmpdir.join("places.yaml").write(
+        """
+board1:
+  aliases: []
+  comment: converted
+  matches:
+  - cls: NetworkSerialPort
+    exporter: '*'
+    group: board1
+    name: null
+    rename: null
+  tags:
+    board: imx8
+"""
+    )
+    subprocess.run(
+        [sys.executable, "-m", "labgrid.remote.snapshot", "-d", str(tmpdir), "yaml", "protobuf"], check=True
+    )
+    assert tmpdir.join("places.pb").check()
+    tmpdir.join("places.yaml").remove()
+
+    start_coordinator("--snapshot-format protobuf")
+
+    channel = grpc.insecure_channel("127.0.0.1:20408")
+    stub = labgrid_coordinator_pb2_grpc.CoordinatorStub(channel)
+    res = stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    channel.close()
+    assert [place.name for place in res.places] == ["board1"]
+    assert res.places[0].comment == "converted"
+    assert dict(res.places[0].tags) == {"board": "imx8"}
+
+
+def test_coordinator_update_places(coordinator, coordinator_place):
+    stub = coordinator_place
+    op = labgrid_coordinator_pb2.PlaceOperation
+
+    res = stub.UpdatePlaces(
+        labgrid_coordinator_pb2.UpdatePlacesRequest(
+            operations=[
+                op(add_place=labgrid_coordinator_pb2.AddPlaceRequest(name="bulk")),
+                op(add_alias=labgrid_coordinator_pb2.AddPlaceAliasRequest(placename="bulk", alias="bulkalias")),
+                op(set_tags=labgrid_coordinator_pb2.SetPlaceTagsRequest(placename="bulk", tags={"board": "imx8"})),
+                op(set_comment=labgrid_coordinator_pb2.SetPlaceCommentRequest(placename="bulk", comment="new")),
+                op(add_match=labgrid_coordinator_pb2.AddPlaceMatchRequest(placename="bulk", pattern="e/g/c")),
+                op(
+                    add_match=labgrid_coordinator_pb2.AddPlaceMatchRequest(
+                        placename="bulk", pattern="e/g/d/n", rename="r"
+                    )
+                ),
+                op(delete_match=labgrid_coordinator_pb2.DeletePlaceMatchRequest(placename="bulk", pattern="e/g/c")),
+                op(delete_place=labgrid_coordinator_pb2.DeletePlaceRequest(name="test")),
+            ]
+        )
+    )
+    assert sorted(res.changed_places) == ["bulk", "test"]
+
+    res = stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    assert [place.name for place in res.places] == ["bulk"]
+    place = res.places[0]
+    assert list(place.aliases) == ["bulkalias"]
+    assert dict(place.tags) == {"board": "imx8"}
+    assert place.comment == "new"
+    assert [(m.cls, m.name, m.rename) for m in place.matches] == [("d", "n", "r")]
+
+    # a failing operation leaves all places unchanged
+    with pytest.raises(grpc.RpcError) as excinfo:
+        stub.UpdatePlaces(
+            labgrid_coordinator_pb2.UpdatePlacesRequest(
+                operations=[
+                    op(add_place=labgrid_coordinator_pb2.AddPlaceRequest(name="other")),
+                    op(set_comment=labgrid_coordinator_pb2.SetPlaceCommentRequest(placename="bulk", comment="x")),
+                    op(set_tags=labgrid_coordinator_pb2.SetPlaceTagsRequest(placename="bulk", tags={"b": "in valid"})),
+                ]
+            )
+        )
+    assert excinfo.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert "operation 2" in excinfo.value.details()
+
+    res = stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    assert [place.name for place in res.places] == ["bulk"]
+    assert res.places[0].comment == "new"
+
+
+def test_coordinator_restore_reservations(start_coordinator):
+    coordinator = start_coordinator("--snapshot-format sqlite")
+
+    channel, stub, stream = connect_client()
+    stub.AddPlace(labgrid_coordinator_pb2.AddPlaceRequest(name="test"))
+    stub.SetPlaceTags(labgrid_coordinator_pb2.SetPlaceTagsRequest(placename="test", tags={"board": "test"}))
+    tokens = []
+    for board in ("test", "missing"):
+        res = stub.CreateReservation(
+            labgrid_coordinator_pb2.CreateReservationRequest(
+                filters={"main": labgrid_coordinator_pb2.Reservation.Filter(filter={"board": board})},
+            )
+        )
+        tokens.append(res.reservation.token)
+    # wait for the save step
+    time.sleep(2)
+    channel.close()
+    coordinator.stop()
+    coordinator.start()
+
+    channel = grpc.insecure_channel("127.0.0.1:20408")
+    stub = labgrid_coordinator_pb2_grpc.CoordinatorStub(channel)
+    res = stub.GetReservations(labgrid_coordinator_pb2.GetReservationsRequest())
+    reservations = {r.token: r for r in res.reservations}
+    assert reservations.keys() == set(tokens)
+    allocated, waiting = (reservations[token] for token in tokens)
+    assert allocated.state == ReservationState.allocated.value
+    assert dict(allocated.allocations) == {"main": "test"}
+    assert waiting.state == ReservationState.waiting.value
+
+    res = stub.GetPlaces(labgrid_coordinator_pb2.GetPlacesRequest())
+    assert res.places[0].reservation == tokens[0]
+    channel.close()
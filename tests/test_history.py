@@ -0,0 +1,84 @@
+import pytest
+
+from labgrid.remote.history import History
+
+
+@pytest.fixture
+def history(tmpdir):
+    return History(str(tmpdir.join("coordinator.sqlite")))
+
+
+def test_history_entries(history):
+    history.record_acquire("place1", "host/alice", {"board": "imx8"}, 1000.0)
+    history.record_release("place1", 1100.0)
+    history.record_acquire("place2", "host/bob", {"board": "rpi"}, 1050.0)
+    history.record_acquire("place1", "host/bob", {"board": "imx8"}, 1200.0)
+    assert history.get_entries() == []
+
+    history.write(history.take_pending())
+    assert history.pending == []
+
+    entries = history.get_entries()
+    assert [(e.place, e.user, e.acquired, e.released) for e in entries] == [
+        ("place1", "host/bob", 1200.0, None),
+        ("place2", "host/bob", 1050.0, None),
+        ("place1", "host/alice", 1000.0, 1100.0),
+    ]
+    assert entries[0].tags == {"board": "imx8"}
+
+    assert [e.acquired for e in history.get_entries(place="place1")] == [1200.0, 1000.0]
+    assert [e.place for e in history.get_entries(user="host/alice")] == ["place1"]
+    assert [e.place for e in history.get_entries(tags={"board": "rpi"})] == ["place2"]
+    assert [e.acquired for e in history.get_entries(since=1150.0)] == [1200.0, 1050.0]
+    assert [e.acquired for e in history.get_entries(until=1040.0)] == [1000.0]
+    assert len(history.get_entries(limit=1)) == 1
+
+
+def test_history_utilization(history):
+    history.record_acquire("place1", "host/alice", {"board": "imx8"}, 1000.0)
+    history.record_release("place1", 1100.0)
+    history.record_acquire("place1", "host/bob", {"board": "imx8"}, 1500.0)
+    history.record_release("place1", 2500.0)
+    history.record_acquire("place2", "host/bob", {"board": "rpi"}, 1900.0)
+    history.record_release("place2", 1950.0)
+    history.write(history.take_pending())
+
+    utilization = history.get_utilization(since=1050.0, until=2000.0)
+    # only the parts within the time range are counted
+    assert [(u.place, u.acquisitions, u.acquired_seconds) for u in utilization] == [
+        ("place1", 2, 50.0 + 500.0),
+        ("place2", 1, 50.0),
+    ]
+
+    utilization = history.get_utilization(since=0.0, until=3000.0, tags={"board": "imx8"})
+    assert [(u.place, u.acquisitions, u.acquired_seconds) for u in utilization] == [("place1", 2, 1100.0)]
+
+
+def test_history_reopen(tmpdir):
+    path = str(tmpdir.join("coordinator.sqlite"))
+    history = History(path)
+    history.record_acquire("place1", "host/alice", {}, 1000.0)
+    history.record_reservation("ABC", "host/alice", "created")
+    history.write(history.take_pending())
+
+    # acquisitions left open by a previous run are closed on startup
+    history = History(path)
+    entries = history.get_entries()
+    assert len(entries) == 1
+    assert entries[0].released is not None
+
+
+def test_history_reservation_state(tmpdir):
+    path = str(tmpdir.join("coordinator.sqlite"))
+    history = History(path)
+    history.record_reservation_state("ABC", {"owner": "host/alice", "state": "waiting"})
+    history.record_reservation_state("DEF", {"owner": "host/bob", "state": "waiting"})
+    history.write(history.take_pending())
+
+    history.record_reservation_state("ABC", {"owner": "host/alice", "state": "allocated"})
+    history.record_reservation_state("DEF", None)
+    history.write(history.take_pending())
+
+    # the state is kept over restarts
+    history = History(path)
+    assert history.get_reservations() == {"ABC": {"owner": "host/alice", "state": "allocated"}}
@@ -0,0 +1,50 @@
+from labgrid.remote.common import Place, ResourceMatch
+from labgrid.remote.journal import Journal
+
+
+def test_journal_replay(tmpdir):
+    journal = Journal(str(tmpdir.join("journal.jsonl")))
+    place = Place("test", matches=[ResourceMatch("*", "group", "*")])
+    journal.record_place(place.name, place.asdict())
+    place.comment = "changed"
+    journal.record_place(place.name, place.asdict())
+    journal.record_place("other", Place("other").asdict())
+    journal.record_place_deleted("other")
+    journal.append(journal.take_pending())
+    assert not journal.pending
+    # resource entries written by older versions are ignored
+    with open(tmpdir.join("journal.jsonl"), "a") as f:
+        f.write('{"resource": ["exporter", "group", "name"], "data": {"cls": "NetworkService"}}\n')
+
+    journal = Journal(str(tmpdir.join("journal.jsonl")))
+    places = journal.replay_places({"old": {"comment": ""}})
+    assert places.keys() == {"old", "test"}
+    assert places["test"]["comment"] == "changed"
+    assert places["test"]["matches"] == [
+        {"exporter": "*", "group": "group", "cls": "*", "name": None, "rename": None},
+    ]
+    assert journal.written == 5
+
+
+def test_journal_compaction(tmpdir):
+    journal = Journal(str(tmpdir.join("journal.jsonl")), compact_threshold=3)
+    journal.record_place("test", Place("test").asdict())
+    journal.append(journal.take_pending())
+    assert not journal.needs_compaction(1)
+    assert journal.needs_compaction(2)
+
+    journal.reset()
+    assert journal.written == 0
+    assert journal.replay_places({}) == {}
+
+
+def test_journal_incomplete_entry(tmpdir):
+    path = tmpdir.join("journal.jsonl")
+    journal = Journal(str(path))
+    journal.record_place("test", Place("test").asdict())
+    journal.append(journal.take_pending())
+    with open(path, "a") as f:
+        f.write('{"place": "broken", "da')
+
+    places = journal.replay_places({})
+    assert places.keys() == {"test"}
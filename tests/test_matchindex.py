@@ -0,0 +1,53 @@
+import itertools
+
+from labgrid.remote.common import Place, ResourceMatch
+from labgrid.remote.matchindex import MatchIndex
+
+
+def test_matchindex_simple():
+    index = MatchIndex()
+    place = Place("test", matches=[ResourceMatch("exporter", "group", "NetworkSerialPort")])
+    index.update_place(place)
+    index.add_resource(("exporter", "group", "NetworkSerialPort", "serial"), "serial")
+    index.add_resource(("exporter", "group", "NetworkService", "ssh"), "ssh")
+    assert index.get_resources("test") == ["serial"]
+    assert index.get_places(("exporter", "group", "NetworkSerialPort", "serial")) == {"test"}
+
+    place.matches.append(ResourceMatch("exp*", "group", "*", "s?h"))
+    index.update_place(place)
+    assert index.get_resources("test") == ["serial", "ssh"]
+
+    index.remove_resource(("exporter", "group", "NetworkSerialPort", "serial"))
+    assert index.get_resources("test") == ["ssh"]
+
+    index.remove_place("test")
+    assert index.get_resources("test") == []
+    assert index.get_places(("exporter", "group", "NetworkService", "ssh")) == set()
+
+
+def test_matchindex_consistent():
+    places = [
+        Place("exact", matches=[ResourceMatch("e1", "g1", "c1", "n1")]),
+        Place("noname", matches=[ResourceMatch("e1", "g1", "c2")]),
+        Place("emptyname", matches=[ResourceMatch("e2", "g2", "c1", "")]),
+        Place("default", matches=[ResourceMatch("*", "g2", "*")]),
+        Place("mixed", matches=[ResourceMatch("e2", "g1", "c1", "n2"), ResourceMatch("e?", "g[12]", "c2", "n*")]),
+        Place("none"),
+    ]
+    paths = list(itertools.product(["e1", "e2"], ["g1", "g2"], ["c1", "c2"], ["n1", "n2"]))
+
+    index = MatchIndex()
+    # add half of the resources before and half after the places
+    for path in paths[::2]:
+        index.add_resource(path, "/".join(path))
+    for place in places:
+        index.update_place(place)
+    for path in paths[1::2]:
+        index.add_resource(path, "/".join(path))
+
+    for place in places:
+        expected = sorted("/".join(path) for path in paths if place.hasmatch(path))
+        assert index.get_resources(place.name) == expected, place.name
+    for path in paths:
+        expected = {place.name for place in places if place.hasmatch(path)}
+        assert index.get_places(path) == expected, path
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from labgrid.remote.metrics import Registry, TimedLock, serve_metrics
+
+
+def test_metrics_expose():
+    registry = Registry()
+    counter = registry.counter("test_requests", "Number of requests.", ["method"])
+    gauge = registry.gauge("test_places", "Number of places.", callback=lambda: 3)
+    histogram = registry.histogram("test_duration_seconds", "Duration.", buckets=[0.1, 1.0])
+
+    counter.labels('Get"Place').inc()
+    counter.labels('Get"Place').inc(2)
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    lines = registry.expose().splitlines()
+    assert "# TYPE test_requests counter" in lines
+    assert 'test_requests_total{method="Get\\"Place"} 3.0' in lines
+    assert "test_places 3" in lines
+    assert 'test_duration_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_duration_seconds_bucket{le="1.0"} 2' in lines
+    assert 'test_duration_seconds_bucket{le="+Inf"} 3' in lines
+    assert "test_duration_seconds_sum 5.55" in lines
+    assert "test_duration_seconds_count 3" in lines
+
+    with pytest.raises(ValueError):
+        counter.inc()
+    with pytest.raises(ValueError):
+        registry.gauge("test_places", "Duplicate.")
+
+
+def test_metrics_gauge_labels():
+    registry = Registry()
+    registry.gauge("test_depth", "Queue depth.", ["peer"], callback=lambda: {("a",): 1, ("b",): 0})
+
+    lines = registry.expose().splitlines()
+    assert 'test_depth{peer="a"} 1' in lines
+    assert 'test_depth{peer="b"} 0' in lines
+
+
+def test_metrics_timed_lock():
+    registry = Registry()
+    wait = registry.histogram("test_lock_wait_seconds", "Wait.")
+    hold = registry.histogram("test_lock_hold_seconds", "Hold.")
+
+    async def run():
+        lock = TimedLock(wait, hold)
+
+        async def hold_lock():
+            async with lock:
+                assert lock.locked()
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(hold_lock(), hold_lock())
+        assert not lock.locked()
+
+    asyncio.run(run())
+
+    assert wait.labels().count == 2
+    assert hold.labels().count == 2
+    assert hold.labels().sum >= 0.02
+    # the second task waited for the first one
+    assert wait.labels().sum >= 0.01
+
+
+def test_metrics_serve():
+    registry = Registry()
+    registry.gauge("test_clients", "Number of clients.", callback=lambda: 2)
+
+    async def request(port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        response = await reader.read()
+        writer.close()
+        return response.decode()
+
+    async def run():
+        server = await serve_metrics(registry, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            response = await request(port, "/metrics")
+            assert response.startswith("HTTP/1.1 200 OK\r\n")
+            assert "\r\n\r\n# HELP test_clients Number of clients.\n" in response
+            assert "test_clients 2\n" in response
+
+            response = await request(port, "/other")
+            assert response.startswith("HTTP/1.1 404 Not Found\r\n")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(run())
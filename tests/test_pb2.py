@@ -1,4 +1,4 @@
-from labgrid.remote.common import Place, ResourceMatch, Reservation, set_map_from_dict, build_dict_from_map
+from labgrid.remote.common import Place, ResourceEntry, ResourceMatch, Reservation, set_map_from_dict, build_dict_from_map
 import labgrid.remote.generated.labgrid_coordinator_pb2 as labgrid_coordinator_pb2
 
 def test_place_as_pb2():
@@ -137,6 +137,44 @@ def test_resource_dict():
 
     assert params == decoded
 
+def test_resource_delta():
+    resource = ResourceEntry({
+        'cls': 'NetworkSerialPort',
+        'params': {'host': 'foo', 'port': 4000, 'extra': {'proxy': 'bar'}},
+        'avail': True,
+    })
+    old = resource.snapshot()
+    resource.version = 2
+    resource.acquire('place')
+    resource.data['params']['port'] = 4001
+    resource.data['params']['speed'] = None
+    del resource.data['params']['host']
+    resource.data['params']['extra'] = {'proxy_required': False}
+
+    delta = resource.as_delta_pb2(old)
+    assert delta.version == 2
+    assert delta.acquired == 'place'
+    assert not delta.HasField('avail')
+    assert build_dict_from_map(delta.params) == {'port': 4001, 'speed': None}
+    assert list(delta.removed_params) == ['host']
+    assert build_dict_from_map(delta.extra) == {'proxy_required': False}
+    assert list(delta.removed_extra) == ['proxy']
+
+    delta = labgrid_coordinator_pb2.ResourceDelta.FromString(delta.SerializeToString())
+    assert ResourceEntry.data_from_delta_pb2(old, delta) == resource.asdict()
+    assert old['acquired'] is None
+
+    resource.release()
+    delta = resource.as_delta_pb2(resource.snapshot() | {'acquired': 'place'})
+    assert delta.HasField('acquired')
+    assert ResourceEntry.data_from_delta_pb2(resource.asdict(), delta)['acquired'] is None
+
+def test_resource_delta_cls_changed():
+    resource = ResourceEntry({'cls': 'NetworkSerialPort', 'params': {}})
+    old = resource.snapshot()
+    resource.data['cls'] = 'RawSerialPort'
+    assert resource.as_delta_pb2(old) is None
+
 def test_map_serialize(benchmark):
     params = {
         'host': 'foo',
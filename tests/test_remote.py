@@ -1,3 +1,5 @@
+import time
+
 import pexpect
 
 
@@ -48,3 +50,147 @@ def test_exporter_coordinator_becomes_unreachable(coordinator, exporter):
     assert exporter.exitstatus == 100
 
     coordinator.resume_tree()
+
+
+def test_exporter_poll_intervals(caplog):
+    import asyncio
+    import logging
+
+    from labgrid.remote.exporter import Exporter, NetworkServiceExport
+
+    class BlockingExport(NetworkServiceExport):
+        blocking_poll = True
+        poll_interval = 0.0
+
+    async def run():
+        exporter = Exporter({"name": "test", "hostname": "test", "isolated": False, "coordinator": "127.0.0.1"})
+        def config():
+            return {"avail": False, "cls": "NetworkService", "params": {"address": "192.168.0.1", "username": "root"}}
+
+        exporter.groups["group"] = {
+            "static": NetworkServiceExport(config(), host="test"),
+            "blocking": BlockingExport(config(), host="test"),
+        }
+        for _ in range(3):
+            await exporter._poll_step()
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*exporter.poll_futures.values())
+        assert exporter.poll_stats["group", "static"].count == 1
+        assert exporter.poll_stats["group", "blocking"].count == 3
+        with caplog.at_level(logging.DEBUG):
+            exporter._log_poll_stats()
+        assert "poll stats for group/blocking: 3 polls" in caplog.text
+        # both resources only changed on their first poll
+        assert exporter.out_queue.qsize() == 2
+
+    asyncio.run(run())
+
+
+def test_exporter_reload(tmpdir):
+    import asyncio
+
+    from labgrid.remote.exporter import Exporter
+
+    config = tmpdir.join("exports.yaml")
+    config.write(
+        """
+    Testport:
+        NetworkSerialPort:
+          host: 'localhost'
+          port: 4000
+    Power:
+        NetworkPowerPort:
+          model: netio
+          host: netio1
+          index: 1
+    Service:
+        NetworkService:
+          address: "192.168.0.1"
+          username: "root"
+    """
+    )
+
+    def get_messages(exporter):
+        messages = []
+        while not exporter.out_queue.empty():
+            msg = exporter.out_queue.get_nowait()
+            kind = msg.WhichOneof("kind")
+            path = getattr(msg, kind).path if kind == "resource" else msg.del_resource
+            messages.append((kind, path.group_name, path.resource_name))
+        return messages
+
+    async def run():
+        exporter = Exporter(
+            {"name": "test", "hostname": "test", "isolated": False, "coordinator": "127.0.0.1", "resources": str(config)}
+        )
+        await exporter.reload()
+        assert sorted(get_messages(exporter)) == [
+            ("resource", "Power", "NetworkPowerPort"),
+            ("resource", "Service", "NetworkService"),
+            ("resource", "Testport", "NetworkSerialPort"),
+        ]
+        serialport = exporter.groups["Testport"]["NetworkSerialPort"]
+
+        # reloading an unchanged config sends nothing
+        await exporter.reload()
+        assert get_messages(exporter) == []
+
+        exporter.groups["Service"]["NetworkService"].data["acquired"] = "someplace"
+        config.write(
+            """
+    Testport:
+        NetworkSerialPort:
+          host: 'localhost'
+          port: 4000
+    Power:
+        NetworkPowerPort:
+          model: netio
+          host: netio1
+          index: 2
+    Other:
+        NetworkService:
+          address: "192.168.0.2"
+          username: "root"
+    """
+        )
+        await exporter.reload()
+        assert get_messages(exporter) == [
+            ("del_resource", "Power", "NetworkPowerPort"),
+            ("resource", "Power", "NetworkPowerPort"),
+            ("resource", "Other", "NetworkService"),
+        ]
+        # unchanged resources are kept
+        assert exporter.groups["Testport"]["NetworkSerialPort"] is serialport
+        assert exporter.groups["Power"]["NetworkPowerPort"].params["index"] == 2
+        # acquired resources are not removed
+        assert "Service" in exporter.groups
+
+        # errors in the config keep the current resources
+        config.write("Testport: [")
+        await exporter.reload()
+        assert get_messages(exporter) == []
+        assert sorted(exporter.groups) == ["Other", "Power", "Service", "Testport"]
+
+    asyncio.run(run())
+
+
+def test_exporter_resources_changed():
+    import asyncio
+
+    from labgrid.remote.exporter import Exporter
+
+    async def run():
+        exporter = Exporter({"name": "test", "hostname": "test", "isolated": False, "coordinator": "127.0.0.1"})
+        local, other = object(), object()
+        exporter.managed_exports[local] = ("group", "usb")
+        exporter.poll_due["group", "usb"] = time.monotonic() + 1.0
+
+        exporter._on_resources_changed([other])
+        assert not exporter.poll_wakeup.is_set()
+
+        # udev events for a local resource poll its export on the next step
+        exporter._on_resources_changed([local, other])
+        assert exporter.poll_wakeup.is_set()
+        assert exporter.poll_due["group", "usb"] == 0.0
+
+    asyncio.run(run())
@@ -1,3 +1,5 @@
+import random
+
 from labgrid.remote.scheduler import *
 
 
@@ -80,3 +82,97 @@ def test_conflict():
     assert schedule(places, filters[::-1]) == {"res-2": "place-1"}
     assert schedule(places[::-1], filters) == {"res-1": "place-1"}
     assert schedule(places[::-1], filters[::-1]) == {"res-2": "place-1"}
+
+
+def test_maximum_matching():
+    # the greedy scheduler would allocate place-1 to res-2 and leave res-3 waiting
+    places = [
+        TagSet("place-1", {"name=place-1", "board=foo", "usb=yes"}),
+        TagSet("place-2", {"name=place-2", "board=foo", "eth=yes"}),
+        TagSet("place-3", {"name=place-3", "board=foo", "eth=yes"}),
+    ]
+    filters = [
+        TagSet("res-1", {"board=foo", "eth=yes"}),
+        TagSet("res-2", {"board=foo"}),
+        TagSet("res-3", {"board=foo", "usb=yes"}),
+    ]
+
+    assert len(schedule_overlaps(places, filters)) == 2
+    allocation = schedule(places, filters)
+    assert allocation.keys() == {"res-1", "res-2", "res-3"}
+    assert allocation["res-3"] == "place-1"
+
+
+def test_priority():
+    places = [
+        TagSet("place-1", {"name=place-1", "board=foo"}),
+        TagSet("place-2", {"name=place-2", "board=bar"}),
+    ]
+    filters = [
+        TagSet("res-1", {"board=foo"}),
+        TagSet("res-2", {"board=bar"}),
+        TagSet("res-3", set()),
+        TagSet("res-4", {"board=foo"}),
+    ]
+
+    # earlier filters are never displaced by later ones
+    assert schedule(places, filters) == {"res-1": "place-1", "res-2": "place-2"}
+    # a filter without tags is moved to make room for a later one
+    assert schedule(places, filters[2:]) == {"res-3": "place-2", "res-4": "place-1"}
+
+
+def test_fair_share():
+    filters = [
+        TagSet("res-1", {"board=foo"}),
+        TagSet("res-2", {"board=foo"}),
+        TagSet("res-3", {"board=foo"}),
+        TagSet("res-4", {"board=foo"}),
+    ]
+    owners = {"res-1": "a", "res-2": "a", "res-3": "b", "res-4": "c"}
+
+    ordered = fair_share(filters, owners)
+    assert [f.name for f in ordered] == ["res-1", "res-3", "res-4", "res-2"]
+    ordered = fair_share(filters, owners, {"b": 1, "c": 2})
+    assert [f.name for f in ordered] == ["res-1", "res-2", "res-3", "res-4"]
+
+
+def generate_fleet(count, seed=0):
+    "Generate synthetic places and reservation filters for benchmarks."
+    rng = random.Random(seed)
+    boards = [f"board{i}" for i in range(count // 10 or 1)]
+    places = []
+    for i in range(count):
+        tags = {f"name=place-{i}", f"board={rng.choice(boards)}", f"usb={rng.choice(['yes', 'no'])}"}
+        places.append(TagSet(f"place-{i}", tags))
+    filters = []
+    for i in range(count):
+        tags = {f"board={rng.choice(boards)}"}
+        if rng.random() < 0.5:
+            tags.add("usb=yes")
+        filters.append(TagSet(f"res-{i}", tags))
+    return places, filters
+
+
+def test_schedule_consistent():
+    places, filters = generate_fleet(100)
+    greedy = schedule_overlaps(places, filters)
+    matching = schedule_matching(places, filters)
+    assert len(matching) >= len(greedy)
+    for f, place in matching.items():
+        assert f.tags.issubset(place.tags)
+    assert len(set(matching.values())) == len(matching)
+
+
+def test_schedule_greedy_benchmark(benchmark):
+    places, filters = generate_fleet(200)
+    benchmark(schedule_overlaps, places, filters)
+
+
+def test_schedule_matching_benchmark(benchmark):
+    places, filters = generate_fleet(200)
+    benchmark(schedule_matching, places, filters)
+
+
+def test_schedule_matching_large_benchmark(benchmark):
+    places, filters = generate_fleet(5000)
+    benchmark(schedule_matching, places, filters)
@@ -1,7 +1,15 @@
+import os
+import pty
+import threading
+import time
+
+import pexpect
 import pytest
 
 from labgrid.driver import SerialDriver
 from labgrid.exceptions import NoSupplierFoundError
+from labgrid.resource import RawSerialPort
+from labgrid.step import steps
 
 
 class TestSerialDriver:
@@ -73,3 +81,102 @@ class TestSerialDriver:
         assert isinstance(s, SerialDriver)
         assert target.drivers[0] == s
         serial_mock.assert_called_once_with("socket://", do_not_open=True)
+
+    def test_raw_fileno(self, target, serial_raw_port, mocker):
+        serial_mock = mocker.patch("serial.serial_for_url")
+        serial_mock.return_value._socket.fileno.return_value = 42
+        s = SerialDriver(target, "serial")
+        target.activate(s)
+        assert s._fileno() == 42
+        # without the socket, the generic read path is used
+        del serial_mock.return_value._socket
+        assert s._fileno() is None
+
+
+@pytest.fixture
+def pty_serial_driver(target):
+    master, slave = pty.openpty()
+    RawSerialPort(target, "serial", port=os.ttyname(slave))
+    s = SerialDriver(target, "serial")
+    target.activate(s)
+    yield s, master
+    target.deactivate(s)
+    os.close(master)
+    os.close(slave)
+
+
+def _write_boot_log(master, lines):
+    data = b"".join(
+        f"[{i:8d}] some kernel message about a device being probed\n".encode() for i in range(lines)
+    )
+    data = memoryview(data + b"login: ")
+
+    def write():
+        written = 0
+        while written < len(data):
+            written += os.write(master, data[written:])
+
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_expect_fast_path(pty_serial_driver):
+    s, master = pty_serial_driver
+    assert s._fileno() == s.serial.fileno()
+
+    reads = []
+
+    def collect(event):
+        if event.step.title == "read" and event.data.get("state") == "stop":
+            reads.append(event.step.result)
+
+    steps.subscribe(collect)
+    try:
+        thread = _write_boot_log(master, 1000)
+        index, before, _, _ = s.expect([b"login: "], timeout=10.0)
+        thread.join()
+    finally:
+        steps.unsubscribe(collect)
+
+    assert index == 0
+    assert before.count(b"\n") == 1000
+    # the console output is still reported completely, but in aggregated chunks
+    assert b"".join(reads).replace(b"\r\n", b"\n").endswith(b"login: ")
+    assert len(reads) < 100
+
+
+def test_expect_fast_path_quiet(pty_serial_driver):
+    s, master = pty_serial_driver
+    reads = []
+
+    def collect(event):
+        if event.step.title == "read" and event.data.get("state") == "stop":
+            reads.append((time.monotonic(), event.step.result))
+
+    steps.subscribe(collect)
+    try:
+        os.write(master, b"partial output")
+        start = time.monotonic()
+        with pytest.raises(pexpect.TIMEOUT):
+            s.expect([b"login: "], timeout=2.0)
+    finally:
+        steps.unsubscribe(collect)
+
+    # the collected data is logged while waiting, not only when the expect ends
+    assert reads[0][1] == b"partial output"
+    assert reads[0][0] - start < 1.0
+
+
+def test_expect_read_benchmark(pty_serial_driver, benchmark):
+    s, master = pty_serial_driver
+    line = b"[    1.000000] some kernel message about a device being probed\n"
+
+    # a slow serial line delivers the console output in small chunks, so the cost of each
+    # read by pexpect matters more than the buffer size
+    def read_lines():
+        for _ in range(100):
+            os.write(master, line)
+            s._expect.read_nonblocking(1, 1.0)
+
+    benchmark(read_lines)
@@ -1,11 +1,64 @@
+import os
+import pty
+import select
+import signal
+import subprocess
+
+import attr
 import pytest
+from pexpect import TIMEOUT
 
+from labgrid import Target
 from labgrid.driver import ShellDriver, ExecutionError
+from labgrid.driver.common import Driver
+from labgrid.driver.consoleexpectmixin import ConsoleExpectMixin
+from labgrid.driver.shelldriver import _cksum
 from labgrid.exceptions import NoDriverFoundError
+from labgrid.protocol import ConsoleProtocol
 
 from ipaddress import IPv4Interface
 
 
+@attr.s(eq=False)
+class PtyConsoleDriver(ConsoleExpectMixin, Driver, ConsoleProtocol):
+    """Console connected to a local shell via a pty"""
+    txdelay = 0.0
+    txchunk = 1
+    linesep = "\n"
+
+    def on_activate(self):
+        # the shell needs a controlling terminal to receive Ctrl-C
+        self._pid, self._master = pty.fork()
+        if self._pid == 0:
+            os.execve("/bin/sh", ["sh"], {"PS1": "pty$ ", "PATH": os.environ["PATH"]})
+
+    def on_deactivate(self):
+        os.kill(self._pid, signal.SIGKILL)
+        os.waitpid(self._pid, 0)
+        os.close(self._master)
+
+    def _fileno(self):
+        return self._master
+
+    def _read(self, size=1, timeout=0.0, max_size=None):
+        if not select.select([self._master], [], [], timeout)[0]:
+            raise TIMEOUT(f"Timeout of {timeout:.2f} seconds exceeded")
+        return os.read(self._master, max_size or 4096)
+
+    def _write(self, data):
+        return os.write(self._master, data)
+
+
+@pytest.fixture
+def pty_shell():
+    t = Target("pty")
+    PtyConsoleDriver(t, "console")
+    d = ShellDriver(t, "shell", prompt=r"pty\$ ", login_prompt="login: ", username="root")
+    t.activate(d)
+    yield d
+    t.deactivate_all_drivers()
+
+
 class TestShellDriver:
     def test_instance(self, target, serial_driver):
         s = ShellDriver(target, "shell", "", "", "")
@@ -97,3 +150,50 @@ class TestShellDriver:
 
         res = d.get_ip_addresses()
         assert res[0] == IPv4Interface("192.168.42.1/24")
+
+
+def test_run_pty(pty_shell):
+    assert pty_shell.run("echo hello; echo -n world") == (["hello", "world"], [], 0)
+    assert pty_shell.run("printf '\\033[1mbold\\033[0m\\n\\n'; exit 3") == (["bold", ""], [], 3)
+    assert pty_shell.run("seq 1 100000")[0][-1] == "100000"
+    assert pty_shell.run("echo after") == (["after"], [], 0)
+
+
+def test_run_benchmark(pty_shell, benchmark):
+    stdout, _, exitcode = benchmark.pedantic(
+        pty_shell.run, args=("seq 1 1000000",), kwargs={"timeout": 60.0}, rounds=3
+    )
+    assert exitcode == 0
+    assert len(stdout) == 1000000
+
+
+def test_run_iter_pty(pty_shell):
+    output = pty_shell.run_iter("seq 1 3; exit 2")
+    assert list(output) == ["1", "2", "3"]
+    assert output.stderr == []
+    assert output.exitcode == 2
+
+    with pty_shell.run_iter("while true; do echo line; done") as output:
+        assert next(output) == "line"
+    # the command is interrupted and the shell can be used again
+    assert pty_shell.run("echo after") == (["after"], [], 0)
+
+
+def test_cksum(tmpdir):
+    for data in (b"", b"a", os.urandom(1000)):
+        p = tmpdir.join("data")
+        p.write_binary(data)
+        out = subprocess.check_output(["cksum", str(p)]).split()
+        assert _cksum(data) == int(out[0])
+
+
+def test_put_get_bytes_base64(pty_shell, tmpdir):
+    # the local shell has no XMODEM tools, so the base64 transfer is used
+    for data in (os.urandom(10000), b"labgrid\n" * 10000, b""):
+        remote = tmpdir.join("remote")
+        pty_shell.put_bytes(data, str(remote))
+        assert remote.read_binary() == data
+        assert pty_shell.get_bytes(str(remote)) == data
+
+    with pytest.raises(ExecutionError):
+        pty_shell.get_bytes(str(tmpdir.join("missing")))
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+
+from labgrid.remote.common import Place, ResourceMatch
+from labgrid.remote.snapshot import SNAPSHOT_FORMATS, convert, get_snapshot_format
+
+
+def make_places(count):
+    places = {}
+    for i in range(count):
+        place = Place(
+            name=f"place-{i}",
+            aliases={f"alias-{i}"},
+            comment=f"board {i}",
+            tags={"board": f"board-{i % 10}", "rack": str(i % 4)},
+            matches=[
+                ResourceMatch(exporter=f"exporter-{i}", group="*", cls="NetworkSerialPort"),
+                ResourceMatch(exporter=f"exporter-{i}", group="power", cls="NetworkPowerPort", rename="power"),
+            ],
+            created=1700000000.0 + i,
+            changed=1700000100.5 + i,
+        )
+        places[place.name] = place.asdict()
+    return places
+
+
+def make_resources(count):
+    resources = {}
+    for i in range(count):
+        resources[f"exporter-{i}"] = {
+            "serial": {
+                "NetworkSerialPort": {
+                    "cls": "NetworkSerialPort",
+                    "params": {"host": f"exporter-{i}", "port": 4000 + i, "extra": {"proxy_required": False}},
+                    "acquired": None,
+                    "avail": True,
+                },
+            },
+        }
+    return resources
+
+
+@pytest.mark.parametrize("format_name", SNAPSHOT_FORMATS.keys())
+def test_snapshot_roundtrip(tmpdir, format_name):
+    snapshot = get_snapshot_format(format_name, str(tmpdir))
+    places = make_places(3)
+    places["place-1"]["acquired"] = "user/host"
+    places["place-1"]["acquired_resources"] = [["exporter-1", "serial", "NetworkSerialPort", "NetworkSerialPort"]]
+    places["place-2"]["reservation"] = "ABCDEF"
+    resources = make_resources(2)
+
+    assert not snapshot.exists()
+    assert snapshot.read_places() == {}
+
+    snapshot.write(resources, places)
+    assert snapshot.exists()
+    assert os.path.exists(snapshot.places_path)
+
+    loaded = snapshot.read_places()
+    assert loaded.keys() == places.keys()
+    for name, config in places.items():
+        for key in ("comment", "tags", "acquired", "created", "changed", "reservation"):
+            assert loaded[name][key] == config[key], key
+        assert sorted(loaded[name]["aliases"]) == sorted(config["aliases"])
+        assert loaded[name]["matches"] == config["matches"]
+        assert [list(path) for path in loaded[name]["acquired_resources"]] == config["acquired_resources"]
+
+    assert snapshot.read_resources() == resources
+
+
+def test_snapshot_convert(tmpdir):
+    source = get_snapshot_format("yaml", str(tmpdir))
+    target = get_snapshot_format("protobuf", str(tmpdir))
+    places = make_places(5)
+    source.write(make_resources(5), places)
+
+    convert(source, target)
+
+    assert target.read_places() == source.read_places()
+    assert target.read_resources() == source.read_resources()
+
+
+def test_snapshot_unknown_format():
+    with pytest.raises(ValueError, match="unknown snapshot format"):
+        get_snapshot_format("xml")
+
+
+@pytest.mark.parametrize("format_name", SNAPSHOT_FORMATS.keys())
+def test_snapshot_load_benchmark(benchmark, tmpdir, format_name):
+    snapshot = get_snapshot_format(format_name, str(tmpdir))
+    snapshot.write({}, make_places(1000))
+
+    places = benchmark(snapshot.read_places)
+    assert len(places) == 1000
+
+
+@pytest.mark.parametrize("format_name", SNAPSHOT_FORMATS.keys())
+def test_snapshot_save_benchmark(benchmark, tmpdir, format_name):
+    snapshot = get_snapshot_format(format_name, str(tmpdir))
+    places = make_places(1000)
+
+    benchmark(snapshot.write, {}, places)
+    assert snapshot.exists()
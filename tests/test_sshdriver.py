@@ -1,8 +1,11 @@
+import os
 import pytest
 import socket
+import subprocess
 
 from labgrid import Environment
 from labgrid.driver import SSHDriver, ExecutionError
+from labgrid.driver.commandmixin import RunIterator
 from labgrid.exceptions import NoResourceFoundError
 from labgrid.resource import NetworkService
 from labgrid.util.helper import get_free_port
@@ -154,6 +157,13 @@ def test_local_run(ssh_localhost, tmpdir):
     res = ssh_localhost.run("echo Hello")
     assert res == (["Hello"], [], 0)
 
+@pytest.mark.sshusername
+def test_local_run_iter(ssh_localhost, tmpdir):
+
+    output = ssh_localhost.run_iter("echo Hello; echo World")
+    assert list(output) == ["Hello", "World"]
+    assert output.exitcode == 0
+
 @pytest.mark.sshusername
 def test_local_run_check(ssh_localhost, tmpdir):
 
@@ -218,3 +228,39 @@ def test_unix_socket_forward(ssh_localhost, tmpdir):
                 send_socket.send(test_string.encode("utf-8"))
 
                 assert client_socket.recv(16).decode("utf-8") == test_string
+
+@pytest.fixture
+def ssh_driver_fake_ssh(target, tmpdir):
+    """SSHDriver which runs the commands locally via a fake ssh executable"""
+    NetworkService(target, "service", "1.2.3.4", "root")
+    fake_ssh = tmpdir.join("ssh")
+    fake_ssh.write('#!/bin/sh\nwhile [ "$1" != "1.2.3.4" ]; do shift; done\nshift\nexec sh -c "$*"\n')
+    fake_ssh.chmod(0o755)
+    s = SSHDriver(target, "ssh")
+    s._ssh = str(fake_ssh)
+    s.ssh_prefix = []
+    s._check_keepalive = lambda: True
+    return s
+
+def test_run_iter_streaming(ssh_driver_fake_ssh):
+    s = ssh_driver_fake_ssh
+    output = RunIterator(s._run_iter("echo first; echo error >&2; sleep 0.2; printf second; exit 3"))
+    assert next(output) == "first"
+    assert output.exitcode is None
+    assert list(output) == ["second"]
+    assert output.stderr == ["error"]
+    assert output.exitcode == 3
+
+    assert s._run("seq 1 3") == (["1", "2", "3"], [], 0)
+
+def test_run_iter_close(ssh_driver_fake_ssh, tmpdir):
+    s = ssh_driver_fake_ssh
+    pidfile = tmpdir.join("pid")
+    with RunIterator(s._run_iter(f"echo $$ > {pidfile}; while true; do echo line; sleep 0.01; done")) as output:
+        assert next(output) == "line"
+    # closing the iterator stops the command
+    with pytest.raises(ProcessLookupError):
+        os.kill(int(pidfile.read()), 0)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(s._run_iter("sleep 10", timeout=0.2))
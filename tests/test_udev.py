@@ -0,0 +1,167 @@
+import attr
+
+from labgrid.resource.udev import UdevIndex, UdevManager
+
+
+@attr.s(eq=False)
+class FakeResource:
+    match = attr.ib()
+    device = attr.ib(default=None)
+
+
+@attr.s(eq=False)
+class FakeDevice:
+    sys_path = attr.ib()
+    properties = attr.ib()
+    action = attr.ib(default="add")
+
+
+def test_udev_index_candidates():
+    index = UdevIndex()
+    by_path = FakeResource({"SUBSYSTEM": "tty", "ID_PATH": "pci-0000:00:14.0-usb-0:1:1.0", "@SUBSYSTEM": "usb"})
+    by_serial = FakeResource({"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "A1234"})
+    by_subsystem = FakeResource({"SUBSYSTEM": "net", "@ID_PATH": "pci-0000:00:14.0-usb-0:2"})
+    unkeyed = FakeResource({"DRIVER": "hub"})
+    for resource in (by_path, by_serial, by_subsystem, unkeyed):
+        index.add(resource)
+
+    device = FakeDevice(
+        "/sys/devices/tty/ttyUSB0",
+        {"SUBSYSTEM": "tty", "ID_PATH": "pci-0000:00:14.0-usb-0:1:1.0", "ID_SERIAL_SHORT": "A1234"},
+    )
+    assert index.candidates(device) == [by_path, by_serial, unkeyed]
+
+    device = FakeDevice("/sys/devices/net/eth1", {"SUBSYSTEM": "net", "ID_PATH": "pci-0000:00:14.0-usb-0:2:1.0"})
+    assert index.candidates(device) == [by_subsystem, unkeyed]
+
+    # resources with a device also get the events for that device
+    by_serial.device = FakeDevice("/sys/devices/tty/ttyUSB1", {"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "A1234"})
+    index.update(by_serial)
+    device = FakeDevice("/sys/devices/tty/ttyUSB1", {}, action="remove")
+    assert index.candidates(device) == [by_serial, unkeyed]
+
+    by_serial.device = None
+    index.update(by_serial)
+    index.remove(unkeyed)
+    assert index.candidates(device) == []
+
+
+def test_udev_coalesce_events():
+    first = FakeDevice("/sys/a", {}, action="change")
+    second = FakeDevice("/sys/a", {}, action="change")
+    other = FakeDevice("/sys/b", {}, action="change")
+    remove = FakeDevice("/sys/a", {}, action="remove")
+    third = FakeDevice("/sys/a", {}, action="change")
+
+    assert UdevManager._coalesce([first, other, second]) == [other, second]
+    assert UdevManager._coalesce([first, remove, third]) == [first, remove, third]
+
+
+def test_udev_index_benchmark(benchmark):
+    index = UdevIndex()
+    resources = [
+        FakeResource({"SUBSYSTEM": "tty", "ID_PATH": f"pci-0000:00:14.0-usb-0:{i}:1.0", "@SUBSYSTEM": "usb"})
+        for i in range(150)
+    ]
+    for resource in resources:
+        index.add(resource)
+    devices = [
+        FakeDevice(f"/sys/devices/usb{i}", {"SUBSYSTEM": "usb", "ID_PATH": f"pci-0000:00:14.0-usb-0:{i}"})
+        for i in range(150)
+    ] + [
+        FakeDevice(f"/sys/devices/tty{i}", {"SUBSYSTEM": "tty", "ID_PATH": f"pci-0000:00:14.0-usb-0:{i}:1.0"})
+        for i in range(150)
+    ]
+
+    def route():
+        return sum(len(index.candidates(device)) for device in devices)
+
+    # each tty event is only routed to the resource with the same ID_PATH
+    assert benchmark(route) == 150
+
+
+def test_udev_manager_attach_loop():
+    import asyncio
+
+    @attr.s(eq=False)
+    class MatchingResource(FakeResource):
+        def try_match(self, device):
+            if device.properties.get("ID_SERIAL_SHORT") != self.match["ID_SERIAL_SHORT"]:
+                return False
+            self.device = device if device.action != "remove" else None
+            return True
+
+    async def run():
+        manager = UdevManager()
+        resource = MatchingResource({"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "A1234"})
+        manager.index.add(resource)
+        changed = []
+
+        manager.attach_loop(asyncio.get_running_loop(), changed.extend)
+        # events are read by the event loop instead of the observer thread
+        assert not manager._observer.is_alive()
+
+        device = FakeDevice("/sys/devices/tty/ttyUSB0", {"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "A1234"})
+        manager.queue.put(device)
+        manager.queue.put(FakeDevice("/sys/devices/tty/ttyUSB1", {"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "B"}))
+        manager._read_monitor()
+        assert changed == [resource]
+        assert resource.device is device
+
+        manager.detach_loop()
+
+    asyncio.run(run())
+
+
+def test_udev_manager_enumeration_cache():
+    @attr.s(eq=False)
+    class FakeContext:
+        devices = attr.ib()
+        calls = attr.ib(factory=list)
+        on_list = attr.ib(default=None)
+
+        def list_devices(self, subsystem):
+            self.calls.append(subsystem)
+            if self.on_list is not None:
+                self.on_list()
+                self.on_list = None
+            return iter([device for device in self.devices if device.properties["SUBSYSTEM"] == subsystem])
+
+    @attr.s(eq=False)
+    class MatchingResource(FakeResource):
+        def try_match(self, device):
+            if device.properties.get("ID_SERIAL_SHORT") != self.match["ID_SERIAL_SHORT"]:
+                return False
+            self.device = device
+            return True
+
+    manager = UdevManager()
+    tty = [
+        FakeDevice(f"/sys/devices/tty/ttyUSB{i}", {"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": str(i)}, action=None)
+        for i in range(3)
+    ]
+    manager._context = FakeContext(tty)
+
+    resources = [MatchingResource({"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": str(i)}) for i in range(3)]
+    for resource in resources:
+        manager.on_resource_added(resource)
+    manager.on_resource_added(MatchingResource({"SUBSYSTEM": "net", "ID_SERIAL_SHORT": "0"}))
+    # each subsystem is only enumerated once
+    assert manager._context.calls == ["tty", "net"]
+    assert [resource.device for resource in resources] == tty
+
+    # events invalidate the cached devices of their subsystem
+    manager._insert_into_queue(FakeDevice("/sys/devices/tty/ttyUSB3", {"SUBSYSTEM": "tty"}))
+    manager.on_resource_added(MatchingResource({"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "3"}))
+    manager.on_resource_added(MatchingResource({"SUBSYSTEM": "net", "ID_SERIAL_SHORT": "3"}))
+    assert manager._context.calls == ["tty", "net", "tty"]
+
+    # lists which were enumerated while an event was received are not cached
+    manager._insert_into_queue(FakeDevice("/sys/devices/tty/ttyUSB4", {"SUBSYSTEM": "tty"}))
+    manager._context.on_list = lambda: manager._insert_into_queue(
+        FakeDevice("/sys/devices/tty/ttyUSB5", {"SUBSYSTEM": "tty"})
+    )
+    manager.on_resource_added(MatchingResource({"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "4"}))
+    manager.on_resource_added(MatchingResource({"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "5"}))
+    manager.on_resource_added(MatchingResource({"SUBSYSTEM": "tty", "ID_SERIAL_SHORT": "6"}))
+    assert manager._context.calls == ["tty", "net", "tty", "tty", "tty"]
@@ -3,6 +3,7 @@ import re
 import subprocess
 import socket
 import atexit
+import time
 import warnings
 
 from shutil import which
@@ -13,13 +14,13 @@ import logging
 
 from labgrid.util import diff_dict, flat_dict, filter_dict
 from labgrid.util.helper import get_free_port
-from labgrid.util.ssh import ForwardError, SSHConnection, sshmanager
+from labgrid.util.ssh import ExecServer, ExecServerError, ForwardError, SSHConnection, sshmanager
 from labgrid.util.proxy import proxymanager
-from labgrid.util.managedfile import ManagedFile, ManagedFileError
+from labgrid.util.managedfile import ManagedFile, ManagedFileError, sync_to_resources
 from labgrid.driver.exception import ExecutionError
 from labgrid.resource.serialport import NetworkSerialPort
 from labgrid.resource.common import Resource, NetworkResource
-from labgrid.util import diff_dict, flat_dict, filter_dict, find_dict
+from labgrid.util import diff_dict, flat_dict, filter_dict, find_dict, MarkerMatcher
 
 @pytest.fixture
 def connection_localhost():
@@ -131,6 +132,78 @@ def test_sshconnection_run_fail(connection_localhost):
     stdout, stderr, exitcode = connection_localhost.run("false")
     assert exitcode != 0
 
+@pytest.mark.localsshmanager
+def test_sshconnection_run_batch(connection_localhost):
+    results = connection_localhost.run_batch(["echo stdout", "echo stderr >&2; false"])
+    assert results == [(["stdout"], [], 0), ([], ["stderr"], 1)]
+    assert connection_localhost._exec_servers[0].isrunning()
+
+@pytest.mark.localsshmanager
+@pytest.mark.parametrize("method", ["run", "_run_process"])
+def test_sshconnection_run_benchmark(connection_localhost, benchmark, method):
+    run = getattr(connection_localhost, method)
+    stdout, _, exitcode = benchmark(run, "echo stdout")
+    assert exitcode == 0
+    assert stdout == ["stdout"]
+
+def test_exec_server():
+    server = ExecServer(["sh", "-c"])
+    try:
+        results = server.run(["echo stdout; echo stderr >&2", "exit 3", "kill -9 $$"])
+        assert results == [(b"stdout\n", b"stderr\n", 0), (b"", b"", 3), (b"", b"", 137)]
+        results = server.run(["echo stdout; echo stderr >&2"], stderr_merge=True)
+        assert results == [(b"stdout\nstderr\n", b"", 0)]
+
+    finally:
+        server.close()
+    assert not server.isrunning()
+    with pytest.raises(ExecServerError):
+        server.run(["true"])
+
+def test_exec_server_unavailable():
+    with pytest.raises(ExecServerError):
+        ExecServer(["env", "PATH=/nonexistent", "/bin/sh", "-c"])
+
+def test_exec_server_startup_timeout():
+    start = time.monotonic()
+    with pytest.raises(ExecServerError):
+        # the command line for the server is ignored
+        ExecServer(["sh", "-c", "exec sleep 10", "--"], timeout=0.5)
+    assert time.monotonic() - start < 5
+
+def test_sshconnection_exec_server_pool(monkeypatch):
+    monkeypatch.setattr("labgrid.util.ssh.ExecServer", lambda prefix: ExecServer(["sh", "-c"]))
+    connection = SSHConnection("localhost")
+    connection._connected = True
+    servers = []
+    try:
+        # busy servers are not shared
+        for _ in range(connection.max_exec_servers):
+            servers.append(connection._get_exec_server())
+        assert len(set(servers)) == connection.max_exec_servers
+        assert connection._get_exec_server() is None
+
+        # idle servers are reused, terminated ones are replaced
+        connection._put_exec_server(servers[0])
+        assert connection._get_exec_server() is servers[0]
+        servers[1].close()
+        connection._put_exec_server(servers[1])
+        servers[1] = connection._get_exec_server()
+        assert servers[1].isrunning()
+        assert connection._get_exec_server() is None
+    finally:
+        for server in servers:
+            server.close()
+        connection._connected = False
+
+def test_exec_server_benchmark(benchmark):
+    server = ExecServer(["sh", "-c"])
+    try:
+        results = benchmark(server.run, ["true"] * 10)
+    finally:
+        server.close()
+    assert [returncode for _, _, returncode in results] == [0] * 10
+
 
 @pytest.mark.localsshmanager
 def test_sshconnection_port_forward_add_remove(connection_localhost):
@@ -395,6 +468,112 @@ Test
 
     assert os.path.islink(tmpdir.join("link"))
 
+class LocalConnection:
+    """Runs the commands of the ManagedFile locally instead of via SSH"""
+    def __init__(self, host):
+        self.host = host
+        self.batches = []
+        self.uploads = []
+
+    def run(self, command, **kwargs):
+        proc = subprocess.run(command, shell=True, capture_output=True, text=True)
+        return proc.stdout.splitlines(), proc.stderr.splitlines(), proc.returncode
+
+    def run_batch(self, commands, **kwargs):
+        self.batches.append(commands)
+        return [self.run(command) for command in commands]
+
+    def run_check(self, command, **kwargs):
+        stdout, stderr, exitcode = self.run(command)
+        if exitcode != 0:
+            raise ExecutionError(command, stdout, stderr)
+        return stdout
+
+    def put_file(self, local_file, remote_path):
+        self.uploads.append(local_file)
+        subprocess.check_call(["cp", "-p", local_file, remote_path])
+
+@pytest.fixture
+def local_connections(monkeypatch, tmpdir):
+    connections = {}
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmpdir.join("xdg")))
+    monkeypatch.setattr(ManagedFile, "get_user_cache_path", lambda self: str(tmpdir.join("cache")))
+    monkeypatch.setattr(sshmanager, "open", lambda host: connections.setdefault(host, LocalConnection(host)))
+    return connections
+
+def test_managedfile_hash_cache(target, tmpdir, local_connections):
+    import hashlib
+    import json
+
+    t = tmpdir.join("test")
+    t.write("Test\n")
+    res = Resource(target, "test")
+    hash = hashlib.sha256(b"Test\n").hexdigest()
+    assert ManagedFile(t, res).get_hash() == hash
+
+    cache_file = tmpdir.join("xdg", "labgrid", "managedfile-hashes.json")
+    entries = json.loads(cache_file.read())
+    assert entries[str(t)]["sha256"] == hash
+
+    # a new instance uses the cached hash
+    entries[str(t)]["sha256"] = "cached"
+    cache_file.write(json.dumps(entries))
+    assert ManagedFile(t, res).get_hash() == "cached"
+
+    # modified files are hashed again
+    t.write("Test2\n")
+    assert ManagedFile(t, res).get_hash() == hashlib.sha256(b"Test2\n").hexdigest()
+
+def test_sync_to_resources(target, tmpdir, local_connections):
+    files = []
+    for name in ["a", "b", "c"]:
+        t = tmpdir.join(name)
+        t.write(f"{name}\n")
+        files.append(t)
+    res1 = NetworkResource(target, "res1", "host1")
+    res2 = NetworkResource(target, "res2", "host2")
+
+    mfs = [ManagedFile(files[0], res1, detect_nfs=False), ManagedFile(files[1], res1, detect_nfs=False),
+           ManagedFile(files[2], res2, detect_nfs=True)]
+    sync_to_resources(mfs)
+
+    # the files are checked in one batch per host
+    assert len(local_connections["host1"].batches) == 1
+    assert len(local_connections["host1"].batches[0]) == 2
+    assert local_connections["host1"].uploads == [str(files[0]), str(files[1])]
+    for mf in mfs[:2]:
+        assert mf.get_remote_path() == str(tmpdir.join("cache", mf.get_hash(), mf.local_path.split("/")[-1]))
+        assert os.path.isfile(mf.get_remote_path())
+
+    # the third file is "on NFS", as the local connection sees the same file
+    assert local_connections["host2"].uploads == []
+    assert mfs[2].get_remote_path() == str(files[2])
+
+    # files already in the cache are not uploaded again
+    local_connections["host1"].uploads.clear()
+    mfs = [ManagedFile(files[0], res1, detect_nfs=False), ManagedFile(files[1], res1, detect_nfs=False)]
+    sync_to_resources(mfs)
+    assert local_connections["host1"].uploads == []
+    assert os.path.isfile(mfs[0].get_remote_path())
+
+def test_managedfile_cache_eviction(target, tmpdir, local_connections, monkeypatch):
+    monkeypatch.setenv("LG_MANAGEDFILE_CACHE_SIZE", "1")
+    cache = tmpdir.join("cache")
+    for i, name in enumerate(["aaaa", "bbbb"]):
+        cache.join(name).ensure(dir=True)
+        cache.join(name, "image").write(b"x" * 600 * 1024, mode="wb")
+        os.utime(cache.join(name), (1000 + i, 1000 + i))
+
+    t = tmpdir.join("test")
+    t.write("Test\n")
+    mf = ManagedFile(t, NetworkResource(target, "test", "host"), detect_nfs=False)
+    mf.sync_to_resource()
+
+    # the least recently used directory is removed first
+    assert not cache.join("aaaa").exists()
+    assert cache.join("bbbb").exists()
+    assert os.path.isfile(mf.get_remote_path())
+
 def test_find_dict():
     dict_a = {"a": {"a.a": {"a.a.a": "a.a.a_val"}}, "b": "b_val"}
     assert find_dict(dict_a, "b") == "b_val"
@@ -402,3 +581,44 @@ def test_find_dict():
     assert find_dict(dict_a, "a.a") == {"a.a.a": "a.a.a_val"}
     assert find_dict(dict_a, "a.a.a") == "a.a.a_val"
     assert find_dict(dict_a, "x") == None
+
+
+def _feed_bytewise(matcher, data):
+    lines = []
+    for i in range(len(data)):
+        lines += matcher.feed(data[i:i+1])
+    return lines
+
+
+def test_marker_matcher():
+    data = (
+        b"MARKER='ABCD''EFGHIJ' run 'ls'\r\nABCDEFGHIJfoo\r\n\x1b[1mbar\x1b[0m\r\n\r\nbaz"
+        b"ABCDEFGHIJ 1\r\n# next"
+    )
+    matcher = MarkerMatcher("ABCDEFGHIJ", r"\s+(\d+)\s+# ")
+    assert matcher.feed(data) == ["foo", "bar", "", "baz"]
+    assert matcher.done
+    assert matcher.match.group(1) == b"1"
+    assert matcher.remainder == b"next"
+
+    # the result does not depend on how the data is split into chunks
+    matcher = MarkerMatcher("ABCDEFGHIJ", r"\s+(\d+)\s+# ")
+    assert _feed_bytewise(matcher, data) == ["foo", "bar", "", "baz"]
+    assert matcher.match.group(1) == b"1"
+    assert matcher.remainder == b"next"
+
+
+def test_marker_matcher_marker_line():
+    data = (
+        b"echo 'ABCD''EFGHIJ'; version; echo \"$?\"; echo 'ABCD''EFGHIJ';\r\n"
+        b"[     1.000000] ABCDEFGHIJ\r\nU-Boot 2024.01\r\n0\r\n[     1.000001] ABCDEFGHIJ\r\n=> "
+    )
+    matcher = MarkerMatcher("ABCDEFGHIJ", r".*?=> ", marker_line=True)
+    assert _feed_bytewise(matcher, data) == ["U-Boot 2024.01", "0"]
+    assert matcher.done
+
+    matcher = MarkerMatcher("ABCDEFGHIJ", r".*?=> ", marker_line=True)
+    assert matcher.feed(data[:60]) == []
+    assert not matcher.done
+    assert matcher.feed(data[60:]) == ["U-Boot 2024.01", "0"]
+    assert matcher.done